@@ -0,0 +1,160 @@
+"""
+Extraction Micro-Benchmark
+==========================
+Measures post segmentation throughput (MB/s) on saved page text.
+
+Corpus: the newest debug text snapshot (data/debug/<page_id>/*.txt.gz,
+see src/debug_capture.py), then a synthetic page if there is none.
+
+Compares the old split/join/startswith loop with src/extract.py and
+appends each run to data/bench_history.jsonl so throughput can be tracked.
+
+Most of the gain is in early_stop, where extraction stops at --limit posts
+instead of segmenting the whole page. full_page reads everything either
+way, so it only measures per-line and per-post overhead (and extract_posts
+also checks the keywords.json exclude patterns, which the old loop did not).
+
+Run: python benchmarks/bench_extract.py [--repeat 50] [--limit 10]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.debug_capture import open_snapshot
+from src.extract import SKIP_WORDS, extract_posts
+
+DEBUG_DIR = ROOT / "data/debug"
+HISTORY_FILE = ROOT / "data/bench_history.jsonl"
+
+
+def legacy_extract(body_text: str, page_id: str, page_name: str, limit: int) -> list:
+    """The loop that used to be copy-pasted in both scrapers, kept for comparison."""
+    posts = []
+    seen = set()
+    lines = body_text.split('\n')
+    
+    current_block = []
+    blocks = []
+    for line in lines:
+        line = line.strip()
+        if len(line) > 10:
+            current_block.append(line)
+        elif current_block:
+            block_text = '\n'.join(current_block)
+            if len(block_text) > 100:
+                blocks.append(block_text)
+            current_block = []
+    
+    for block in blocks:
+        if len(posts) >= limit:
+            break
+        if any(block.startswith(w) for w in SKIP_WORDS):
+            continue
+        if len(block) < 50:
+            continue
+        
+        block_hash = hashlib.md5(block[:100].encode()).hexdigest()[:8]
+        if block_hash in seen:
+            continue
+        seen.add(block_hash)
+        
+        posts.append({
+            "post_id": f"{page_id}_{block_hash}",
+            "source_id": page_id,
+            "source_name": page_name,
+            "title": block.split('\n')[0][:80],
+            "text": block[:2000],
+            "scraped_at": datetime.now(timezone.utc).isoformat(),
+            "content_hash": hashlib.sha256(block.encode()).hexdigest(),
+        })
+    return posts
+
+
+def synthetic_corpus(posts: int = 400, seed: int = 7) -> str:
+    """Feed-like text: post bodies separated by short UI lines."""
+    rng = random.Random(seed)
+    words = ("enrollment schedule announcement students campus library exam "
+             "scholarship deadline registrar office university semester").split()
+    chunks = []
+    for i in range(posts):
+        chunks.append("QCU Main · 2h")
+        for _ in range(rng.randint(2, 6)):
+            chunks.append(" ".join(rng.choice(words) for _ in range(rng.randint(4, 14))))
+        chunks.extend(["Like", "Comment", "Share", f"{rng.randint(1, 900)} reactions"])
+    return "\n".join(chunks)
+
+
+def load_corpus() -> tuple[str, str]:
+    snapshots = sorted(DEBUG_DIR.glob("*/*.txt.*"), key=lambda p: p.stat().st_mtime)
+    for path in reversed(snapshots):
+        text = open_snapshot(path)
+        if text.startswith("ERROR: "):
+            continue  # Failed scrape - not a representative page
+        return text, str(path.relative_to(ROOT))
+    return synthetic_corpus(), "synthetic"
+
+
+def time_it(fn, repeat: int) -> float:
+    """Best-of-N wall time of one call, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark post segmentation")
+    parser.add_argument('--repeat', type=int, default=50, help='Runs per variant (best is kept)')
+    parser.add_argument('--limit', type=int, default=10, help='max_posts passed to extraction')
+    parser.add_argument('--no-history', action='store_true', help=f'Do not append to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+    
+    text, source = load_corpus()
+    mb = len(text.encode('utf-8')) / (1024 * 1024)
+    
+    print()
+    print("=" * 60)
+    print("📊 EXTRACTION BENCHMARK")
+    print("=" * 60)
+    print(f"   Corpus: {source} ({mb * 1024:.1f} KB)")
+    
+    results = {}
+    for limit_label, limit in (("early_stop", args.limit), ("full_page", 10**9)):
+        legacy = time_it(lambda: legacy_extract(text, "bench", "Bench", limit), args.repeat)
+        new = time_it(lambda: extract_posts(text, "bench", "Bench", limit), args.repeat)
+        results[limit_label] = {
+            "legacy_mb_s": round(mb / legacy, 2),
+            "extract_mb_s": round(mb / new, 2),
+        }
+        print(f"\n   {limit_label} (limit={limit if limit < 10**9 else 'all'}):")
+        print(f"      legacy loop:     {mb / legacy:8.1f} MB/s  ({legacy * 1000:.2f}ms)")
+        print(f"      extract_posts(): {mb / new:8.1f} MB/s  ({new * 1000:.2f}ms)")
+    print("=" * 60)
+    
+    if not args.no_history:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "benchmark": "extract",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "corpus": source,
+            "corpus_kb": round(mb * 1024, 1),
+            "results": results,
+        }
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"📁 Appended to {HISTORY_FILE.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
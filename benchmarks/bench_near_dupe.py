@@ -0,0 +1,147 @@
+"""
+Near-Duplicate Lookup Benchmark
+===============================
+Measures SimHash fingerprinting and banded lookups (src/near_dupe.py) on
+synthetic corpora of 10,000 and 100,000 posts, against a linear scan of
+every stored fingerprint.
+
+Queries are edited copies of stored posts ("See more" text, new numbers,
+one word changed) and fresh posts. Reported: fingerprints/s, µs per
+lookup, recall on the edited copies and false matches on the fresh posts.
+
+Appends each run to data/bench_history.jsonl.
+
+Run: python benchmarks/bench_near_dupe.py [--sizes 10000 100000] [--queries 1000]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.near_dupe import SimHashStore, distance, max_distance, simhash
+
+HISTORY_FILE = ROOT / "data/bench_history.jsonl"
+THRESHOLD = 0.95
+
+WORDS = ("enrollment schedule announcement students campus library exam scholarship "
+         "deadline registrar office university semester faculty grades portal online "
+         "payment tuition orientation freshmen graduation ceremony venue reminder please "
+         "bring valid id form submit requirements before friday monday building room").split()
+
+
+def synthetic_post(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(40, 120))]
+    return f"QCU Main · {rng.randint(1, 23)}h\n" + " ".join(words)
+
+
+def edited(text: str, rng: random.Random) -> str:
+    """The kind of change that used to create a second copy of a post."""
+    kind = rng.choice(("see_more", "numbers", "word"))
+    if kind == "see_more":
+        return text + " See more"
+    if kind == "numbers":
+        return text.replace("h\n", "d\n", 1).replace("QCU Main · ", f"QCU Main · {rng.randint(1, 9)}")
+    words = text.split(" ")
+    words[rng.randrange(2, len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def run_size(size: int, queries: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    posts = [synthetic_post(rng) for _ in range(size)]
+    
+    t0 = time.perf_counter()
+    fingerprints = [simhash(text) for text in posts]
+    fingerprint_s = time.perf_counter() - t0
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = sqlite3.connect(Path(tmp) / "near_dupe.sqlite")
+        store = SimHashStore(db)
+        t0 = time.perf_counter()
+        with db:
+            store.add([(f"p{i}", fp) for i, fp in enumerate(fingerprints)])
+        insert_s = time.perf_counter() - t0
+        
+        bits = max_distance(THRESHOLD)
+        picks = rng.sample(range(size), queries)
+        near = [simhash(edited(posts[i], rng)) for i in picks]
+        fresh = [simhash(synthetic_post(rng)) for _ in range(queries)]
+        
+        t0 = time.perf_counter()
+        found = sum(1 for fp in near if store.find(fp, bits))
+        false_matches = sum(1 for fp in fresh if store.find(fp, bits))
+        banded_s = (time.perf_counter() - t0) / (2 * queries)
+        
+        # Linear scan over every fingerprint (what a lookup costs without bands)
+        sample = near[:max(1, queries // 10)]
+        t0 = time.perf_counter()
+        scan_found = sum(1 for fp in sample if any(distance(fp, other) <= bits for other in fingerprints))
+        scan_s = (time.perf_counter() - t0) / len(sample)
+        db.close()
+    
+    # Edited copies the threshold allows at all (the rest changed more than `bits` bits)
+    reachable = sum(1 for i, fp in zip(picks, near) if distance(fp, fingerprints[i]) <= bits)
+    return {
+        "posts": size,
+        "fingerprints_per_s": round(size / fingerprint_s),
+        "insert_s": round(insert_s, 3),
+        "banded_lookup_us": round(banded_s * 1e6, 1),
+        "linear_scan_us": round(scan_s * 1e6, 1),
+        "recall": round(found / reachable, 4) if reachable else None,
+        "edited_within_threshold": round(reachable / queries, 4),
+        "false_match_rate": round(false_matches / queries, 4),
+        "scan_recall": round(scan_found / len(sample), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SimHash near-duplicate lookups")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000], help='Corpus sizes')
+    parser.add_argument('--queries', type=int, default=1000, help='Edited and fresh posts looked up per size')
+    parser.add_argument('--no-history', action='store_true', help=f'Do not append to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+    
+    print()
+    print("=" * 60)
+    print("📊 NEAR-DUPLICATE BENCHMARK")
+    print("=" * 60)
+    print(f"   Threshold {THRESHOLD} = up to {max_distance(THRESHOLD)} differing bits")
+    
+    results = {}
+    for size in args.sizes:
+        r = results[str(size)] = run_size(size, args.queries)
+        print(f"\n   {size:,} posts:")
+        print(f"      fingerprint:   {r['fingerprints_per_s']:>10,} posts/s")
+        print(f"      insert:        {r['insert_s']:>10.2f}s")
+        print(f"      banded lookup: {r['banded_lookup_us']:>10.1f}µs")
+        print(f"      linear scan:   {r['linear_scan_us']:>10.1f}µs")
+        print(f"      recall:        {r['recall']:>10.2%}  (of edits within the threshold: "
+              f"{r['edited_within_threshold']:.0%})")
+        print(f"      false matches: {r['false_match_rate']:>10.2%}")
+    print("=" * 60)
+    
+    if not args.no_history:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "benchmark": "near_dupe",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "threshold": THRESHOLD,
+            "queries": args.queries,
+            "results": results,
+        }
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"📁 Appended to {HISTORY_FILE.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
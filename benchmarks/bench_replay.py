@@ -0,0 +1,186 @@
+"""
+Replay Benchmark
+================
+Runs full scrapes against the captured-page corpus (data/corpus, see
+src/replay.py) - no Facebook session needed, so it also runs in CI.
+
+Reports per stage (median of --runs), posts/sec and memory:
+- Python peak memory (tracemalloc) for every tool
+- Browser memory for Selenium (process tree with psutil, else JS heap)
+
+Results are appended to data/bench_history.jsonl.
+
+Run: python benchmarks/bench_replay.py [--tool selenium] [--runs 3] [--file]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.replay import ReplayServer, corpus_dir, corpus_url, list_pages
+
+HISTORY_FILE = ROOT / "data/bench_history.jsonl"
+STAGES = ["browser_init", "page_navigate", "scrolling", "extraction", "total"]
+
+
+def available_tools() -> list:
+    tools = []
+    try:
+        from src.scraper import SELENIUM_AVAILABLE
+        if SELENIUM_AVAILABLE:
+            tools.append("selenium")
+    except ImportError:
+        pass
+    try:
+        from src.scraper_playwright import PLAYWRIGHT_AVAILABLE
+        if PLAYWRIGHT_AVAILABLE:
+            tools.append("playwright")
+    except ImportError:
+        pass
+    return tools
+
+
+def run_tool(tool: str, pages: list, base_url: str, runs: int, max_posts: int) -> dict:
+    """Scrape every corpus page `runs` times with one backend."""
+    pool = None
+    if tool == "selenium":
+        from src.scraper import _driver_memory_mb, create_browser_pool, scrape_page
+        pool = create_browser_pool(headless=True, size=1, warm=False)
+    else:
+        from src.scraper_playwright import scrape_page
+    
+    samples = []
+    try:
+        for run in range(runs):
+            for page_id in pages:
+                kwargs = {"pool": pool} if pool else {}
+                tracemalloc.start()
+                posts, stats = scrape_page(page_id, max_posts=max_posts, headless=True,
+                                           show_stats=False, replay=base_url, **kwargs)
+                python_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+                
+                browser_mb = None
+                if pool:
+                    with pool.session() as session:
+                        browser_mb = _driver_memory_mb(session.browser)
+                
+                timing = stats.to_dict()["timing"]
+                work = stats.time_page_navigate + stats.time_scrolling + stats.time_extraction
+                samples.append({
+                    "page_id": page_id,
+                    "success": stats.success,
+                    "posts": stats.posts_found,
+                    "timing": timing,
+                    "posts_per_sec": stats.posts_found / work if work else 0.0,
+                    "python_peak_mb": python_peak,
+                    "browser_mb": browser_mb,
+                    "extraction_mode": stats.extraction_mode,
+                })
+    finally:
+        if pool:
+            pool.close()
+    
+    return summarize(samples)
+
+
+def summarize(samples: list) -> dict:
+    def median(values):
+        values = [v for v in values if v is not None]
+        return round(statistics.median(values), 3) if values else None
+    
+    return {
+        "samples": len(samples),
+        "failures": sum(1 for s in samples if not s["success"]),
+        "posts": median([s["posts"] for s in samples]),
+        "stages": {stage: median([s["timing"][stage] for s in samples]) for stage in STAGES},
+        "posts_per_sec": median([s["posts_per_sec"] for s in samples]),
+        "python_peak_mb": median([s["python_peak_mb"] for s in samples]),
+        "browser_mb": median([s["browser_mb"] for s in samples]),
+        "extraction_mode": samples[-1]["extraction_mode"] if samples else None,
+    }
+
+
+def print_report(tool: str, result: dict):
+    print(f"\n🔧 {tool.upper()} ({result['samples']} scrapes, {result['failures']} failed, "
+          f"{result['extraction_mode']} extraction)")
+    for stage in STAGES:
+        value = result["stages"][stage]
+        print(f"   {stage:<14} {value if value is not None else 0:>7.3f}s")
+    print(f"   posts/sec      {result['posts_per_sec'] or 0:>7.1f}  ({result['posts']} posts per page)")
+    print(f"   python peak    {result['python_peak_mb'] or 0:>7.1f}MB")
+    if result["browser_mb"] is not None:
+        print(f"   browser        {result['browser_mb']:>7.0f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full scrapes on the replay corpus")
+    parser.add_argument('--tool', choices=['selenium', 'playwright'], help='Only this backend')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per page (median is reported)')
+    parser.add_argument('--max', type=int, default=10, help='max_posts per page')
+    parser.add_argument('--pages', nargs='+', help='Corpus page IDs (default: all)')
+    parser.add_argument('--file', action='store_true', help='Use file:// URLs instead of a local server')
+    parser.add_argument('--no-history', action='store_true', help=f'Do not append to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+    
+    pages = args.pages or list_pages()
+    if not pages:
+        print(f"❌ No pages in {corpus_dir()}")
+        print("   Add one: python src/replay.py --import data/debug/qcu1994/<run>_selenium.html.gz --as qcu1994")
+        sys.exit(1)
+    
+    tools = [args.tool] if args.tool else available_tools()
+    if not tools:
+        print("❌ Neither Selenium nor Playwright is installed")
+        sys.exit(1)
+    
+    print()
+    print("=" * 60)
+    print("📊 REPLAY BENCHMARK")
+    print("=" * 60)
+    print(f"   Corpus: {corpus_dir()} ({len(pages)} pages) | runs: {args.runs} | max posts: {args.max}")
+    
+    server = None
+    if args.file:
+        base_url = corpus_url()
+    else:
+        server = ReplayServer().start()
+        base_url = server.base_url
+    
+    results = {}
+    try:
+        for tool in tools:
+            results[tool] = run_tool(tool, pages, base_url, args.runs, args.max)
+    finally:
+        if server:
+            server.stop()
+    
+    print()
+    print("=" * 60)
+    for tool, result in results.items():
+        print_report(tool, result)
+    print("=" * 60)
+    
+    if not args.no_history:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "benchmark": "replay",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "pages": pages,
+            "runs": args.runs,
+            "results": results,
+        }
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"📁 Appended to {HISTORY_FILE.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
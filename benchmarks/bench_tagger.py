@@ -0,0 +1,157 @@
+"""
+Keyword Tagging Benchmark
+=========================
+Measures posts/s of src/tagger.py on a synthetic corpus (default 100,000
+posts) built from config/keywords.json plus filler words, so the tagging
+stage can be checked against scrape/save throughput.
+
+Compared:
+    per_keyword - one regex search per keyword of every label (first 10,000 posts)
+    flat        - one regex, plain alternation of all keywords
+    trie        - KeywordTagger (one regex, keywords factored into a trie)
+
+Posts tagged differently from per_keyword are counted. The single-pass
+variants never overlap matches, so "business administration" tags BSBA
+but not ENTREP ("business") and "due date" not SCHEDULE ("date") - a
+few differences are expected.
+
+Appends each run to data/bench_history.jsonl.
+
+Run: python benchmarks/bench_tagger.py [--posts 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tagger import KEYWORD_SETS, KeywordTagger, load_keywords
+
+HISTORY_FILE = ROOT / "data/bench_history.jsonl"
+REFERENCE_POSTS = 10_000  # per_keyword is slow; it only runs on this many
+
+FILLER = ("the students are advised to check the official page for updates about "
+          "classes rooms faculty office hours campus building library online portal "
+          "thank you everyone ang mga estudyante ay pinapaalalahanan sa lahat").split()
+
+
+def synthetic_corpus(keywords: dict, posts: int, seed: int = 5) -> list:
+    """Post texts of 30-150 words; about a third carry 1-3 keywords."""
+    rng = random.Random(seed)
+    all_keywords = [w for section in KEYWORD_SETS.values()
+                    for words in keywords.get(section, {}).values() for w in words]
+    texts = []
+    for _ in range(posts):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(30, 150))]
+        if rng.random() < 0.35:
+            for _ in range(rng.randint(1, 3)):
+                words.insert(rng.randrange(len(words)), rng.choice(all_keywords).upper()
+                             if rng.random() < 0.2 else rng.choice(all_keywords))
+        texts.append(" ".join(words))
+    return texts
+
+
+def per_keyword_labels(keywords: dict):
+    patterns = {field: {label: [re.compile(r"\b" + re.escape(w.lower()) + r"\b") for w in words]
+                        for label, words in keywords.get(section, {}).items()}
+                for field, section in KEYWORD_SETS.items()}
+    
+    def labels(text: str) -> dict:
+        text = text.lower()
+        return {field: {label for label, pats in by_label.items() if any(p.search(text) for p in pats)}
+                for field, by_label in patterns.items()}
+    return labels
+
+
+def flat_labels(tagger: KeywordTagger):
+    words = sorted(tagger._labels, key=len, reverse=True)  # Longest first, like the trie
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b")
+    
+    def labels(text: str) -> dict:
+        found = {field: set() for field in KEYWORD_SETS}
+        for match in pattern.finditer(text.lower()):
+            for field, label in tagger._labels[match.group()]:
+                found[field].add(label)
+        return found
+    return labels
+
+
+def time_it(fn, texts: list, repeat: int) -> tuple:
+    """Best-of-N wall time over the corpus, and the results of the last run."""
+    best = float('inf')
+    results = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = [fn(text) for text in texts]
+        best = min(best, time.perf_counter() - t0)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword tagging")
+    parser.add_argument('--posts', type=int, default=100_000, help='Synthetic corpus size')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per variant (best is kept)')
+    parser.add_argument('--no-history', action='store_true', help=f'Do not append to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+    
+    keywords = load_keywords(ROOT / "config/keywords.json")
+    t0 = time.perf_counter()
+    tagger = KeywordTagger(keywords)
+    compile_ms = (time.perf_counter() - t0) * 1000
+    texts = synthetic_corpus(keywords, args.posts)
+    mb = sum(len(t) for t in texts) / (1024 * 1024)
+    
+    print()
+    print("=" * 60)
+    print("📊 KEYWORD TAGGING BENCHMARK")
+    print("=" * 60)
+    print(f"   Corpus: {args.posts:,} synthetic posts ({mb:.1f} MB), "
+          f"{len(tagger._labels)} keywords, compiled in {compile_ms:.1f}ms")
+    
+    variants = {
+        "per_keyword": per_keyword_labels(keywords),
+        "flat": flat_labels(tagger),
+        "trie": tagger.labels,
+    }
+    results = {}
+    reference = None
+    for name, fn in variants.items():
+        sample = texts[:REFERENCE_POSTS] if reference is None else texts
+        seconds, found = time_it(fn, sample, args.repeat)
+        reference = reference or found
+        mismatches = sum(1 for a, b in zip(found, reference) if a != b)
+        results[name] = {"posts_per_s": round(len(sample) / seconds), "mismatches": mismatches}
+        print(f"\n   {name} ({len(sample):,} posts):")
+        print(f"      {len(sample) / seconds:>12,.0f} posts/s  ({seconds:.2f}s)"
+              + (f"  ({mismatches} of the first {len(reference):,} tagged differently)"
+                 if mismatches else ""))
+    
+    seconds, _ = time_it(tagger.tag, texts, 1)
+    results["tag"] = {"posts_per_s": round(args.posts / seconds)}
+    print(f"\n   KeywordTagger.tag() (labels + ranking + title):")
+    print(f"      {args.posts / seconds:>12,.0f} posts/s")
+    print("=" * 60)
+    
+    if not args.no_history:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "benchmark": "tagger",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "posts": args.posts,
+            "corpus_mb": round(mb, 1),
+            "results": results,
+        }
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"📁 Appended to {HISTORY_FILE.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
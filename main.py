@@ -2,20 +2,41 @@
 QCU Facebook Scraper - Main Entry Point
 =======================================
 
-Run: python main.py
+Run: python main.py               (every enabled source once)
+     python main.py --daemon      (keep running; scrape sources when they are due)
+     python main.py --workers 3   (one-shot run split over 3 browser processes)
 
 What it does:
 1. Reads config/sources.json for pages to scrape
-2. Scrapes each page using Selenium
-3. Saves posts to Firebase
+2. Scrapes each page using Selenium (one warm browser, reused),
+   stopping at posts saved on earlier runs (data/cursors.json)
+3. Streams posts to a background writer that saves them to Firebase
+   while the next page loads, then moves each source's cursor forward
+
+In daemon mode src/scheduler.py picks the sources: only those that are
+due, by priority, with intervals that adapt to how often each page posts.
+An interrupted one-shot run resumes from its checkpoint (src/checkpoint.py).
+With scaling.mode = "multiprocess" (or --workers) sources are shared out
+to worker processes through a lock-protected queue (src/workers.py).
+Single-process runs claim their sources in the same queue, so two
+overlapping runs (cron + daemon) never scrape a source at the same time.
 """
 
+import argparse
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 
-from src.scraper import scrape_page, SELENIUM_AVAILABLE
-from src.database import initialize_firebase, save_posts_batch
+from src.scraper import scrape_page, get_browser_pool, SELENIUM_AVAILABLE
+from src.database import initialize_firebase
+from src.pipeline import PostPipeline
+from src.cursors import CursorStore, incremental_enabled
+from src.dedupe_index import get_dedupe_index
+from src.scheduler import Scheduler, poll_seconds
+from src.checkpoint import Checkpoint
+from src.workers import WorkQueue, multiprocess_enabled, run_workers
+from src.tracing import export_prometheus
 
 
 def load_sources() -> list:
@@ -27,7 +48,147 @@ def load_sources() -> list:
         return json.load(f).get('sources', [])
 
 
-def main():
+def scrape_sources(sources: list, pool, cursors, use_firebase: bool,
+                   checkpoint: Checkpoint = None) -> dict:
+    """
+    Scrape sources in order, saving posts in the background.
+    
+    With a checkpoint, every finished source is recorded, posts left unsaved
+    by an interrupted run are saved first, and saved posts are dropped from it.
+    It is finished after the last write (and kept if anything failed to save).
+    
+    Returns:
+        {page_id: new posts found} (None for a source that failed)
+    """
+    found = {}
+    errors = 0
+    
+    # Posts are saved in the background as they are scraped. Cursors only
+    # move once every post of a source is stored.
+    pipeline = None
+    if use_firebase:
+        def source_saved(page_id, posts):
+            if cursors:
+                cursors.advance(page_id, posts)
+                cursors.save()
+            if checkpoint:
+                checkpoint.mark_saved(page_id)
+        pipeline = PostPipeline(on_source_saved=source_saved).start()
+        
+        if checkpoint:
+            for page_id, posts in list(checkpoint.unsaved.items()):
+                pipeline.put(posts, page_id)
+                pipeline.end_source(page_id, posts)
+    
+    for i, source in enumerate(sources, 1):
+        page_id = source.get('id')
+        page_name = source.get('name', page_id)
+        max_posts = source.get('posts_to_fetch', 5)
+        
+        print(f"[{i}/{len(sources)}] {page_name}")
+        print("-" * 40)
+        
+        try:
+            posts, stats = scrape_page(
+                page_id=page_id,
+                page_name=page_name,
+                max_posts=max_posts,
+                headless=True,
+                pool=pool,
+                cursor=cursors.get(page_id) if cursors else None,
+                on_posts=(lambda new, pid=page_id: pipeline.put(new, pid)) if pipeline else None
+            )
+            
+            if stats:
+                print(f"   ⏱️  {stats.time_total:.1f}s | 📝 {len(posts)} posts")
+                if stats.high_water_mark:
+                    print(f"   ⏹️  Up to date (stopped at high-water mark)")
+            
+            found[page_id] = len(posts) if not stats or stats.success else None
+            if checkpoint:
+                # Without Firebase nothing is saved, so only progress is recorded
+                checkpoint.complete(page_id, posts if pipeline else [], found[page_id] is not None)
+            if pipeline:
+                pipeline.end_source(page_id, posts)
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            found[page_id] = None
+        
+        print()
+    
+    # Wait for the last writes
+    if pipeline:
+        print("💾 Finishing Firebase writes...")
+        result = pipeline.close()
+        print(f"   Saved: {result['saved']}, Skipped: {result['skipped']}, "
+              f"Errors: {result['errors']} ({result['flushes']} flushes)")
+        errors = result['errors']
+    if checkpoint:
+        checkpoint.finish(errors)
+    
+    return found
+
+
+def scrape_claimed(queue: WorkQueue, sources: list, pool, cursors, use_firebase: bool,
+                   checkpoint: Checkpoint = None) -> dict:
+    """
+    scrape_sources() over the sources this process can claim in the work
+    queue. Sources another run is scraping are skipped and reported as None.
+    """
+    queue.enqueue(sources)
+    claimed = queue.claim([s['id'] for s in sources])
+    found = scrape_sources(claimed, pool, cursors, use_firebase, checkpoint=checkpoint)
+    queue.finish(found)
+    return {s['id']: found.get(s['id']) for s in sources}
+
+
+def run_daemon(sources: list, pool, cursors, use_firebase: bool):
+    """Scrape sources as they come due, until interrupted."""
+    queue = WorkQueue()
+    scheduler = Scheduler(sources)
+    print("🗓️  Schedule:")
+    scheduler.print_schedule()
+    print()
+    
+    try:
+        while True:
+            due = scheduler.due()
+            if not due:
+                wait = min(scheduler.seconds_until_next(), poll_seconds())
+                time.sleep(max(wait, 1))
+                continue
+            
+            print(f"⏰ {datetime.now().strftime('%H:%M')} - {len(due)} source(s) due")
+            found = scrape_claimed(queue, due, pool, cursors, use_firebase)
+            for page_id, new_posts in found.items():
+                if new_posts is None:
+                    scheduler.retry_later(page_id)
+                else:
+                    scheduler.record(page_id, new_posts)
+            scheduler.save()
+            export_prometheus()
+            
+            print(f"🗓️  ~{scheduler.browser_runs_per_day():.0f} scrapes/day at current intervals")
+            scheduler.print_schedule()
+            print()
+    except KeyboardInterrupt:
+        print("\n👋 Scheduler stopped")
+        scheduler.save()
+
+
+def scrape_worker(queue):
+    """Worker process (see src/workers.py): own Firebase client, browser and cursors."""
+    use_firebase = initialize_firebase()
+    pool = get_browser_pool(headless=True)
+    cursors = CursorStore(index=get_dedupe_index()) if incremental_enabled() else None
+    try:
+        for batch in queue.batches():
+            queue.finish(scrape_sources(batch, pool, cursors, use_firebase))
+    finally:
+        pool.close()
+
+
+def main(daemon: bool = False, workers: int = None):
     """Main function."""
     
     print()
@@ -54,6 +215,7 @@ def main():
     # Load sources
     sources = load_sources()
     enabled = [s for s in sources if s.get('enabled', True)]
+    enabled.sort(key=lambda s: s.get('priority', 99))
     
     if not enabled:
         print("❌ No sources found in config/sources.json")
@@ -62,46 +224,49 @@ def main():
     print(f"📋 Found {len(enabled)} source(s)")
     print()
     
-    # Scrape each source
-    all_posts = []
-    
-    for i, source in enumerate(enabled, 1):
-        page_id = source.get('id')
-        page_name = source.get('name', page_id)
-        max_posts = source.get('posts_to_fetch', 5)
-        
-        print(f"[{i}/{len(enabled)}] {page_name}")
-        print("-" * 40)
-        
-        try:
-            posts, stats = scrape_page(
-                page_id=page_id,
-                headless=True
-            )
-            
-            if stats:
-                print(f"   ⏱️  {stats.time_total:.1f}s | 📝 {len(posts)} posts")
-            
-            all_posts.extend(posts)
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
+    if not daemon and (workers or multiprocess_enabled()):
+        summary = run_workers(enabled, scrape_worker, max_workers=workers)
+        export_prometheus()
         print()
+        print("=" * 50)
+        print("COMPLETE")
+        print("=" * 50)
+        print(f"Sources: {summary.get('done', 0)} done, {summary.get('failed', 0)} failed")
+        print(f"Total posts: {summary['posts']}")
+        print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return
+    
+    # Scrape (browsers are borrowed from a warm pool)
+    pool = get_browser_pool(headless=True)
+    cursors = CursorStore(index=get_dedupe_index()) if incremental_enabled() else None
+    
+    if daemon:
+        run_daemon(enabled, pool, cursors, use_firebase)
+        return
+    
+    # Skip sources an interrupted run already finished
+    checkpoint = Checkpoint.resume("main", [s['id'] for s in enabled])
+    checkpoint.print_resume()
     
-    # Save to Firebase
-    if all_posts and use_firebase:
-        print("💾 Saving to Firebase...")
-        result = save_posts_batch(all_posts)
-        print(f"   Saved: {result['saved']}, Skipped: {result['skipped']}")
+    found = scrape_claimed(WorkQueue(), checkpoint.pending(enabled), pool, cursors, use_firebase,
+                           checkpoint=checkpoint)
+    total_posts = sum(n for n in found.values() if n)
+    print(f"📈 Metrics: {export_prometheus()} (python src/tracing.py --report)")
     
     # Summary
     print()
     print("=" * 50)
     print("COMPLETE")
     print("=" * 50)
-    print(f"Total posts: {len(all_posts)}")
+    print(f"Total posts: {total_posts}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="QCU Facebook Scraper")
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and scrape each source when it is due (by priority)')
+    parser.add_argument('--workers', type=int,
+                        help='Split a one-shot run over this many browser processes')
+    args = parser.parse_args()
+    main(daemon=args.daemon, workers=args.workers)
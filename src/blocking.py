@@ -0,0 +1,246 @@
+"""
+Resource Blocking
+=================
+Extraction only reads page text, so images, video, fonts and tracking
+scripts are wasted bandwidth. This module blocks them per a policy in
+settings.json:
+
+    "resource_blocking": {
+      "enabled": false,
+      "block": {"images": true, "media": true, "fonts": true, "analytics": true},
+      "estimated_kb": {"images": 60, "media": 800, "fonts": 40, "analytics": 25}
+    }
+
+- Playwright: page.route() aborts matching requests (by resource type or URL)
+- Selenium:   CDP Network.setBlockedURLs, blocked requests counted from the
+              performance log
+
+Blocked requests are never downloaded, so bytes saved are ESTIMATED from
+`estimated_kb` per category. Navigation time saved is measured against a
+per-source baseline recorded on runs with blocking disabled
+(data/blocking_baseline.json).
+
+Blocking is opt-in: run with it disabled first so each source gets a
+baseline, then enable it and compare.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+BASELINE_PATH = Path("data/blocking_baseline.json")
+
+# URL patterns per category, in Network.setBlockedURLs syntax: "*" matches
+# anything, every other character (including "?") is literal. Playwright
+# matches them with the same rule (url_pattern_regex), so both block the same URLs.
+URL_PATTERNS = {
+    "images": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    "media": ["*.mp4*", "*.webm*", "*.m4a*", "*.mp3*", "*.m3u8*", "*.mpd*"],
+    "fonts": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*"],
+    "analytics": [
+        "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+        "*facebook.com/tr/*", "*facebook.com/tr?*", "*connect.facebook.net/*",
+    ],
+}
+
+# Playwright request.resource_type → category (catches CDN URLs without extensions)
+PLAYWRIGHT_TYPES = {
+    "image": "images",
+    "media": "media",
+    "font": "fonts",
+}
+
+DEFAULT_ESTIMATED_KB = {"images": 60, "media": 800, "fonts": 40, "analytics": 25}
+
+
+def url_pattern_regex(pattern: str) -> str:
+    """Regex source for a setBlockedURLs pattern: "*" is a wildcard, the rest is literal."""
+    return "(?:" + ".*".join(re.escape(part) for part in pattern.split("*")) + ")"
+
+
+# ==============================================================================
+# POLICY
+# ==============================================================================
+
+class BlockingPolicy:
+    """Which categories to block, plus matchers built once from the patterns."""
+    
+    def __init__(self, enabled: bool = True, block: Optional[dict] = None,
+                 estimated_kb: Optional[dict] = None):
+        self.enabled = enabled
+        block = block if block is not None else {c: True for c in URL_PATTERNS}
+        self.categories = {c for c, on in block.items() if on and c in URL_PATTERNS}
+        self.estimated_kb = {**DEFAULT_ESTIMATED_KB, **(estimated_kb or {})}
+        
+        self._matchers = {
+            c: re.compile("|".join(url_pattern_regex(p) for p in URL_PATTERNS[c]),
+                          re.IGNORECASE)
+            for c in self.categories
+        }
+    
+    @classmethod
+    def from_settings(cls) -> "BlockingPolicy":
+        cfg = get_setting("resource_blocking", {}) or {}
+        return cls(
+            enabled=cfg.get("enabled", False),
+            block=cfg.get("block"),
+            estimated_kb=cfg.get("estimated_kb"),
+        )
+    
+    @property
+    def active(self) -> bool:
+        return self.enabled and bool(self.categories)
+    
+    def category_for(self, url: str, resource_type: Optional[str] = None) -> Optional[str]:
+        """Return the blocked category for a request, or None to let it through."""
+        category = PLAYWRIGHT_TYPES.get(resource_type)
+        if category in self.categories:
+            return category
+        for category, matcher in self._matchers.items():
+            if matcher.fullmatch(url):
+                return category
+        return None
+    
+    def url_patterns(self) -> list:
+        """Glob patterns for Selenium's Network.setBlockedURLs."""
+        return [p for c in sorted(self.categories) for p in URL_PATTERNS[c]]
+
+
+class BlockingTracker:
+    """Counts blocked requests per category for one source."""
+    
+    def __init__(self, policy: BlockingPolicy):
+        self.policy = policy
+        self.counts = {}
+    
+    def add(self, category: str):
+        self.counts[category] = self.counts.get(category, 0) + 1
+    
+    def reset(self):
+        self.counts = {}
+    
+    @property
+    def estimated_kb_saved(self) -> float:
+        return sum(n * self.policy.estimated_kb.get(c, 0) for c, n in self.counts.items())
+    
+    def apply_to(self, stats):
+        """Copy counts and estimated savings into ScraperStats."""
+        stats.blocked_requests = dict(self.counts)
+        stats.blocked_kb_est = self.estimated_kb_saved
+
+
+# ==============================================================================
+# PLAYWRIGHT
+# ==============================================================================
+
+def install_playwright_blocking(page, policy: BlockingPolicy, tracker: BlockingTracker):
+    """Abort blocked requests on a sync Playwright page."""
+    def handle(route):
+        category = policy.category_for(route.request.url, route.request.resource_type)
+        if category:
+            tracker.add(category)
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+    
+    page.route("**/*", handle)
+
+
+async def install_playwright_blocking_async(page, policy: BlockingPolicy,
+                                            tracker: BlockingTracker):
+    """Abort blocked requests on an async Playwright page."""
+    async def handle(route):
+        category = policy.category_for(route.request.url, route.request.resource_type)
+        if category:
+            tracker.add(category)
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+    
+    await page.route("**/*", handle)
+
+
+# ==============================================================================
+# SELENIUM (Chrome DevTools Protocol)
+# ==============================================================================
+
+def install_selenium_blocking(driver, policy: BlockingPolicy):
+    """Block URL patterns for every later navigation of this driver."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.url_patterns()})
+
+
+def drain_selenium_log(driver):
+    """Discard buffered performance log entries (call before each source)."""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def collect_selenium_blocked(driver, tracker: BlockingTracker):
+    """Count requests Chrome blocked since the last drain, from the performance log."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return
+    
+    urls = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            url = urls.get(params.get("requestId"), "")
+            tracker.add(tracker.policy.category_for(url) or "other")
+
+
+# ==============================================================================
+# NAVIGATION BASELINE
+# ==============================================================================
+
+def _load_baseline() -> dict:
+    try:
+        return json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def record_navigation(stats, policy: BlockingPolicy):
+    """
+    Compare navigation time with the unblocked baseline for this source.
+    
+    With blocking ON, sets stats.navigate_time_saved (if a baseline exists).
+    With blocking OFF, updates the baseline (moving average) instead.
+    """
+    baseline = _load_baseline()
+    key = f"{stats.tool}:{stats.page_id}"
+    
+    if policy.active:
+        if key in baseline:
+            stats.navigate_time_saved = baseline[key] - stats.time_page_navigate
+        return
+    
+    old = baseline.get(key)
+    new = stats.time_page_navigate
+    baseline[key] = round(new if old is None else 0.7 * old + 0.3 * new, 3)
+    try:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Temp file + rename, so a concurrent worker never reads a half-written file
+        tmp = BASELINE_PATH.with_suffix(BASELINE_PATH.suffix + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(baseline, indent=2), encoding='utf-8')
+        os.replace(tmp, BASELINE_PATH)
+    except OSError:
+        pass
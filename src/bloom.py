@@ -0,0 +1,149 @@
+"""
+Bloom Filter
+============
+Compact "definitely new / maybe seen" pre-check in front of the exact
+dedupe index. Stored in one memory-mapped file, so opening it costs no
+load time and only the pages that are touched are read from disk.
+
+    bloom = BloomFilter.open("data/dedupe_bloom.bin", capacity=100_000, fp_rate=0.001)
+    bloom.add("h:" + content_hash)
+    if "h:" + content_hash in bloom:   # False = definitely never added
+        ...exact lookup...
+
+Sizing (standard formulas):
+    bits   m = -n·ln(p) / ln(2)²      (n = capacity, p = target FP rate)
+    hashes k = m/n · ln(2)
+At 100,000 keys and p = 0.1% that is ~176KB and 10 hash functions.
+
+File layout: 48-byte header (magic, m, k, count, capacity, fp_rate) + bit array.
+
+The file is shared by every process that opens it. `count` is always read
+from the header and add() increments it there, so writers must hold a
+lock around add() (DedupeIndex uses a FileLock). A filter that has been
+replaced by a rebuilt file is marked retire()d; holders of the old mapping
+see `stale` and reopen the path.
+"""
+
+import hashlib
+import math
+import mmap
+import struct
+from pathlib import Path
+
+MAGIC = b"QCUBLOOM"
+RETIRED = b"QCUBLOLD"  # Magic of a file that was replaced by a rebuild
+HEADER = struct.Struct("<8sQQQQd")
+COUNT = struct.Struct("<Q")
+COUNT_OFFSET = 24  # After magic, m and k
+
+
+class BloomFilter:
+    """Memory-mapped Bloom filter. Use BloomFilter.open()."""
+    
+    def __init__(self, path: Path, file, mm: mmap.mmap):
+        self.path = Path(path)
+        self._file = file
+        self._mm = mm
+        _, self.bits, self.hashes, _, self.capacity, self.fp_rate = HEADER.unpack_from(mm, 0)
+    
+    @classmethod
+    def open(cls, path, capacity: int = 100_000, fp_rate: float = 0.001) -> "BloomFilter":
+        """Open an existing filter file, or create an empty one sized for `capacity`."""
+        path = Path(path)
+        if not path.exists() or path.stat().st_size < HEADER.size:
+            cls._create(path, capacity, fp_rate)
+        file = open(path, "r+b")
+        mm = mmap.mmap(file.fileno(), 0)
+        if mm[:len(MAGIC)] != MAGIC:
+            mm.close()
+            file.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        return cls(path, file, mm)
+    
+    @staticmethod
+    def _create(path: Path, capacity: int, fp_rate: float):
+        bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, bits, hashes, 0, capacity, fp_rate))
+            f.truncate(HEADER.size + (bits + 7) // 8)
+    
+    # ─────────────────────────────────────────────────
+    # Membership
+    # ─────────────────────────────────────────────────
+    
+    def _positions(self, key: str):
+        """k bit positions by double hashing one 128-bit digest."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+    
+    def add(self, key: str) -> bool:
+        """Add a key. Returns True if it was (probably) not in the filter before."""
+        mm = self._mm
+        new = False
+        for pos in self._positions(key):
+            offset = HEADER.size + (pos >> 3)
+            mask = 1 << (pos & 7)
+            byte = mm[offset]
+            if not byte & mask:
+                mm[offset] = byte | mask
+                new = True
+        if new:
+            COUNT.pack_into(mm, COUNT_OFFSET, self.count + 1)
+        return new
+    
+    def __contains__(self, key: str) -> bool:
+        mm = self._mm
+        for pos in self._positions(key):
+            if not mm[HEADER.size + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+    
+    # ─────────────────────────────────────────────────
+    # Sharing
+    # ─────────────────────────────────────────────────
+    
+    @property
+    def stale(self) -> bool:
+        """The file was replaced by a rebuild (reopen the path to see the new one)."""
+        return self._mm[:len(MAGIC)] != MAGIC
+    
+    def retire(self):
+        """Mark this file as replaced. Call after os.replace()-ing the new file over it."""
+        self._mm[:len(RETIRED)] = RETIRED
+        self._mm.flush()
+    
+    # ─────────────────────────────────────────────────
+    # Metrics
+    # ─────────────────────────────────────────────────
+    
+    @property
+    def count(self) -> int:
+        """Keys added by every process sharing the file."""
+        return COUNT.unpack_from(self._mm, COUNT_OFFSET)[0]
+    
+    @property
+    def full(self) -> bool:
+        """More keys than it was sized for (FP rate is now above target)."""
+        return self.count > self.capacity
+    
+    @property
+    def estimated_fp_rate(self) -> float:
+        """Expected false-positive rate at the current fill: (1 - e^(-k·n/m))^k."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+    
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._mm)
+    
+    def flush(self):
+        self._mm.flush()
+    
+    def close(self):
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
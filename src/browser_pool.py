@@ -0,0 +1,199 @@
+"""
+Browser Session Pool
+====================
+Keeps warm browser sessions (started, Facebook loaded, cookies added) and
+lends them out, so the ~7s startup cost is paid once per worker instead
+of once per source.
+
+    pool = BrowserPool(factory=start_session, size=1)
+    with pool.session() as session:
+        session.browser.get(url)
+    pool.close()
+
+Sessions are health-checked when borrowed and recycled (closed and
+replaced on next use) after `max_pages` pages or when their memory grows
+past `max_memory_mb`.
+
+Settings (settings.json → scaling.browser_pool):
+    size, max_pages_per_session, max_memory_mb
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+# Optional: exact process memory for Selenium-driven Chrome
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+@dataclass
+class PooledSession:
+    """One warm browser (Selenium driver or Playwright page) plus bookkeeping."""
+    browser: Any
+    warmup: dict = field(default_factory=dict)  # Startup timings, reported once
+    pages_served: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class BrowserPool:
+    """
+    Thread-safe pool of warm browser sessions.
+    
+    Args:
+        factory: Creates a new PooledSession (starts browser, loads Facebook, adds cookies)
+        close: Shuts down a session's browser
+        health_check: Returns True if the browser still responds
+        memory_mb: Returns the browser's current memory use in MB
+        size: Maximum number of live sessions
+        max_pages: Recycle a session after serving this many pages
+        max_memory_mb: Recycle a session once it uses more than this
+    """
+    
+    def __init__(self, factory: Callable[[], PooledSession], close: Callable[[Any], None],
+                 health_check: Optional[Callable[[Any], bool]] = None,
+                 memory_mb: Optional[Callable[[Any], float]] = None,
+                 size: Optional[int] = None, max_pages: Optional[int] = None,
+                 max_memory_mb: Optional[float] = None):
+        cfg = get_setting("scaling.browser_pool", {}) or {}
+        self.factory = factory
+        self.close_browser = close
+        self.health_check = health_check
+        self.memory_mb = memory_mb
+        self.size = max(1, size or cfg.get("size", 1))
+        self.max_pages = max_pages or cfg.get("max_pages_per_session", 25)
+        self.max_memory_mb = max_memory_mb or cfg.get("max_memory_mb", 1500)
+        
+        self._idle = queue.LifoQueue()  # LIFO: reuse the warmest session first
+        self._lock = threading.Lock()
+        self._live = 0
+        self._closed = False
+        
+        self.created = 0
+        self.recycled = 0
+    
+    # ─────────────────────────────────────────────────
+    # Borrow / return
+    # ─────────────────────────────────────────────────
+    
+    def acquire(self, timeout: Optional[float] = None) -> PooledSession:
+        """Borrow a healthy session, starting a new one if the pool has room."""
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = None
+            
+            if session is None:
+                with self._lock:
+                    can_create = self._live < self.size
+                    if can_create:
+                        self._live += 1
+                if can_create:
+                    try:
+                        session = self.factory()
+                    except Exception:
+                        with self._lock:
+                            self._live -= 1
+                        raise
+                    self.created += 1
+                    return session
+                session = self._idle.get(timeout=timeout)  # Wait for a return
+            
+            if self._is_healthy(session):
+                return session
+            print("   ♻️  Browser session failed health check, replacing it")
+            self._discard(session)
+    
+    def release(self, session: PooledSession, healthy: bool = True):
+        """Return a session. Unhealthy or worn-out sessions are closed."""
+        session.pages_served += 1
+        session.warmup = {}  # Startup cost is only reported by the first borrower
+        
+        reason = None
+        if not healthy:
+            reason = "unhealthy"
+        elif session.pages_served >= self.max_pages:
+            reason = f"served {session.pages_served} pages"
+        elif self.memory_mb:
+            try:
+                used = self.memory_mb(session.browser)
+                if used > self.max_memory_mb:
+                    reason = f"memory {used:.0f}MB > {self.max_memory_mb}MB"
+            except Exception:
+                pass
+        
+        if reason or self._closed:
+            if reason and not self._closed:
+                print(f"   ♻️  Recycling browser session ({reason})")
+            self._discard(session)
+        else:
+            self._idle.put(session)
+    
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Borrow a session for a `with` block; it is recycled if the block raises."""
+        session = self.acquire(timeout)
+        healthy = True
+        try:
+            yield session
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.release(session, healthy)
+    
+    def close(self):
+        """Close every idle session. Sessions still borrowed close on release."""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+    
+    # ─────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────
+    
+    def _is_healthy(self, session: PooledSession) -> bool:
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(session.browser))
+        except Exception:
+            return False
+    
+    def _discard(self, session: PooledSession):
+        try:
+            self.close_browser(session.browser)
+        except Exception:
+            pass
+        with self._lock:
+            self._live -= 1
+        self.recycled += 1
+
+
+def process_tree_memory_mb(pid: int) -> float:
+    """Resident memory of a process and all its children (needs psutil)."""
+    if not PSUTIL_AVAILABLE:
+        return 0.0
+    root = psutil.Process(pid)
+    total = 0
+    for proc in [root] + root.children(recursive=True):
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
@@ -0,0 +1,188 @@
+"""
+Run Checkpoints
+===============
+Lets an interrupted batch run resume where it stopped instead of redoing
+every source.
+
+After each source the checkpoint records (atomically) that the source is
+done, plus its posts until they are saved. A restarted run with the same
+source list skips completed sources and gets the unsaved posts back:
+
+    checkpoint = Checkpoint.resume("main", [s["id"] for s in sources])
+    for source in checkpoint.pending(sources):
+        posts, stats = scrape_page(...)
+        checkpoint.complete(source["id"], posts, stats.success)
+    ...
+    checkpoint.mark_saved(page_id)      # posts are in Firestore now
+    checkpoint.finish(errors)           # run reached its end: delete the file
+
+Failed sources are not marked complete, so they are retried on resume.
+The file is only deleted once every post is saved and the run had no
+save errors; otherwise only the unsaved posts are kept. The next run
+saves them and scrapes every source again, so a store that keeps failing
+never stops scraping.
+
+Each run name has its own file (checkpoint_file with the run appended,
+e.g. data/scraper_state_main.json), so main.py, the Selenium and the
+Playwright batch runs never overwrite each other's unsaved posts.
+
+Settings (settings.json → recovery):
+    enabled, checkpoint_file, checkpoint_interval_sources,
+    resume_on_startup, clear_checkpoint_on_success
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+class Checkpoint:
+    """Completed sources and unsaved posts of one batch run."""
+    
+    def __init__(self, run: str, source_ids: list, path: Optional[Path] = None,
+                 enabled: Optional[bool] = None):
+        self.run = run
+        self.source_ids = list(source_ids)
+        if path is None:
+            base = Path(get_setting("recovery.checkpoint_file", "data/scraper_state.json"))
+            path = base.with_name(f"{base.stem}_{run}{base.suffix}")
+        self.path = Path(path)
+        self.enabled = get_setting("recovery.enabled", True) if enabled is None else enabled
+        self.interval = max(1, get_setting("recovery.checkpoint_interval_sources", 1))
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.completed = []      # page_ids, in completion order
+        self.unsaved = {}        # page_id -> posts not saved yet
+        self.resumed = False
+        self._since_write = 0
+        self._lock = threading.RLock()  # mark_saved() runs on the writer thread
+    
+    @classmethod
+    def resume(cls, run: str, source_ids: list, path: Optional[Path] = None) -> "Checkpoint":
+        """
+        Continue the checkpointed run if it is the same run over the same
+        sources (and resume_on_startup is on); otherwise start a new one.
+        Unsaved posts are carried over either way.
+        """
+        checkpoint = cls(run, source_ids, path)
+        if not checkpoint.enabled or not get_setting("recovery.resume_on_startup", True):
+            return checkpoint
+        try:
+            data = json.loads(checkpoint.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return checkpoint
+        
+        if data.get("run") != run:
+            return checkpoint
+        checkpoint.unsaved = data.get("unsaved", {})
+        if data.get("source_ids") == checkpoint.source_ids:
+            checkpoint.started_at = data.get("started_at", checkpoint.started_at)
+            checkpoint.completed = data.get("completed", [])
+        checkpoint.resumed = bool(checkpoint.completed or checkpoint.unsaved)
+        return checkpoint
+    
+    # ─────────────────────────────────────────────────
+    # Progress
+    # ─────────────────────────────────────────────────
+    
+    def pending(self, sources: list) -> list:
+        """Sources that still need scraping."""
+        done = set(self.completed)
+        return [s for s in sources if s["id"] not in done]
+    
+    def unsaved_posts(self) -> list:
+        return [post for posts in self.unsaved.values() for post in posts]
+    
+    def complete(self, page_id: str, posts: list, success: bool = True):
+        """Record a finished source (failed sources stay pending)."""
+        if not success:
+            return
+        with self._lock:
+            self.completed.append(page_id)
+            if posts:
+                self.unsaved[page_id] = list(posts)
+            self._since_write += 1
+            if self._since_write >= self.interval:
+                self.save()
+    
+    def mark_saved(self, page_id: str):
+        """A source's posts are stored; drop them from the checkpoint."""
+        with self._lock:
+            if self.unsaved.pop(page_id, None) is not None:
+                self.save()
+    
+    def save_posts(self, page_id: str, save: Callable) -> int:
+        """
+        Save a completed source's unsaved posts with `save` (returns a
+        save_posts_batch() result) and drop them once all are stored.
+        
+        Returns:
+            Number of posts that failed to save
+        """
+        posts = self.unsaved.get(page_id)
+        if not posts:
+            return 0
+        try:
+            errors = save(posts).get("errors", 0)
+        except Exception as e:
+            print(f"❌ Saving {page_id} failed: {e}")
+            errors = len(posts)
+        if not errors:
+            self.mark_saved(page_id)
+        return errors
+    
+    def finish(self, errors: int = 0):
+        """
+        The run reached its end: delete the file (or keep it, if configured).
+        
+        While posts are unsaved or the run had save `errors`, the file is
+        kept so the next run can save them. Completed sources are cleared:
+        only an interrupted run skips them.
+        """
+        if not self.enabled:
+            return
+        self.completed = []
+        if self.unsaved or errors:
+            self.save()
+            print(f"💾 Checkpoint kept for the next run: {len(self.unsaved_posts())} unsaved posts, "
+                  f"{errors} save errors ({self.path})")
+        elif get_setting("recovery.clear_checkpoint_on_success", True):
+            self.path.unlink(missing_ok=True)
+        else:
+            self.save()
+    
+    # ─────────────────────────────────────────────────
+    # File
+    # ─────────────────────────────────────────────────
+    
+    def save(self):
+        """Write the checkpoint atomically (a crash never leaves half a file)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._since_write = 0
+            data = {
+                "run": self.run,
+                "source_ids": self.source_ids,
+                "started_at": self.started_at,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "completed": self.completed,
+                "unsaved": self.unsaved,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp, self.path)
+    
+    def print_resume(self):
+        if self.resumed:
+            print(f"♻️  Resuming run from {self.started_at[:19]}: "
+                  f"{len(self.completed)}/{len(self.source_ids)} sources done, "
+                  f"{len(self.unsaved_posts())} unsaved posts")
@@ -0,0 +1,168 @@
+"""
+Incremental Scraping Cursors
+============================
+A high-water mark per source: the IDs of the newest posts already saved.
+
+While scrolling, the scraper drops posts it already has and stops once
+`stop_after_known` known posts IN A ROW have been seen. On a quiet page
+that happens on the first screen. A pinned (old) post at the top is a
+single known post followed by new ones, so it does not stop the run.
+
+Cursors only move forward after posts are saved (main.py), so posts from
+a failed save are scraped again on the next run. Worker processes share
+the file: save() merges this process's changes under the lock file. With a dedupe index
+(src/dedupe_index.py), posts already in the database count as known too -
+checked against its Bloom filter first, so new posts cost no lookup.
+
+A known post ID is only "known" if its current content_hash is saved as
+well. Otherwise the post was edited: it is passed on (so the save path
+records the edit, src/edit_history.py) without counting toward the streak
+or breaking it. Without an index, IDs alone decide.
+
+File (settings.json → incremental.cursor_file):
+    {"qcu1994": {"recent_ids": [...], "newest_id": "...", "newest_at": "...",
+                 "updated_at": "..."}}
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    from src.settings import get_setting
+    from src.file_lock import FileLock
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+    from file_lock import FileLock
+
+
+@dataclass
+class SourceCursor:
+    """Known post IDs for one source, plus the known-post streak of the current scrape."""
+    page_id: str
+    recent_ids: list = field(default_factory=list)  # Newest first
+    newest_id: Optional[str] = None
+    newest_at: Optional[str] = None  # posted_at of the newest post (scraped_at if unknown)
+    updated_at: Optional[str] = None
+    stop_after_known: int = 2
+    index: Any = field(default=None, repr=False)  # Optional DedupeIndex
+    
+    def __post_init__(self):
+        self._known = set(self.recent_ids)
+        self.known_streak = 0
+        self.known_skipped = 0
+        self.edited = 0  # Known IDs with new content, passed on to be saved
+        self.reached = False  # Enough known posts in a row were seen to stop
+    
+    def filter(self, posts: list) -> list:
+        """
+        Drop posts we already have, counting known posts in a row (page order).
+        
+        Once the high-water mark is reached, everything after it on the page
+        is older content and is dropped too.
+        """
+        fresh = []
+        for post in posts:
+            if self.reached:
+                break
+            status = self._status(post)
+            if status == "known":
+                self.known_streak += 1
+                self.known_skipped += 1
+                self.reached = self.known_streak >= self.stop_after_known
+            elif status == "edited":  # Old post: neither new content nor a stop signal
+                self.edited += 1
+                fresh.append(post)
+            else:
+                self.known_streak = 0
+                fresh.append(post)
+        return fresh
+    
+    def _status(self, post: dict) -> str:
+        """"known" (ID and content saved), "edited" (ID saved, content changed) or "new"."""
+        post_id = post.get("post_id")
+        content_hash = post.get("content_hash")
+        if self.index is None:
+            return "known" if post_id in self._known else "new"
+        
+        hash_known = bool(content_hash and self.index.has_hash(content_hash))
+        if post_id in self._known or (post_id and self.index.has_post(post_id)):
+            return "known" if hash_known or not content_hash else "edited"
+        return "known" if hash_known else "new"
+    
+    def to_dict(self) -> dict:
+        return {
+            "recent_ids": self.recent_ids,
+            "newest_id": self.newest_id,
+            "newest_at": self.newest_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class CursorStore:
+    """Loads and saves every source's cursor (data/cursors.json)."""
+    
+    def __init__(self, path: Optional[Path] = None, index=None):
+        self.index = index
+        self.path = Path(path or get_setting("incremental.cursor_file", "data/cursors.json"))
+        self.stop_after_known = max(1, get_setting("incremental.stop_after_known", 2))
+        self.keep_recent = get_setting("incremental.keep_recent", 50)
+        self._data = self._load()
+        self._changed = set()
+    
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return {}
+    
+    def get(self, page_id: str) -> SourceCursor:
+        """Cursor for one source (empty on its first run)."""
+        entry = self._data.get(page_id, {})
+        return SourceCursor(
+            page_id=page_id,
+            recent_ids=list(entry.get("recent_ids", [])),
+            newest_id=entry.get("newest_id"),
+            newest_at=entry.get("newest_at"),
+            updated_at=entry.get("updated_at"),
+            stop_after_known=self.stop_after_known,
+            index=self.index,
+        )
+    
+    def advance(self, page_id: str, posts: list):
+        """Record saved posts (in page order) as known. Call only after they are saved."""
+        if not posts:
+            return
+        cursor = self.get(page_id)
+        new_ids = [p["post_id"] for p in posts if p.get("post_id")]
+        merged = list(dict.fromkeys(new_ids + cursor.recent_ids))
+        
+        cursor.recent_ids = merged[:self.keep_recent]
+        cursor.newest_id = new_ids[0] if new_ids else cursor.newest_id
+        times = [p.get("posted_at") or p.get("scraped_at") for p in posts]
+        times = [t for t in times if t] + ([cursor.newest_at] if cursor.newest_at else [])
+        cursor.newest_at = max(times) if times else None
+        cursor.updated_at = datetime.now(timezone.utc).isoformat()
+        self._data[page_id] = cursor.to_dict()
+        self._changed.add(page_id)
+    
+    def save(self):
+        """
+        Write the file atomically (a crash never leaves half a JSON file).
+        Cursors other processes saved meanwhile are kept.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock():
+            data = self._load()
+            data.update({page_id: self._data[page_id] for page_id in self._changed})
+            self._data.update(data)
+            tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding='utf-8')
+            os.replace(tmp, self.path)
+
+
+def incremental_enabled() -> bool:
+    return bool(get_setting("incremental.enabled", True))
@@ -82,14 +82,33 @@ STEP 4: Update .env file
 """
 
 import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Optional
 from pathlib import Path
 
+try:
+    from src.dedupe_index import get_dedupe_index
+    from src.edit_history import record_edit
+    from src.near_dupe import distance, max_distance, simhash
+    from src.settings import get_setting
+    from src.tagger import tag_posts
+    from src.tracing import traced
+except ImportError:  # Run as a script: python src/database.py
+    from dedupe_index import get_dedupe_index
+    from edit_history import record_edit
+    from near_dupe import distance, max_distance, simhash
+    from settings import get_setting
+    from tagger import tag_posts
+    from tracing import traced
+
 # Firebase Admin SDK - the official Python library for Firebase
 try:
     import firebase_admin
     from firebase_admin import credentials, firestore
+    from google.api_core import exceptions as google_exceptions
     FIREBASE_AVAILABLE = True
 except ImportError:
     FIREBASE_AVAILABLE = False
@@ -112,7 +131,7 @@ def initialize_firebase(key_path: str = None) -> bool:
     key_path : str
         Path to your firebase-key.json file
         If not provided, looks for FIREBASE_KEY_PATH environment variable
-        
+    
     RETURNS:
     --------
     bool : True if successful, False if failed
@@ -168,7 +187,7 @@ def initialize_firebase(key_path: str = None) -> bool:
         
         print("✅ Firebase initialized successfully!")
         return True
-        
+    
     except Exception as e:
         print(f"❌ Firebase initialization failed: {e}")
         return False
@@ -191,10 +210,10 @@ def save_post(post_data: dict, collection: str = "posts") -> Optional[str]:
     -----------
     post_data : dict
         The post data to save (use ScrapedPost.to_dict())
-        
+    
     collection : str
         Which collection to save to (default: "posts")
-        
+    
     RETURNS:
     --------
     str : The document ID if successful, None if failed
@@ -237,7 +256,7 @@ def save_post(post_data: dict, collection: str = "posts") -> Optional[str]:
         collection_ref.document(doc_id).set(post_data)
         
         return doc_id
-        
+    
     except Exception as e:
         print(f"❌ Error saving post: {e}")
         return None
@@ -269,18 +288,64 @@ def post_exists(post_id: str, collection: str = "posts") -> bool:
     """
     Check if a post already exists in Firestore.
     
-    Useful for skipping duplicates without downloading the full document.
+    Useful for skipping duplicates without downloading the full document:
+    only the post_id field is fetched.
     """
     if _firestore_client is None:
         return False
     
     try:
-        doc = _firestore_client.collection(collection).document(post_id).get()
-        return doc.exists
+        doc_ref = _firestore_client.collection(collection).document(post_id)
+        return doc_ref.get(field_paths=["post_id"]).exists
     except:
         return False
 
 
+# Firestore batchGet: keep requests the same size as a write batch
+GET_ALL_CHUNK = 500
+
+
+def get_existing(post_ids: list, collection: str = "posts",
+                 fields: list = None) -> dict:
+    """
+    Fetch several posts in one round-trip per 500 IDs (Firestore get_all).
+    
+    PARAMETERS:
+    -----------
+    post_ids : list
+        Document IDs to look up
+    
+    fields : list
+        Only download these fields (default: ["content_hash"])
+    
+    RETURNS:
+    --------
+    dict : {post_id: {field: value}} for the posts that exist
+    """
+    if _firestore_client is None or not post_ids:
+        return {}
+    
+    fields = fields or ["content_hash"]
+    col = _firestore_client.collection(collection)
+    found = {}
+    ids = list(dict.fromkeys(post_ids))
+    for i in range(0, len(ids), GET_ALL_CHUNK):
+        refs = [col.document(pid) for pid in ids[i:i + GET_ALL_CHUNK]]
+        for snap in _firestore_client.get_all(refs, field_paths=fields):
+            if snap.exists:
+                found[snap.id] = snap.to_dict() or {}
+    return found
+
+
+def posts_exist(post_ids: list, collection: str = "posts") -> set:
+    """Which of these post IDs already exist (batched, projected to post_id)."""
+    try:
+        return set(get_existing(post_ids, collection, fields=["post_id"]))
+    except Exception as e:
+        print(f"⚠️  Error checking posts: {e}")
+        return set()
+
+
 def get_existing_hashes(source_id: str = None, limit: int = 100) -> set:
     """
     Get content hashes of existing posts.
@@ -288,14 +353,19 @@ def get_existing_hashes(source_id: str = None, limit: int = 100) -> set:
     Used for duplicate detection - if a post's hash matches an existing one,
     we know the content hasn't changed and can skip it.
     
+    Only the content_hash field is downloaded (projected query).
+    
+    NOTE: save_posts_batch() uses the local dedupe index instead
+    (src/dedupe_index.py) - this only sees `limit` documents.
+    
     PARAMETERS:
     -----------
     source_id : str
         Optional - only get hashes from this source
-        
+    
     limit : int
         Maximum number of hashes to retrieve
-        
+    
     RETURNS:
     --------
     set : Set of content_hash strings
@@ -304,7 +374,7 @@ def get_existing_hashes(source_id: str = None, limit: int = 100) -> set:
         return set()
     
     try:
-        query = _firestore_client.collection("posts")
+        query = _firestore_client.collection("posts").select(["content_hash"])
         
         if source_id:
             query = query.where("source_id", "==", source_id)
@@ -319,83 +389,219 @@ def get_existing_hashes(source_id: str = None, limit: int = 100) -> set:
                 hashes.add(data['content_hash'])
         
         return hashes
-        
+    
     except Exception as e:
         print(f"⚠️  Error getting hashes: {e}")
         return set()
 
 
+# =============================================================================
+# PARALLEL BATCH WRITER
+# =============================================================================
+
+# Firestore limit: 500 writes per batch
+BATCH_SIZE = 500
+
+
+def _is_transient(error: Exception) -> bool:
+    """Errors worth retrying (timeouts, overload, contention)."""
+    if not FIREBASE_AVAILABLE:
+        return True
+    return isinstance(error, (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+        google_exceptions.TooManyRequests,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.Aborted,
+    ))
+
+
+def _commit_batch(posts: list, collection: str, retry: dict) -> dict:
+    """
+    Commit one batch, retrying transient errors with exponential backoff.
+    
+    A new WriteBatch is built for every attempt (a failed one can't be reused).
+    """
+    delay = retry.get("initial_delay_seconds", 5)
+    max_retries = retry.get("max_retries", 3)
+    t0 = time.time()
+    
+    for attempt in range(1, max_retries + 2):
+        try:
+            batch = _firestore_client.batch()
+            col = _firestore_client.collection(collection)
+            now = datetime.now(timezone.utc).isoformat()
+            for post_data in posts:
+                post_data['updated_at'] = now
+                batch.set(col.document(post_data['post_id']), post_data)
+            batch.commit()
+            return {"ok": True, "size": len(posts), "attempts": attempt,
+                    "seconds": time.time() - t0}
+        except Exception as e:
+            if attempt > max_retries or not _is_transient(e):
+                print(f"❌ Batch of {len(posts)} failed after {attempt} attempt(s): {e}")
+                return {"ok": False, "size": len(posts), "attempts": attempt,
+                        "seconds": time.time() - t0, "error": str(e)}
+            print(f"⚠️  Batch commit failed ({e}), retry {attempt}/{max_retries} in {delay:.0f}s")
+            time.sleep(delay)
+            delay = min(delay * retry.get("backoff_multiplier", 2),
+                        retry.get("max_delay_seconds", 300))
+
+
+def _write_batches(posts: list, collection: str, index) -> dict:
+    """Commit posts in 500-write batches, several in flight at once."""
+    retry = get_setting("scraping.retry", {}) or {}
+    in_flight = max(1, get_setting("firebase.max_in_flight_batches", 4))
+    chunks = [posts[i:i + BATCH_SIZE] for i in range(0, len(posts), BATCH_SIZE)]
+    out = {"saved": 0, "errors": 0, "failed_ids": [], "batches": [], "posts_per_second": 0.0}
+    
+    t0 = time.time()
+    with ThreadPoolExecutor(max_workers=min(in_flight, len(chunks))) as pool:
+        futures = {pool.submit(_commit_batch, chunk, collection, retry): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            result = future.result()
+            out["batches"].append({k: round(v, 3) if isinstance(v, float) else v
+                                   for k, v in result.items() if k != "ok"})
+            if result["ok"]:
+                index.add(chunk)
+                out["saved"] += len(chunk)
+            else:
+                out["errors"] += len(chunk)
+                out["failed_ids"].extend(p['post_id'] for p in chunk)
+    elapsed = time.time() - t0
+    
+    out["posts_per_second"] = round(out["saved"] / elapsed, 1) if elapsed else 0.0
+    latencies = [b["seconds"] for b in out["batches"]]
+    print(f"📤 {len(chunks)} batch(es), up to {in_flight} in flight: "
+          f"median {statistics.median(latencies):.2f}s, max {max(latencies):.2f}s per batch, "
+          f"{out['posts_per_second']:.0f} posts/s")
+    return out
+
+
+@traced("save")
 def save_posts_batch(posts: list, collection: str = "posts") -> dict:
     """
     Save multiple posts efficiently using batch write.
     
     Firestore allows up to 500 operations per batch, making this
-    much faster than saving one by one.
+    much faster than saving one by one. Batches are committed in
+    parallel (firebase.max_in_flight_batches at a time) and retried
+    with backoff (scraping.retry); a failed batch only loses its own posts.
     
     RETURNS:
     --------
     dict with keys:
         - saved: int (number successfully saved)
         - skipped: int (number skipped - duplicates or no ID)
-        - errors: int (number that failed)
+        - near_duplicates: int (of skipped: text almost the same as a saved post)
+        - edits: int (saved posts that changed since they were last saved here)
+        - suspicious_edits: list (post_ids of edits above suspicious_change_threshold)
+        - errors: int (number of posts that failed, after retries)
+        - failed_ids: list (post_ids that were NOT saved)
+        - batches: list (size, seconds, attempts per committed batch)
+        - posts_per_second: float (write throughput)
+        - dedupe: dict (Bloom filter size and false-positive rates)
     """
     if _firestore_client is None:
         print("❌ Firebase not initialized")
         return {"saved": 0, "skipped": 0, "errors": 0}
     
-    results = {"saved": 0, "skipped": 0, "errors": 0}
-    
-    # Get existing hashes for duplicate detection
-    existing_hashes = get_existing_hashes()
+    results = {"saved": 0, "skipped": 0, "near_duplicates": 0, "edits": 0, "suspicious_edits": [],
+               "errors": 0, "failed_ids": [], "batches": [], "posts_per_second": 0.0}
     
+    # Duplicate detection: local index of everything written so far
+    # (syncs changes from other writers at most once per interval)
+    index = get_dedupe_index()
+    verify_remote = get_setting("dedupe_index.verify_remote", False)
     try:
-        batch = _firestore_client.batch()
-        batch_count = 0
+        synced = index.sync(_firestore_client, collection)
+        if synced:
+            print(f"🔄 Dedupe index: synced {synced} changed posts ({index.count()} total)")
+    except Exception as e:
+        print(f"⚠️  Dedupe index sync failed, checking Firestore directly: {e}")
+        verify_remote = True
+    
+    # Near-duplicates ("See more" expanded, new timestamp): SimHash within the threshold
+    fuzzy = get_setting("duplicate_detection.fuzzy_match_enabled", False)
+    fuzzy_bits = max_distance(get_setting("duplicate_detection.fuzzy_match_threshold", 0.95))
+    
+    batch_hashes = set()  # Same content twice in this call
+    batch_fingerprints = []
+    candidates = []
+    for post in posts:
+        # Convert ScrapedPost to dict if needed
+        if hasattr(post, 'to_dict'):
+            post_data = post.to_dict()
+        else:
+            post_data = post
         
-        for post in posts:
-            # Convert ScrapedPost to dict if needed
-            if hasattr(post, 'to_dict'):
-                post_data = post.to_dict()
-            else:
-                post_data = post
-            
-            post_id = post_data.get('post_id')
-            content_hash = post_data.get('content_hash')
-            
-            # Skip if no ID
-            if not post_id:
-                results["skipped"] += 1
-                continue
-            
-            # Skip if same content exists
-            if content_hash and content_hash in existing_hashes:
-                results["skipped"] += 1
-                continue
-            
-            # Add to batch
-            doc_ref = _firestore_client.collection(collection).document(post_id)
-            post_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-            batch.set(doc_ref, post_data)
-            batch_count += 1
-            
-            # Firestore limit: 500 per batch
-            if batch_count >= 500:
-                batch.commit()
-                results["saved"] += batch_count
-                batch = _firestore_client.batch()
-                batch_count = 0
+        post_id = post_data.get('post_id')
+        content_hash = post_data.get('content_hash')
         
-        # Commit remaining
-        if batch_count > 0:
-            batch.commit()
-            results["saved"] += batch_count
+        # Skip if no ID
+        if not post_id:
+            results["skipped"] += 1
+            continue
         
-        print(f"✅ Batch save complete: {results['saved']} saved, {results['skipped']} skipped")
+        # Skip if same content exists
+        if content_hash and (content_hash in batch_hashes or index.has_hash(content_hash)):
+            results["skipped"] += 1
+            continue
+        if content_hash:
+            batch_hashes.add(content_hash)
         
-    except Exception as e:
-        print(f"❌ Batch save error: {e}")
-        results["errors"] += 1
-    
+        # A post we saved before whose content changed: an edit, not a near-duplicate
+        previous = index.previous_version(post_id)
+        
+        if fuzzy and post_data.get('text'):
+            fingerprint = simhash(post_data['text'])
+            if previous is None:
+                if any(distance(fingerprint, fp) <= fuzzy_bits for fp in batch_fingerprints):
+                    match = (None, 1.0)
+                else:
+                    match = index.find_near_duplicate(fingerprint, fuzzy_bits)
+                if match and match[0] != post_id:
+                    results["skipped"] += 1
+                    results["near_duplicates"] += 1
+                    continue
+            batch_fingerprints.append(fingerprint)
+            post_data['simhash'] = f"{fingerprint:016x}"
+        
+        # Edit history rides along in the post document (same batch.set, no extra writes)
+        if previous is not None and record_edit(post_data, previous):
+            results["edits"] += 1
+            if post_data["suspicious_edit"]:
+                results["suspicious_edits"].append(post_id)
+        candidates.append(post_data)
+    
+    # Index can't be trusted: one projected get_all per 500 posts instead of N reads
+    if verify_remote and candidates:
+        try:
+            remote = get_existing([p['post_id'] for p in candidates], collection)
+            unchanged = [p for p in candidates
+                         if remote.get(p['post_id'], {}).get('content_hash') == p.get('content_hash')]
+            index.add(unchanged)
+            results["skipped"] += len(unchanged)
+            unchanged_ids = {p['post_id'] for p in unchanged}
+            candidates = [p for p in candidates if p['post_id'] not in unchanged_ids]
+        except Exception as e:
+            print(f"⚠️  Remote duplicate check failed: {e}")
+    
+    if candidates:
+        tag_posts(candidates)  # Only posts that will be written (keywords.json)
+        results.update(_write_batches(candidates, collection, index))
+    
+    print(f"✅ Batch save complete: {results['saved']} saved, {results['skipped']} skipped"
+          + (f" ({results['near_duplicates']} near-duplicates)" if results['near_duplicates'] else "")
+          + (f", {results['edits']} edits" if results['edits'] else "")
+          + (f", {results['errors']} failed" if results['errors'] else ""))
+    
+    results["dedupe"] = metrics = index.metrics()
+    print(f"🌸 Dedupe pre-check: {metrics['bloom_negatives']}/{metrics['checks']} answered by "
+          f"Bloom filter ({metrics['bloom_kb']:.0f}KB, est. FP {metrics['estimated_fp_rate']:.4%}, "
+          f"observed {metrics['false_positives']} false positives)")
     return results
 
 
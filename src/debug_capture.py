@@ -0,0 +1,148 @@
+"""
+Debug Capture
+=============
+Page snapshots for debugging, only when asked for. Normal runs never
+fetch page_source / page.content(), so capture costs nothing unless on.
+
+When a capture is wanted, the scraper hands the HTML and text to a
+background thread, which compresses them into per-source, per-run files
+and keeps only the newest `keep_per_source` runs of each source:
+
+    data/debug/qcu1994/20260117T081500_selenium.html.gz
+    data/debug/qcu1994/20260117T081500_selenium.txt.gz
+    
+    if should_capture(page_id, failed=False):
+        get_debug_capture().submit(page_id, "selenium", driver.page_source, text)
+
+Import a snapshot into the replay corpus with:
+    python src/replay.py --import data/debug/qcu1994/<file>.html.gz --as qcu1994
+
+Settings (settings.json → debug_capture):
+    mode: "off" | "on_failure" | "always"
+    sources: page IDs that are always captured (whatever the mode)
+    dir, compression ("gzip" | "zstd" - needs the zstandard package),
+    keep_per_source, max_html_kb (larger pages are truncated)
+"""
+
+import atexit
+import gzip
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+def should_capture(page_id: str, failed: bool = False) -> bool:
+    """Whether this scrape's page should be captured."""
+    cfg = get_setting("debug_capture", {}) or {}
+    if page_id in cfg.get("sources", []):
+        return True
+    mode = cfg.get("mode", "off")
+    return mode == "always" or (failed and mode == "on_failure")
+
+
+def open_snapshot(path) -> str:
+    """Read a snapshot file (.gz, .zst or plain) as text."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    if path.suffix == ".zst":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Reading .zst snapshots needs: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(path.read_bytes()).decode('utf-8')
+    return path.read_text(encoding='utf-8')
+
+
+class DebugCapture:
+    """Background writer for compressed page snapshots."""
+    
+    def __init__(self):
+        cfg = get_setting("debug_capture", {}) or {}
+        self.dir = Path(cfg.get("dir", "data/debug"))
+        self.keep = max(1, cfg.get("keep_per_source", 5))
+        self.max_html_kb = cfg.get("max_html_kb", 4096)
+        compression = cfg.get("compression", "gzip")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            print("⚠️  zstandard not installed - debug snapshots use gzip")
+            compression = "gzip"
+        self.compression = compression
+        
+        self._queue = queue.Queue(maxsize=8)  # Snapshots are large; don't pile them up
+        self._thread = threading.Thread(target=self._run, name="debug-capture", daemon=True)
+        self._thread.start()
+    
+    def submit(self, page_id: str, tool: str, html: Optional[str], text: str = "",
+               error: Optional[str] = None):
+        """Queue a snapshot. Dropped (not blocking the scrape) when the writer is behind."""
+        if html and len(html) > self.max_html_kb * 1024:
+            html = html[:self.max_html_kb * 1024] + "\n<!-- truncated by debug_capture -->"
+        if error:
+            text = f"ERROR: {error}\n\n{text}"
+        stem = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}_{tool}"
+        try:
+            self._queue.put_nowait((page_id, stem, html, text))
+        except queue.Full:
+            print(f"⚠️  Debug capture queue full, skipped {page_id}")
+    
+    def close(self):
+        """Write everything still queued."""
+        self._queue.put(None)
+        self._thread.join()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._write(*item)
+            except Exception as e:
+                print(f"⚠️  Debug capture failed for {item[0]}: {e}")
+    
+    def _compress(self, data: str) -> bytes:
+        raw = data.encode('utf-8')
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+    
+    def _write(self, page_id: str, stem: str, html: Optional[str], text: str):
+        folder = self.dir / page_id
+        folder.mkdir(parents=True, exist_ok=True)
+        suffix = ".zst" if self.compression == "zstd" else ".gz"
+        if html:
+            (folder / f"{stem}.html{suffix}").write_bytes(self._compress(html))
+        if text:
+            (folder / f"{stem}.txt{suffix}").write_bytes(self._compress(text))
+        self._rotate(folder)
+    
+    def _rotate(self, folder: Path):
+        """Keep the newest `keep` runs (a run = files sharing one timestamp_tool stem)."""
+        runs = sorted({p.name.split(".")[0] for p in folder.iterdir() if p.is_file()})
+        for stem in runs[:-self.keep]:
+            for path in folder.glob(f"{stem}.*"):
+                path.unlink(missing_ok=True)
+
+
+_capture = None
+
+
+def get_debug_capture() -> DebugCapture:
+    """Process-wide writer (started on first capture, flushed at exit)."""
+    global _capture
+    if _capture is None:
+        _capture = DebugCapture()
+        atexit.register(_capture.close)
+    return _capture
@@ -0,0 +1,305 @@
+"""
+Local Dedupe Index
+==================
+Every post_id / content_hash we have written, in a local SQLite file, so
+duplicate checks are local lookups instead of Firestore reads.
+
+    index = get_dedupe_index()
+    index.sync(client)                # pull changes made by other writers
+    index.has_hash(post["content_hash"])
+    index.add(saved_posts)            # after the batch commit succeeds
+
+Sync is incremental: only documents whose updated_at is newer than the last
+sync are read, and at most once per `sync_interval_minutes`. The first
+sync (empty index) reads every document once, projected to five fields.
+There is no row limit, so it stays correct at the 10,000-post retention
+size (data_retention.max_posts_to_keep).
+
+A memory-mapped Bloom filter (src/bloom.py) sits in front of SQLite: most
+checks are for new posts and are answered "definitely new" without a
+query. Only possible hits go to the exact lookup. It is rebuilt from
+SQLite when missing or past its capacity.
+
+The filter file is shared by every process on the machine (worker
+processes, overlapping runs). Writes and rebuilds hold a FileLock on
+<bloom_path>.lock; a rebuild is written to a temp file and swapped in with
+os.replace(), and processes still mapping the old file reopen it on their
+next lookup.
+
+The same file holds the posts' SimHash fingerprints (src/near_dupe.py)
+for near-duplicate lookups:
+
+    index.find_near_duplicate(simhash(text), max_distance(0.95))
+
+and, with edit tracking on, the last saved text and edit history of each
+post written from this machine (src/edit_history.py):
+
+    index.previous_version(post_id)
+
+Settings (settings.json → dedupe_index):
+    path, sync_interval_minutes, bloom_path, bloom_capacity, bloom_fp_rate,
+    verify_remote (also confirm with one projected get_all per 500 posts -
+    used automatically when a sync fails)
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+    from src.bloom import BloomFilter
+    from src.file_lock import FileLock
+    from src.near_dupe import SimHashStore
+    from src.edit_history import EditStore, edit_tracking_enabled
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+    from bloom import BloomFilter
+    from file_lock import FileLock
+    from near_dupe import SimHashStore
+    from edit_history import EditStore, edit_tracking_enabled
+
+
+SYNC_FIELDS = ["post_id", "content_hash", "source_id", "updated_at", "simhash"]
+
+
+class DedupeIndex:
+    """SQLite table of saved posts, keyed by post_id with an index on content_hash."""
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or get_setting("dedupe_index.path", "data/dedupe_index.sqlite"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS posts (
+                post_id      TEXT PRIMARY KEY,
+                content_hash TEXT,
+                source_id    TEXT,
+                updated_at   TEXT
+            );
+            CREATE INDEX IF NOT EXISTS posts_hash ON posts(content_hash);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self.near = SimHashStore(self._db)
+        self.edits = EditStore(self._db) if edit_tracking_enabled() else None
+        
+        self.bloom = None
+        self.bloom_path = Path(get_setting("dedupe_index.bloom_path", "data/dedupe_bloom.bin"))
+        self._bloom_lock = self.bloom_path.with_suffix(self.bloom_path.suffix + ".lock")
+        self._open_bloom(get_setting("dedupe_index.bloom_capacity", 100_000))
+        
+        # Pre-check counters (see metrics())
+        self.checks = 0
+        self.bloom_negatives = 0
+        self.false_positives = 0
+    
+    # ─────────────────────────────────────────────────
+    # Bloom filter
+    # ─────────────────────────────────────────────────
+    
+    def _open_bloom(self, capacity: int, rebuild: bool = False):
+        """Open the filter; (re)build it from SQLite if it is new or over capacity."""
+        path = self.bloom_path
+        fp_rate = get_setting("dedupe_index.bloom_fp_rate", 0.001)
+        
+        with FileLock(self._bloom_lock):
+            if self.bloom:
+                self.bloom.close()
+            bloom = BloomFilter.open(path, capacity, fp_rate)
+            rows = self._db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            if rebuild and not bloom.full:
+                rebuild = False  # Another process rebuilt it first
+            if not rebuild and (not rows or (bloom.count and bloom.capacity >= 2 * rows)):
+                self.bloom = bloom
+                return
+            
+            # Missing, stale or too small: rebuild with room to grow, in a temp
+            # file so other processes never see a half-built filter
+            tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+            tmp.unlink(missing_ok=True)
+            fresh = BloomFilter.open(tmp, max(capacity, 4 * rows), fp_rate)
+            for post_id, content_hash in self._db.execute("SELECT post_id, content_hash FROM posts"):
+                _bloom_add(fresh, post_id, content_hash)
+            fresh.close()
+            os.replace(tmp, path)
+            bloom.retire()  # Other processes mapping the old file reopen the path
+            bloom.close()
+            self.bloom = BloomFilter.open(path)
+    
+    def _reopen_bloom(self):
+        """Switch to the file a rebuild (maybe in another process) swapped in."""
+        self.bloom.close()
+        self.bloom = BloomFilter.open(self.bloom_path)
+    
+    def _bloom_add_rows(self, rows: list):
+        """Add (post_id, content_hash, ...) rows, under the filter's file lock."""
+        with FileLock(self._bloom_lock):
+            if self.bloom.stale:
+                self._reopen_bloom()
+            for row in rows:
+                _bloom_add(self.bloom, row[0], row[1])
+            self.bloom.flush()
+    
+    def _maybe_contains(self, key: str) -> bool:
+        self.checks += 1
+        if self.bloom.stale:
+            self._reopen_bloom()
+        if key in self.bloom:
+            return True
+        self.bloom_negatives += 1
+        return False
+    
+    # ─────────────────────────────────────────────────
+    # Lookups
+    # ─────────────────────────────────────────────────
+    
+    def has_hash(self, content_hash: str) -> bool:
+        with self._lock:
+            if not self._maybe_contains("h:" + content_hash):
+                return False
+            row = self._db.execute("SELECT 1 FROM posts WHERE content_hash = ? LIMIT 1",
+                                   (content_hash,)).fetchone()
+            self.false_positives += row is None
+        return row is not None
+    
+    def has_post(self, post_id: str) -> bool:
+        with self._lock:
+            if not self._maybe_contains("p:" + post_id):
+                return False
+            row = self._db.execute("SELECT 1 FROM posts WHERE post_id = ?",
+                                   (post_id,)).fetchone()
+            self.false_positives += row is None
+        return row is not None
+    
+    def find_near_duplicate(self, fingerprint: int, max_bits: int) -> Optional[tuple]:
+        """Saved post whose SimHash is within max_bits bits: (post_id, similarity) or None."""
+        with self._lock:
+            return self.near.find(fingerprint, max_bits)
+    
+    def previous_version(self, post_id: str) -> Optional[dict]:
+        """Last saved text, images and edit history of a post (None if unknown or tracking is off)."""
+        if self.edits is None:
+            return None
+        with self._lock:
+            return self.edits.previous(post_id)
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    
+    def metrics(self) -> dict:
+        """Bloom filter footprint and false-positive rates (estimated and observed)."""
+        possible_hits = self.checks - self.bloom_negatives
+        return {
+            "bloom_kb": round(self.bloom.memory_bytes / 1024, 1),
+            "bloom_keys": self.bloom.count,
+            "bloom_capacity": self.bloom.capacity,
+            "estimated_fp_rate": round(self.bloom.estimated_fp_rate, 6),
+            "checks": self.checks,
+            "bloom_negatives": self.bloom_negatives,
+            "false_positives": self.false_positives,
+            "observed_fp_rate": round(self.false_positives / possible_hits, 6) if possible_hits else 0.0,
+        }
+    
+    # ─────────────────────────────────────────────────
+    # Updates
+    # ─────────────────────────────────────────────────
+    
+    def add(self, posts: list):
+        """Record posts that were written to Firestore."""
+        rows = [(p.get("post_id"), p.get("content_hash"), p.get("source_id"), p.get("updated_at"))
+                for p in posts if p.get("post_id")]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?)", rows)
+            self.near.add(_fingerprints(posts))
+            if self.edits is not None:
+                self.edits.add(posts)
+            self._bloom_add_rows(rows)
+        self._check_capacity()
+    
+    def _check_capacity(self):
+        if self.bloom.full:
+            with self._lock:
+                self._open_bloom(self.bloom.capacity * 2, rebuild=True)
+    
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, key: str, value: str):
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+    
+    def sync(self, client, collection: str = "posts", force: bool = False) -> int:
+        """
+        Pull documents changed since the last sync from Firestore.
+        
+        Returns:
+            Number of documents read (0 when the sync was skipped)
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            last_sync = self._meta(f"synced_at:{collection}")
+            high_water = self._meta(f"high_water:{collection}")
+        
+        interval = timedelta(minutes=get_setting("dedupe_index.sync_interval_minutes", 60))
+        if not force and last_sync and now - datetime.fromisoformat(last_sync) < interval:
+            return 0
+        
+        query = client.collection(collection).select(SYNC_FIELDS)
+        if high_water:
+            query = query.where("updated_at", ">", high_water).order_by("updated_at")
+        
+        rows = []
+        fingerprints = []
+        for doc in query.stream():
+            data = doc.to_dict()
+            rows.append((data.get("post_id") or doc.id, data.get("content_hash"),
+                         data.get("source_id"), data.get("updated_at")))
+            if data.get("simhash"):
+                fingerprints.append({"post_id": rows[-1][0], "simhash": data["simhash"]})
+        
+        newest = max([r[3] for r in rows if r[3]] + ([high_water] if high_water else []),
+                     default=None)
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?)", rows)
+            self.near.add(_fingerprints(fingerprints))
+            self._bloom_add_rows(rows)
+            if newest:
+                self._set_meta(f"high_water:{collection}", newest)
+            self._set_meta(f"synced_at:{collection}", now.isoformat())
+        self._check_capacity()
+        return len(rows)
+    
+    def close(self):
+        with self._lock:
+            self.bloom.close()
+            self._db.close()
+
+
+def _bloom_add(bloom: BloomFilter, post_id: Optional[str], content_hash: Optional[str]):
+    if post_id:
+        bloom.add("p:" + post_id)
+    if content_hash:
+        bloom.add("h:" + content_hash)
+
+
+def _fingerprints(posts: list) -> list:
+    """(post_id, fingerprint) of the posts that carry a `simhash`."""
+    return [(p["post_id"], int(p["simhash"], 16)) for p in posts
+            if p.get("post_id") and p.get("simhash")]
+
+
+_index = None
+
+
+def get_dedupe_index() -> DedupeIndex:
+    """Process-wide index (opened on first use)."""
+    global _index
+    if _index is None:
+        _index = DedupeIndex()
+    return _index
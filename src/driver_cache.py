@@ -0,0 +1,181 @@
+"""
+Chromedriver Resolution Cache
+=============================
+`ChromeDriverManager().install()` resolves versions (and may hit the
+network) on every call. This module remembers which chromedriver works
+with the installed Chrome and reuses it.
+
+Lookup order:
+1. Already resolved in this process          → "memory"
+2. data/driver_cache.json entry for this Chrome major version,
+   and the file is still on disk              → "hit"
+3. Offline mode: newest valid cached driver   → "offline"
+4. webdriver-manager download/resolve, then cache it → "miss"
+
+Settings (settings.json → driver_cache):
+    enabled, offline, cache_file
+
+Set SCRAPER_OFFLINE=1 to force offline mode for one run.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    WDM_AVAILABLE = True
+except ImportError:
+    WDM_AVAILABLE = False
+
+
+_resolved = None  # (driver_path, chrome_major) for this process
+
+
+# ==============================================================================
+# CHROME VERSION DETECTION
+# ==============================================================================
+
+def _chrome_version_windows() -> Optional[str]:
+    """Read the version Chrome writes to the registry (no process spawn)."""
+    import winreg
+    for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            continue
+    return None
+
+
+def _chrome_version_cli() -> Optional[str]:
+    """Ask the Chrome binary for its version (macOS / Linux)."""
+    candidates = [
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+    ]
+    for binary in candidates:
+        try:
+            out = subprocess.run([binary, "--version"], capture_output=True,
+                                 text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", out)
+        if match:
+            return match.group(1)
+    return None
+
+
+def detect_chrome_version() -> Optional[str]:
+    """Installed Chrome version like '144.0.7559.97', or None if not found."""
+    try:
+        if sys.platform == "win32":
+            return _chrome_version_windows()
+        return _chrome_version_cli()
+    except Exception:
+        return None
+
+
+# ==============================================================================
+# CACHE FILE
+# ==============================================================================
+
+def _cache_path() -> Path:
+    return Path(get_setting("driver_cache.cache_file", "data/driver_cache.json"))
+
+
+def _load_cache() -> dict:
+    try:
+        return json.loads(_cache_path().read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_cache(cache: dict):
+    path = _cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2), encoding='utf-8')
+
+
+def _is_valid_driver(path: Optional[str]) -> bool:
+    """The cached driver still exists and can be executed."""
+    if not path:
+        return False
+    p = Path(path)
+    return p.is_file() and (sys.platform == "win32" or os.access(p, os.X_OK))
+
+
+def _is_offline() -> bool:
+    if os.environ.get("SCRAPER_OFFLINE", "").lower() in ("1", "true", "yes"):
+        return True
+    return bool(get_setting("driver_cache.offline", False))
+
+
+# ==============================================================================
+# RESOLUTION
+# ==============================================================================
+
+def resolve_chromedriver() -> tuple[Optional[str], str]:
+    """
+    Find a chromedriver for the installed Chrome.
+    
+    Returns:
+        Tuple of (driver path, cache status). The path is None when nothing
+        could be resolved offline; pass that to Service() and Selenium
+        Manager will look for a driver itself (also when webdriver-manager
+        is not installed).
+        Status is one of: "memory", "hit", "offline", "miss", "disabled".
+    """
+    global _resolved
+    
+    if not get_setting("driver_cache.enabled", True):
+        return (ChromeDriverManager().install() if WDM_AVAILABLE else None), "disabled"
+    
+    if _resolved and _is_valid_driver(_resolved[0]):
+        return _resolved[0], "memory"
+    
+    cache = _load_cache()
+    offline = _is_offline()
+    version = detect_chrome_version()
+    major = version.split('.')[0] if version else None
+    
+    # Exact match for this Chrome major version
+    entry = cache.get(major) if major else None
+    if entry and _is_valid_driver(entry.get("path")):
+        _resolved = (entry["path"], major)
+        return entry["path"], "hit"
+    
+    # Offline: newest driver we still have, even if Chrome version is unknown
+    if offline:
+        valid = [e for e in cache.values() if _is_valid_driver(e.get("path"))]
+        if valid:
+            newest = max(valid, key=lambda e: e.get("resolved_at", ""))
+            _resolved = (newest["path"], major)
+            return newest["path"], "offline"
+        print("⚠️  Offline and no cached chromedriver - letting Selenium Manager resolve it")
+        return None, "offline"
+    
+    # Miss: resolve once with webdriver-manager and remember it
+    if not WDM_AVAILABLE:
+        print("⚠️  webdriver-manager not installed - letting Selenium Manager resolve chromedriver")
+        return None, "miss"
+    path = ChromeDriverManager().install()
+    if major:
+        cache[major] = {
+            "path": path,
+            "chrome_version": version,
+            "resolved_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _save_cache(cache)
+    _resolved = (path, major)
+    return path, "miss"
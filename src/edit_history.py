@@ -0,0 +1,173 @@
+"""
+Edit History
+============
+Tracks edits to posts we already saved: each post document keeps its
+current text plus up to `max_history_versions` compact diffs back to the
+earlier versions, a change ratio, and a `suspicious_edit` flag.
+
+History is stored on the post itself, so an edit is written by the same
+batch.set() as the post - no extra writes or reads. The previous text of
+every saved post is kept locally (in the dedupe index file) to diff against:
+
+    previous = store.previous(post["post_id"])     # None if never saved here
+    if previous:
+        record_edit(post, previous)                # adds version / edit_history / ...
+    ...commit...
+    store.add(saved_posts)
+
+Diffs are reverse deltas over word tokens: applying them to the NEWER text
+gives the older one, so only the current text is stored in full. Each
+change is a map (Firestore does not allow arrays inside arrays).
+
+    post["edit_history"] = [
+        {"version": 1, "saved_at": "...", "change_ratio": 0.08,
+         "diff": [{"start": 12, "end": 14, "text": "Monday,"},
+                  {"start": 40, "end": 40, "text": " (room 301)"}]},
+    ]
+    restore(post["text"], post["edit_history"], version=1)
+
+change_ratio = 1 - difflib.SequenceMatcher(old, new).ratio(), from 0
+(same) to 1 (nothing in common). An edit at or above
+suspicious_change_threshold is flagged (and printed if alert_on_suspicious_edit).
+
+Posts saved by another machine have no local previous text; their next
+edit starts a new history.
+
+Settings (settings.json → edit_tracking):
+    enabled, max_history_versions, track_fields ("body", "images"),
+    alert_on_suspicious_edit, suspicious_change_threshold
+"""
+
+import json
+import re
+import sqlite3
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+_TOKEN = re.compile(r"\S+\s*|\s+")  # Words with their trailing whitespace
+
+
+def tokens(text: str) -> list:
+    """Words with their trailing whitespace (joining them gives the text back)."""
+    return _TOKEN.findall(text or "")
+
+
+def compact_diff(new: str, old: str) -> tuple:
+    """
+    Reverse delta from `new` to `old`, and the change ratio.
+    
+    Returns:
+        ([{"start", "end", "text"}, ...], change_ratio) - token ranges of `new`
+        and what replaces them
+    """
+    a, b = tokens(new), tokens(old)
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    ops = [{"start": i1, "end": i2, "text": "".join(b[j1:j2])}
+           for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+    return ops, round(1 - matcher.ratio(), 4)
+
+
+def apply_diff(text: str, ops: list) -> str:
+    """Apply a compact_diff() delta to the text it was made from."""
+    parts = tokens(text)
+    for op in reversed(ops):
+        parts[op["start"]:op["end"]] = [op["text"]]
+    return "".join(parts)
+
+
+def restore(text: str, history: list, version: int) -> str:
+    """Text of an earlier version, walking the history back from the current text."""
+    for entry in reversed(history):
+        text = apply_diff(text, entry["diff"])
+        if entry["version"] == version:
+            return text
+    raise KeyError(f"Version {version} is not in the history")
+
+
+def edit_tracking_enabled() -> bool:
+    return bool(get_setting("edit_tracking.enabled", True))
+
+
+def record_edit(post: dict, previous: dict) -> Optional[dict]:
+    """
+    Compare a post with its previously saved version and, if a tracked field
+    changed, add version, edit_history, last_change_ratio, suspicious_edit
+    and edited_at to the post (in place).
+    
+    Returns:
+        The new history entry, or None if nothing tracked changed
+    """
+    fields = get_setting("edit_tracking.track_fields", ["body", "images"])
+    text_changed = "body" in fields and post.get("text", "") != previous["text"]
+    images_changed = "images" in fields and (post.get("images") or []) != previous["images"]
+    if not (text_changed or images_changed):
+        if previous["history"]:  # Rewritten anyway: keep the history on the document
+            post["version"] = previous["version"]
+            post["edit_history"] = previous["history"]
+            post["last_change_ratio"] = previous["history"][-1]["change_ratio"]
+        return None
+    
+    ops, ratio = compact_diff(post.get("text", ""), previous["text"]) if text_changed else ([], 0.0)
+    entry = {
+        "version": previous["version"],
+        "saved_at": previous["saved_at"],
+        "change_ratio": ratio,
+        "diff": ops,
+    }
+    if images_changed:
+        entry["images"] = previous["images"]
+    
+    max_versions = max(1, get_setting("edit_tracking.max_history_versions", 10))
+    suspicious = ratio >= get_setting("edit_tracking.suspicious_change_threshold", 0.5)
+    post["version"] = previous["version"] + 1
+    post["edit_history"] = (previous["history"] + [entry])[-max_versions:]
+    post["last_change_ratio"] = ratio
+    post["suspicious_edit"] = suspicious
+    post["edited_at"] = datetime.now(timezone.utc).isoformat()
+    
+    if suspicious and get_setting("edit_tracking.alert_on_suspicious_edit", True):
+        print(f"⚠️  Suspicious edit: {post['post_id']} changed {ratio:.0%} "
+              f"(v{previous['version']} → v{post['version']})")
+    return entry
+
+
+class EditStore:
+    """Last saved text, images and history of each post, in an existing SQLite connection."""
+    
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS post_versions (
+                post_id   TEXT PRIMARY KEY,
+                text      TEXT,
+                images    TEXT,     -- JSON list
+                version   INTEGER,
+                history   TEXT,     -- JSON list of edit_history entries
+                saved_at  TEXT
+            );
+        """)
+    
+    def previous(self, post_id: str) -> Optional[dict]:
+        row = self._db.execute(
+            "SELECT text, images, version, history, saved_at FROM post_versions WHERE post_id = ?",
+            (post_id,)).fetchone()
+        if row is None:
+            return None
+        return {"text": row[0], "images": json.loads(row[1]), "version": row[2],
+                "history": json.loads(row[3]), "saved_at": row[4]}
+    
+    def add(self, posts: list):
+        """Remember saved posts as the base for their next diff. Caller commits."""
+        self._db.executemany(
+            "INSERT OR REPLACE INTO post_versions VALUES (?, ?, ?, ?, ?, ?)",
+            [(p["post_id"], p.get("text", ""), json.dumps(p.get("images") or []),
+              p.get("version", 1), json.dumps(p.get("edit_history", []), ensure_ascii=False),
+              p.get("updated_at") or p.get("scraped_at"))
+             for p in posts if p.get("post_id")])
@@ -0,0 +1,489 @@
+"""
+Post Extraction
+===============
+Turns page content into post dicts. Shared by every scraper path.
+
+Two modes (settings.json → scraping.extraction.mode):
+- "dom":  one JS pass per screen walks the feed's article nodes and returns
+          compact records (text, permalink, timestamp, images). Post IDs come
+          from the Facebook permalink, so they stay stable across edits.
+- "text": the whole body text is pulled and split with line heuristics
+          (used automatically if the DOM pass finds no articles).
+
+The text pipeline is a chain of generators, so nothing is split or copied
+up front and work stops as soon as enough posts are found:
+
+    page text ──► iter_lines() ──► iter_blocks() ──► iter_posts() ──► islice(limit)
+
+- A "line" is kept if it is longer than 10 characters
+- A "block" is a run of kept lines, kept if longer than 100 characters
+- Pre-filter: a block is rejected from its first line alone - before it is
+  joined, hashed or turned into a dict - if that line starts with a skip
+  word or contains one of keywords.json → exclude_patterns ("shared a
+  photo", "updated their cover photo"). Both are compiled once
+  (BlockFilter); DOM records go through the same check.
+- A block becomes a post unless it is too short or a duplicate
+
+Rejects are counted by reason in ScraperStats.rejected_blocks:
+skip_word, excluded, too_short.
+
+Usage:
+    posts = extract_posts(body_text, "qcu1994", "QCU Main", limit=10, stats=stats)
+
+Benchmark: python benchmarks/bench_extract.py
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Union
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+try:
+    from src.settings import get_setting
+    from src.tagger import load_keywords, trie_pattern
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+    from tagger import load_keywords, trie_pattern
+
+
+MIN_LINE_LENGTH = 10     # Shorter lines end a block (buttons, counts, names)
+MIN_BLOCK_LENGTH = 100   # Shorter blocks are UI noise
+MIN_POST_LENGTH = 50
+LINE_CHUNK_SIZE = 16 * 1024  # Characters split at a time by iter_lines()
+
+SKIP_WORDS = ['Like', 'Comment', 'Share', 'Follow', 'Message',
+              'See more', 'View more', 'Write a comment', 'Log In']
+
+SKIP_LINES = frozenset(SKIP_WORDS)
+
+
+class SegmentCounts:
+    """Lines, blocks and rejects seen so far (stops counting when extraction stops early)."""
+    __slots__ = ("lines", "blocks", "rejects")
+    
+    def __init__(self):
+        self.lines = 0
+        self.blocks = 0
+        self.rejects = {}  # reason -> blocks
+    
+    def reject(self, reason: str):
+        self.rejects[reason] = self.rejects.get(reason, 0) + 1
+
+
+class BlockFilter:
+    """
+    Skip words and exclude patterns as two compiled regexes, applied to the
+    first line of a block. Calling it returns the reject reason or None.
+    
+    Skip words are case-sensitive prefixes ("Like", "See more"); exclude
+    patterns match anywhere in the lowercased line (searching the lowercased
+    line is about twice as fast as an IGNORECASE regex).
+    """
+    
+    def __init__(self, skip_words: Iterable[str] = SKIP_WORDS,
+                 exclude_patterns: Optional[Iterable[str]] = None):
+        if exclude_patterns is None:
+            exclude_patterns = load_keywords().get("exclude_patterns", [])
+        # Longest first so "See more" wins over shorter prefixes
+        skip = "|".join(re.escape(w) for w in sorted(skip_words, key=len, reverse=True))
+        excluded = {p.lower() for p in exclude_patterns if p}
+        self.skip = re.compile(skip).match if skip else None
+        self.excluded = re.compile(rf"\b{trie_pattern(excluded)}\b").search if excluded else None
+    
+    def __call__(self, first_line: str) -> Optional[str]:
+        if self.skip and self.skip(first_line):
+            return "skip_word"
+        if self.excluded and self.excluded(first_line.lower()):
+            return "excluded"
+        return None
+
+
+_block_filter = None
+
+
+def get_block_filter() -> BlockFilter:
+    """Filter for SKIP_WORDS and keywords.json (compiled on first use)."""
+    global _block_filter
+    if _block_filter is None:
+        _block_filter = BlockFilter()
+    return _block_filter
+
+
+# ==============================================================================
+# SEGMENTATION
+# ==============================================================================
+
+def iter_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yield lines from a string or any line stream (file object, generator).
+    
+    Strings are split one chunk (~16 KB, cut at a newline) at a time, so
+    splitting stays in C but the whole page is never split up front.
+    """
+    if isinstance(source, str):
+        start = 0
+        size = len(source)
+        while True:
+            if size - start <= LINE_CHUNK_SIZE:
+                yield from source[start:].split('\n')
+                return
+            end = source.rfind('\n', start, start + LINE_CHUNK_SIZE)
+            if end == -1:
+                end = source.find('\n', start + LINE_CHUNK_SIZE)
+                if end == -1:
+                    yield source[start:]
+                    return
+            yield from source[start:end].split('\n')
+            start = end + 1
+    else:
+        for line in source:
+            yield line.rstrip('\n')
+
+
+def iter_blocks(lines: Iterable[str], counts: Optional[SegmentCounts] = None,
+                prefilter: Optional[Callable] = None) -> Iterator[str]:
+    """
+    Group long lines into text blocks. Blocks are joined once, only if long
+    enough and not rejected by `prefilter(first_line)` (see BlockFilter).
+    """
+    counts = counts or SegmentCounts()
+    current = []
+    size = 0  # Length of '\n'.join(current), tracked without joining
+    seen_lines = 0  # Counted locally, stored in counts when the generator ends
+    
+    try:
+        for seen_lines, line in enumerate(lines, 1):
+            line = line.strip()
+            if len(line) > MIN_LINE_LENGTH:
+                size += len(line) + 1
+                current.append(line)
+            elif current:
+                if size > MIN_BLOCK_LENGTH + 1:  # size counts one '\n' too many
+                    counts.blocks += 1
+                    reason = prefilter(current[0]) if prefilter else None
+                    if reason:
+                        counts.reject(reason)
+                    else:
+                        yield '\n'.join(current)
+                current = []
+                size = 0
+    finally:
+        counts.lines += seen_lines
+
+
+def block_hash(block: str) -> str:
+    """Short ID hash of a block (first 100 chars) - used for post_id and dedupe."""
+    return hashlib.md5(block[:100].encode()).hexdigest()[:8]
+
+
+def build_post(block: str, short_hash: str, page_id: str, page_name: str,
+               scraped_at: Optional[str] = None) -> dict:
+    """Post dict in the shape saved to Firestore."""
+    return {
+        "post_id": f"{page_id}_{short_hash}",
+        "source_id": page_id,
+        "source_name": page_name,
+        "title": block[:block.find('\n')][:80] if '\n' in block else block[:80],
+        "text": block[:2000],
+        "scraped_at": scraped_at or datetime.now(timezone.utc).isoformat(),
+        "content_hash": hashlib.sha256(block.encode()).hexdigest(),
+    }
+
+
+def iter_posts(source: Union[str, Iterable[str]], page_id: str, page_name: str,
+               seen: Optional[set] = None,
+               counts: Optional[SegmentCounts] = None) -> Iterator[dict]:
+    """
+    Yield posts from page text in page order.
+    
+    `seen` holds block hashes already returned (e.g. from earlier scrolls)
+    and is updated as posts are yielded. Posts from one read share a
+    scraped_at time.
+    """
+    seen = set() if seen is None else seen
+    counts = counts or SegmentCounts()
+    scraped_at = datetime.now(timezone.utc).isoformat()
+    
+    for block in iter_blocks(iter_lines(source), counts, get_block_filter()):
+        if len(block) < MIN_POST_LENGTH:
+            counts.reject("too_short")
+            continue
+        short_hash = block_hash(block)
+        if short_hash in seen:
+            continue
+        seen.add(short_hash)
+        yield build_post(block, short_hash, page_id, page_name, scraped_at)
+
+
+# ==============================================================================
+# SCRAPER ENTRY POINT
+# ==============================================================================
+
+def extract_posts(body_text: Union[str, Iterable[str]], page_id: str, page_name: str,
+                  limit: int, stats=None, seen: Optional[set] = None,
+                  verbose: bool = False) -> list:
+    """
+    Return up to `limit` NEW posts from page text.
+    
+    Args:
+        body_text: Visible page text (or a stream of lines)
+        page_id: Source ID, used in post_id
+        page_name: Source display name
+        limit: Stop after this many posts
+        stats: ScraperStats - gets text_lines / text_blocks / rejected_blocks (optional)
+        seen: Block hashes from earlier screens, updated in place
+        verbose: Print each post title
+    
+    Returns:
+        List of post dicts
+    """
+    counts = SegmentCounts()
+    posts = list(islice(iter_posts(body_text, page_id, page_name, seen, counts), max(limit, 0)))
+    
+    if stats is not None:
+        # The whole page is re-read every screen, so these describe the last read
+        stats.text_lines = counts.lines
+        stats.text_blocks = counts.blocks
+        stats.rejected_blocks = counts.rejects
+    if verbose:
+        for post in posts:
+            print(f"   ✅ {post['title'][:60]}...")
+    return posts
+
+
+# ==============================================================================
+# DOM EXTRACTION
+# ==============================================================================
+
+# Runs in the page. Returns one record per top-level article not returned
+# before (articles are marked with data-scraped), so each scroll only
+# transfers the new posts. Comments are nested articles and are skipped.
+DOM_EXTRACT_JS = """
+(selector) => {
+  const PERMALINK = /\\/posts\\/|\\/permalink\\/|story_fbid=|\\/photos?\\/|\\/videos\\/|fbid=/;
+  const records = [];
+  for (const el of document.querySelectorAll(selector)) {
+    if (el.dataset.scraped) continue;
+    if (el.parentElement && el.parentElement.closest(selector)) continue;
+    const text = (el.innerText || "").trim();
+    if (!text) continue;  // Still a placeholder - try again after the next scroll
+    el.dataset.scraped = "1";
+    
+    const link = Array.from(el.querySelectorAll("a[href]")).find(a => PERMALINK.test(a.href));
+    const time = el.querySelector("abbr[data-utime], time[datetime]");
+    const images = Array.from(el.querySelectorAll("img[src*='scontent']"))
+      .filter(img => !img.width || img.width >= 80)
+      .map(img => img.src);
+    records.push({
+      text: text,
+      permalink: link ? link.href : null,
+      label: link ? (link.getAttribute("aria-label") || link.innerText || "").trim() : null,
+      timestamp: time ? (time.dataset.utime || time.getAttribute("datetime")) : null,
+      images: Array.from(new Set(images)).slice(0, 10),
+    });
+  }
+  return records;
+}
+"""
+
+# Selenium runs a function body, so wrap the function and pass the arguments through
+SELENIUM_DOM_EXTRACT_JS = f"return ({DOM_EXTRACT_JS.strip()}).apply(null, arguments);"
+
+# Facebook post IDs, in the order they are tried
+_POST_ID_PATTERNS = [
+    re.compile(r"[?&]story_fbid=(\w+)"),
+    re.compile(r"/posts/(\w+)"),
+    re.compile(r"/permalink/(\d+)"),
+    re.compile(r"[?&]fbid=(\d+)"),
+    re.compile(r"/videos/(\d+)"),
+]
+
+# Query parameters that identify a post (everything else is tracking)
+_PERMALINK_PARAMS = ("story_fbid", "fbid", "id")
+
+
+def clean_permalink(url: Optional[str]) -> Optional[str]:
+    """Drop tracking parameters (__cft__, __tn__, ...) from a post URL."""
+    if not url:
+        return None
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    kept = [(k, query[k][0]) for k in _PERMALINK_PARAMS if k in query]
+    return parts._replace(query=urlencode(kept), fragment="").geturl()
+
+
+def permalink_id(url: Optional[str]) -> Optional[str]:
+    """Facebook's own post ID from a permalink, or None."""
+    if not url:
+        return None
+    for pattern in _POST_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _posted_at(timestamp) -> Optional[str]:
+    """ISO time from data-utime (epoch seconds) or a <time datetime> value."""
+    if not timestamp:
+        return None
+    if str(timestamp).isdigit():
+        return datetime.fromtimestamp(int(timestamp), timezone.utc).isoformat()
+    return str(timestamp)
+
+
+def _record_text(record: dict, page_name: str) -> str:
+    """Article text without the header and UI lines (same length rule as text mode)."""
+    label = record.get("label")
+    lines = []
+    for line in (record.get("text") or "").split('\n'):
+        line = line.strip()
+        if len(line) > MIN_LINE_LENGTH and line not in SKIP_LINES and line not in (page_name, label):
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def records_to_posts(records: list, page_id: str, page_name: str, limit: int,
+                     stats=None, seen: Optional[set] = None,
+                     verbose: bool = False) -> list:
+    """
+    Return up to `limit` NEW posts from DOM_EXTRACT_JS records.
+    
+    Posts are keyed by the Facebook post ID from the permalink; the text
+    hash is only used when an article has no permalink.
+    """
+    seen = set() if seen is None else seen
+    posts = []
+    counts = SegmentCounts()
+    prefilter = get_block_filter()
+    
+    for record in records:
+        if len(posts) >= limit:
+            break
+        text = _record_text(record, page_name)
+        reason = prefilter(text[:text.find('\n')] if '\n' in text else text)
+        if reason:
+            counts.reject(reason)
+            continue
+        images = record.get("images") or []
+        if len(text) < MIN_POST_LENGTH and not images:
+            counts.reject("too_short")
+            continue
+        
+        post_url = clean_permalink(record.get("permalink"))
+        key = permalink_id(post_url) or block_hash(text)
+        if key in seen:
+            continue
+        seen.add(key)
+        
+        post = build_post(text, key, page_id, page_name)
+        post["post_url"] = post_url
+        post["posted_at"] = _posted_at(record.get("timestamp"))
+        post["posted_label"] = record.get("label")
+        post["images"] = images
+        posts.append(post)
+    
+    if stats is not None:
+        stats.text_blocks = len(records)
+        # Records are only the new articles of each screen, so rejects add up
+        for reason, n in counts.rejects.items():
+            stats.rejected_blocks[reason] = stats.rejected_blocks.get(reason, 0) + n
+    if verbose:
+        for post in posts:
+            print(f"   ✅ {post['title'][:60]}...")
+    return posts
+
+
+# ==============================================================================
+# SCROLL LOOP ADAPTER
+# ==============================================================================
+
+def extraction_mode() -> str:
+    mode = get_setting("scraping.extraction.mode", "dom")
+    return mode if mode in ("dom", "text") else "text"
+
+
+class PageExtractor:
+    """
+    read / extract pair for adaptive_scroll(), in DOM or text mode.
+    
+    Args:
+        page_id, page_name: Source being scraped
+        stats: ScraperStats - gets extraction_mode, transfer_kb and counts
+        read_text: Returns the body text (awaitable for async pages)
+        read_dom: Runs DOM_EXTRACT_JS and returns its records (awaitable for async pages)
+        mode: "dom" or "text" (default: from settings.json)
+        verbose: Print each post title
+    
+    In DOM mode, if the first screen returns no articles (selector no longer
+    matches Facebook's markup, or the script failed) the extractor switches
+    to text mode for the rest of the page.
+    """
+    
+    def __init__(self, page_id: str, page_name: str, stats, read_text: Callable,
+                 read_dom: Callable, mode: Optional[str] = None, verbose: bool = False):
+        self.page_id = page_id
+        self.page_name = page_name
+        self.stats = stats
+        self.read_text = read_text
+        self.read_dom = read_dom
+        self.mode = mode or extraction_mode()
+        self.verbose = verbose
+        self.reads = 0
+        stats.extraction_mode = self.mode
+    
+    def _use_dom(self, records) -> bool:
+        """Keep DOM mode unless the first screen came back empty."""
+        self.reads += 1
+        if records or self.reads > 1:
+            return True
+        print("   ⚠️  DOM extraction found no articles - falling back to text mode")
+        self.mode = self.stats.extraction_mode = "text"
+        return False
+    
+    def _count(self, content):
+        size = len(content) if isinstance(content, str) else len(json.dumps(content))
+        self.stats.transfer_kb += size / 1024
+        return content
+    
+    def read(self):
+        """Read the current screen (sync pages)."""
+        if self.mode == "dom":
+            try:
+                records = self.read_dom()
+            except Exception as e:
+                print(f"   ⚠️  DOM extraction failed: {e}")
+                records = []
+            if self._use_dom(records):
+                return self._count(records)
+        return self._count(self.read_text())
+    
+    async def read_async(self):
+        """Read the current screen (async pages)."""
+        if self.mode == "dom":
+            try:
+                records = await self.read_dom()
+            except Exception as e:
+                print(f"   ⚠️  DOM extraction failed: {e}")
+                records = []
+            if self._use_dom(records):
+                return self._count(records)
+        return self._count(await self.read_text())
+    
+    def extract(self, content, seen: set, limit: int) -> list:
+        """Turn one screen (records or text) into new posts."""
+        if isinstance(content, list):
+            return records_to_posts(content, self.page_id, self.page_name, limit,
+                                    self.stats, seen, self.verbose)
+        return extract_posts(content, self.page_id, self.page_name, limit,
+                             self.stats, seen, self.verbose)
+
+
+def debug_text(content) -> str:
+    """Printable form of the last screen read (for data/debug_text*.txt)."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(r.get("text") or "" for r in content)
@@ -0,0 +1,75 @@
+"""
+File Lock
+=========
+Exclusive lock on a file, shared by every process on the machine - worker
+processes, and two cron-launched runs that overlap.
+
+    with FileLock("data/.lock"):
+        ...claim work / rewrite a shared file...
+
+Uses fcntl.flock on Linux/macOS and msvcrt.locking on Windows. The lock
+is released when the block exits or the process dies.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Blocking, process-wide exclusive lock (default: settings.json → scaling.lock_file)."""
+    
+    def __init__(self, path: Optional[Path] = None, timeout: float = 60.0):
+        self.path = Path(path or get_setting("scaling.lock_file", "data/.lock"))
+        self.timeout = timeout
+        self._fd = None
+    
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return
+            except OSError:
+                if time.time() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Could not lock {self.path} within {self.timeout:.0f}s")
+                time.sleep(0.05)
+    
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
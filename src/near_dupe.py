@@ -0,0 +1,139 @@
+"""
+Near-Duplicate Detection
+========================
+SimHash fingerprints, so a post whose text changed a little (a "See more"
+or "Edited" label, "2h" became "3h", reaction counts) is recognized as the
+post we already have instead of being stored again.
+
+A fingerprint is 64 bits; texts that share most of their word 3-grams get
+fingerprints that differ in few bits. Similarity = 1 - differing bits / 64,
+so fuzzy_match_threshold 0.95 allows up to 3 differing bits.
+
+    fingerprint = simhash(post["text"])
+    store.find(fingerprint, max_distance(0.95))    # -> (post_id, similarity) or None
+
+Lookups are banded: the fingerprint is split into 4 bands of 16 bits, each
+with its own SQLite index. Two fingerprints at most 3 bits apart must have
+one band in common (pigeonhole), so checking the rows that share a band
+finds every match without scanning the table. Thresholds below 0.95 allow
+4+ bits, and matches that differ in every band are then missed.
+
+Fingerprints live in the dedupe index file (src/dedupe_index.py) and are
+saved on each post (`simhash`, 16 hex digits) so syncs pick them up.
+
+Settings (settings.json → duplicate_detection):
+    fuzzy_match_enabled, fuzzy_match_threshold
+
+Benchmark: python benchmarks/bench_near_dupe.py
+"""
+
+import hashlib
+import re
+import sqlite3
+from typing import Optional
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+SHINGLE = 3
+LANE_BITS = 16  # Per-bit vote counters packed in one int (up to 65,535 features)
+
+_WORD = re.compile(r"\w+")
+_DIGITS = re.compile(r"\d+")
+_UI_TEXT = re.compile(r"\b(?:see (?:more|less|translation)|edited)\b")
+
+
+def features(text: str) -> set:
+    """Word 3-grams of the text, lowercased, numbers collapsed and Facebook UI text removed."""
+    text = _UI_TEXT.sub(" ", _DIGITS.sub("0", text.lower()))
+    words = _WORD.findall(text)
+    if len(words) < SHINGLE:
+        return set(words)
+    return {" ".join(gram) for gram in zip(*(words[i:] for i in range(SHINGLE)))}
+
+
+# _VOTES[j][b]: byte j (big-endian) of a feature hash with value b, as +1 in
+# the LANE_BITS-wide counter of each set bit. Summing these ints counts the
+# votes for all 64 bits at once instead of looping over bits in Python.
+_VOTES = [[sum(1 << (LANE_BITS * (8 * (7 - j) + k)) for k in range(8) if b >> k & 1)
+           for b in range(256)]
+          for j in range(8)]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the text (0 when it has no words)."""
+    feats = features(text)
+    if not feats:
+        return 0
+    digests = b"".join([hashlib.blake2b(f.encode(), digest_size=8).digest() for f in feats])
+    votes = 0
+    for j in range(8):
+        votes += sum(map(_VOTES[j].__getitem__, digests[j::8]))
+    
+    half = len(feats) / 2
+    counts = memoryview(votes.to_bytes(BITS * LANE_BITS // 8, 'little')).cast('H')
+    return sum(1 << i for i, count in enumerate(counts) if count > half)
+
+
+def distance(a: int, b: int) -> int:
+    """Number of differing bits."""
+    return (a ^ b).bit_count()
+
+
+def similarity(a: int, b: int) -> float:
+    return 1 - distance(a, b) / BITS
+
+
+def max_distance(threshold: float) -> int:
+    """Most differing bits that still reach `threshold` similarity."""
+    return int((1 - threshold) * BITS + 1e-9)
+
+
+def bands(fingerprint: int) -> list:
+    return [(fingerprint >> (i * BAND_BITS)) & BAND_MASK for i in range(BANDS)]
+
+
+def _signed(fingerprint: int) -> int:
+    """SQLite integers are signed 64-bit."""
+    return fingerprint - (1 << BITS) if fingerprint >= 1 << (BITS - 1) else fingerprint
+
+
+class SimHashStore:
+    """Fingerprints with one index per band, in an existing SQLite connection."""
+    
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+        band_columns = ", ".join(f"band{i} INTEGER" for i in range(BANDS))
+        band_indexes = "".join(f"CREATE INDEX IF NOT EXISTS simhashes_band{i} ON simhashes(band{i});"
+                               for i in range(BANDS))
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS simhashes (
+                post_id  TEXT PRIMARY KEY,
+                simhash  INTEGER,
+                {band_columns}
+            );
+            {band_indexes}
+        """)
+        self._find_sql = " UNION ".join(f"SELECT post_id, simhash FROM simhashes WHERE band{i} = ?"
+                                        for i in range(BANDS))
+    
+    def add(self, rows: list):
+        """Store (post_id, fingerprint) pairs. Caller commits."""
+        self._db.executemany(
+            f"INSERT OR REPLACE INTO simhashes VALUES (?, ?{', ?' * BANDS})",
+            [(post_id, _signed(fp), *bands(fp)) for post_id, fp in rows if fp])
+    
+    def find(self, fingerprint: int, max_bits: int) -> Optional[tuple]:
+        """Closest stored post within max_bits bits: (post_id, similarity), or None."""
+        if not fingerprint:
+            return None
+        best = None
+        for post_id, stored in self._db.execute(self._find_sql, bands(fingerprint)):
+            d = distance(fingerprint, stored & ((1 << BITS) - 1))
+            if d <= max_bits and (best is None or d < best[1]):
+                best = (post_id, d)
+        return (best[0], 1 - best[1] / BITS) if best else None
+    
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM simhashes").fetchone()[0]
@@ -0,0 +1,164 @@
+"""
+Scrape → Save Pipeline
+======================
+Scrapers push posts as soon as each screen is extracted; a background
+writer saves them to Firestore in batches. Writes overlap the next
+source's navigation, memory stays bounded (the queue has a max size),
+and a crash late in a run only loses posts that were not flushed yet.
+
+    pipeline = PostPipeline(on_source_saved=cursors.advance).start()
+    posts, stats = scrape_page(..., on_posts=lambda new: pipeline.put(new, page_id))
+    pipeline.end_source(page_id, posts)
+    ...
+    totals = pipeline.close()
+
+The writer flushes when `flush_size` posts are buffered or `flush_seconds`
+passed since the last flush, whichever comes first. `on_source_saved(page_id,
+posts)` runs once every post of a finished source is saved, so cursors
+only move past stored posts.
+
+Settings (settings.json → pipeline):
+    flush_size, flush_seconds, max_queue
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+_STOP = object()
+
+
+class PostPipeline:
+    """
+    Bounded queue + background writer thread.
+    
+    Args:
+        save: Saves a list of posts, returns a save_posts_batch() result dict
+        on_source_saved: Called as (page_id, posts) when a finished source is fully saved
+        flush_size: Flush once this many posts are buffered
+        flush_seconds: Flush at least this often while posts are buffered
+        max_queue: Queue size (in pushes); put() blocks when it is full
+    """
+    
+    def __init__(self, save: Optional[Callable] = None,
+                 on_source_saved: Optional[Callable] = None,
+                 flush_size: Optional[int] = None, flush_seconds: Optional[float] = None,
+                 max_queue: Optional[int] = None):
+        if save is None:
+            try:
+                from src.database import save_posts_batch
+            except ImportError:
+                from database import save_posts_batch
+            save = save_posts_batch
+        cfg = get_setting("pipeline", {}) or {}
+        self.save = save
+        self.on_source_saved = on_source_saved
+        self.flush_size = flush_size or cfg.get("flush_size", 100)
+        self.flush_seconds = flush_seconds or cfg.get("flush_seconds", 10)
+        self._queue = queue.Queue(maxsize=max_queue or cfg.get("max_queue", 50))
+        self._thread = threading.Thread(target=self._run, name="post-writer", daemon=True)
+        
+        # Writer-thread state
+        self._buffer = []            # [(page_id, post)]
+        self._unsaved = {}           # page_id -> posts pushed but not flushed yet
+        self._failed_sources = set()
+        self._finished = {}          # page_id -> posts, waiting for their flush
+        
+        self.totals = {"saved": 0, "skipped": 0, "errors": 0, "flushes": 0, "flush_seconds": 0.0}
+    
+    # ─────────────────────────────────────────────────
+    # Producer side (scraper thread)
+    # ─────────────────────────────────────────────────
+    
+    def start(self) -> "PostPipeline":
+        self._thread.start()
+        return self
+    
+    def put(self, posts: list, page_id: str):
+        """Queue new posts from one screen. Blocks if the writer is far behind."""
+        if posts:
+            self._queue.put(("posts", page_id, list(posts)))
+    
+    def end_source(self, page_id: str, posts: list):
+        """Mark a source as finished (all its posts were put())."""
+        self._queue.put(("end", page_id, list(posts)))
+    
+    def close(self) -> dict:
+        """Flush what is left, stop the writer and return the totals."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        return self.totals
+    
+    # ─────────────────────────────────────────────────
+    # Writer thread
+    # ─────────────────────────────────────────────────
+    
+    def _run(self):
+        last_flush = time.time()
+        while True:
+            timeout = max(0.0, self.flush_seconds - (time.time() - last_flush))
+            try:
+                item = self._queue.get(timeout=timeout if self._buffer else None)
+            except queue.Empty:
+                item = None
+            
+            if item is _STOP:
+                self._flush()
+                return
+            if item is not None:
+                kind, page_id, posts = item
+                if kind == "posts":
+                    self._buffer.extend((page_id, p) for p in posts)
+                    self._unsaved[page_id] = self._unsaved.get(page_id, 0) + len(posts)
+                else:
+                    self._finished[page_id] = posts
+            
+            due = self._buffer and time.time() - last_flush >= self.flush_seconds
+            if len(self._buffer) >= self.flush_size or due:
+                self._flush()
+                last_flush = time.time()
+            self._report_finished()
+    
+    def _flush(self):
+        if not self._buffer:
+            self._report_finished()
+            return
+        buffer, self._buffer = self._buffer, []
+        
+        t0 = time.time()
+        try:
+            result = self.save([post for _, post in buffer])
+            failed = set(result.get("failed_ids", []))
+        except Exception as e:
+            print(f"❌ Pipeline flush failed: {e}")
+            result = {"errors": len(buffer)}
+            failed = {post.get("post_id") for _, post in buffer}
+        
+        self.totals["flushes"] += 1
+        self.totals["flush_seconds"] += time.time() - t0
+        for key in ("saved", "skipped", "errors"):
+            self.totals[key] += result.get(key, 0)
+        
+        for page_id, post in buffer:
+            self._unsaved[page_id] -= 1
+            if post.get("post_id") in failed:
+                self._failed_sources.add(page_id)
+        self._report_finished()
+    
+    def _report_finished(self):
+        """Call on_source_saved for finished sources whose posts are all flushed."""
+        for page_id in [p for p in self._finished if not self._unsaved.get(p)]:
+            posts = self._finished.pop(page_id)
+            if page_id in self._failed_sources or not self.on_source_saved:
+                continue
+            try:
+                self.on_source_saved(page_id, posts)
+            except Exception as e:
+                print(f"⚠️  on_source_saved({page_id}) failed: {e}")
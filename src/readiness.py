@@ -0,0 +1,193 @@
+"""
+Content Readiness Detection
+===========================
+Replaces fixed sleeps with "wait until the content is actually there".
+
+A wait polls the page and ends as soon as ONE of these is true:
+- posts:   at least `min_posts` post containers are in the DOM
+- stable:  the page text length stopped changing for `stable_polls` polls
+           (and, after a scroll, the page grew past its old height)
+- timeout: the configurable ceiling was reached
+
+Works for Selenium, sync Playwright and async Playwright:
+
+    result = wait_for_content(selenium_probe(driver, config.post_selector))
+    result = await wait_for_content_async(playwright_probe(page, config.post_selector))
+
+Settings (settings.json → scraping.readiness):
+    timeout_seconds, scroll_timeout_seconds, poll_interval_ms,
+    stable_polls, post_selector
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+# ==============================================================================
+# CONFIG AND RESULT
+# ==============================================================================
+
+@dataclass
+class ReadinessConfig:
+    """How long and how often to poll. Loaded from settings.json."""
+    timeout: float = 10.0
+    scroll_timeout: float = 3.0
+    poll_interval: float = 0.25
+    stable_polls: int = 3
+    post_selector: str = "div[role='article']"
+    
+    @classmethod
+    def from_settings(cls) -> "ReadinessConfig":
+        cfg = get_setting("scraping.readiness", {}) or {}
+        return cls(
+            timeout=cfg.get("timeout_seconds", cls.timeout),
+            scroll_timeout=cfg.get("scroll_timeout_seconds", cls.scroll_timeout),
+            poll_interval=cfg.get("poll_interval_ms", cls.poll_interval * 1000) / 1000,
+            stable_polls=cfg.get("stable_polls", cls.stable_polls),
+            post_selector=cfg.get("post_selector", cls.post_selector),
+        )
+
+
+@dataclass
+class ReadinessResult:
+    """Outcome of one wait. `reason` is "posts", "stable" or "timeout"."""
+    reason: str
+    seconds: float
+    posts: int = 0
+    text_length: int = 0
+    height: int = 0
+    
+    @property
+    def ready(self) -> bool:
+        return self.reason != "timeout"
+
+
+# ==============================================================================
+# PAGE PROBES
+# ==============================================================================
+
+def _probe_js(selector: str) -> str:
+    """JS expression returning [post containers, text length, scroll height]."""
+    # textContent is used instead of innerText because it doesn't force layout
+    return (
+        "(() => { const b = document.body; return ["
+        f"document.querySelectorAll({json.dumps(selector)}).length, "
+        "b ? b.textContent.length : 0, "
+        "b ? b.scrollHeight : 0]; })()"
+    )
+
+
+def selenium_probe(driver, selector: str) -> Callable:
+    """Probe for a Selenium WebDriver."""
+    js = "return " + _probe_js(selector)
+    return lambda: driver.execute_script(js)
+
+
+def playwright_probe(page, selector: str) -> Callable:
+    """Probe for a Playwright page (sync or async - async returns a coroutine)."""
+    js = _probe_js(selector)
+    return lambda: page.evaluate(js)
+
+
+# ==============================================================================
+# WAIT LOGIC
+# ==============================================================================
+
+class _Tracker:
+    """Decides when polling can stop. Shared by the sync and async waits."""
+    
+    def __init__(self, min_posts: Optional[int], grow_from: Optional[int], stable_polls: int):
+        self.min_posts = min_posts
+        self.grow_from = grow_from
+        self.stable_polls = stable_polls
+        self.last_length = -1
+        self.unchanged = 0
+        self.posts = self.length = self.height = 0
+    
+    def update(self, probe_result) -> Optional[str]:
+        """Feed one probe result. Returns a reason once ready, else None."""
+        if not probe_result:
+            return None
+        self.posts, self.length, self.height = (int(v or 0) for v in probe_result)
+        
+        if self.min_posts and self.posts >= self.min_posts:
+            return "posts"
+        
+        if self.length > 0 and self.length == self.last_length:
+            self.unchanged += 1
+        else:
+            self.unchanged = 0
+        self.last_length = self.length
+        
+        grew = self.grow_from is None or self.height > self.grow_from
+        if grew and self.unchanged >= self.stable_polls:
+            return "stable"
+        return None
+    
+    def result(self, reason: str, started: float) -> ReadinessResult:
+        return ReadinessResult(reason=reason, seconds=time.time() - started,
+                               posts=self.posts, text_length=self.length,
+                               height=self.height)
+
+
+def wait_for_content(probe: Callable, min_posts: Optional[int] = 1,
+                     grow_from: Optional[int] = None, timeout: Optional[float] = None,
+                     config: Optional[ReadinessConfig] = None) -> ReadinessResult:
+    """
+    Poll `probe` until the page is ready or the timeout is reached.
+    
+    Args:
+        probe: Callable returning [posts, text_length, height]
+        min_posts: Return as soon as this many post containers exist (None = ignore)
+        grow_from: Only accept "stable" once scroll height exceeds this (used after scrolling)
+        timeout: Ceiling in seconds (default: config.timeout)
+        config: Poll settings (default: from settings.json)
+    
+    Returns:
+        ReadinessResult with the reason and how long the wait took
+    """
+    config = config or ReadinessConfig.from_settings()
+    timeout = config.timeout if timeout is None else timeout
+    tracker = _Tracker(min_posts, grow_from, config.stable_polls)
+    started = time.time()
+    
+    while True:
+        try:
+            reason = tracker.update(probe())
+        except Exception:
+            reason = None  # Page is mid-navigation; try again next poll
+        if reason:
+            return tracker.result(reason, started)
+        if time.time() - started >= timeout:
+            return tracker.result("timeout", started)
+        time.sleep(config.poll_interval)
+
+
+async def wait_for_content_async(probe: Callable, min_posts: Optional[int] = 1,
+                                 grow_from: Optional[int] = None,
+                                 timeout: Optional[float] = None,
+                                 config: Optional[ReadinessConfig] = None) -> ReadinessResult:
+    """Async version of wait_for_content() for playwright.async_api pages."""
+    config = config or ReadinessConfig.from_settings()
+    timeout = config.timeout if timeout is None else timeout
+    tracker = _Tracker(min_posts, grow_from, config.stable_polls)
+    started = time.time()
+    
+    while True:
+        try:
+            reason = tracker.update(await probe())
+        except Exception:
+            reason = None
+        if reason:
+            return tracker.result(reason, started)
+        if time.time() - started >= timeout:
+            return tracker.result("timeout", started)
+        await asyncio.sleep(config.poll_interval)
@@ -0,0 +1,163 @@
+"""
+Offline Replay
+==============
+Re-runs scrapes against captured pages instead of live Facebook, so
+extraction and scroll changes can be measured offline (and in CI).
+
+Corpus: data/corpus/<page_id>.html (settings.json → replay.corpus_dir)
+
+    python src/replay.py --import data/debug/qcu1994/<run>_selenium.html.gz --as qcu1994
+    python src/replay.py --list
+    python src/replay.py --serve
+    
+    with ReplayServer() as server:
+        posts, stats = scrape_page("qcu1994", replay=server.base_url)
+
+`replay` can also be the corpus as a file:// URL (corpus_url()). In replay
+mode the scrapers skip the Facebook homepage and cookies, leave the
+blocking baseline alone and never write debug snapshots.
+
+Pages are sanitized on import: scripts are removed (they would try to
+reach Facebook) and DOM extraction's data-scraped marks are cleared.
+
+Benchmark: python benchmarks/bench_replay.py
+"""
+
+import argparse
+import re
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+    from src.debug_capture import open_snapshot
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+    from debug_capture import open_snapshot
+
+
+_SCRIPT_TAG = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+_SCRAPED_MARK = re.compile(r'\sdata-scraped="1"')
+
+
+# ==============================================================================
+# CORPUS
+# ==============================================================================
+
+def corpus_dir() -> Path:
+    return Path(get_setting("replay.corpus_dir", "data/corpus"))
+
+
+def corpus_url() -> str:
+    """The corpus directory as a file:// URL (no server needed)."""
+    return corpus_dir().resolve().as_uri()
+
+
+def replay_url(base_url: str, page_id: str) -> str:
+    """URL of one captured page under a replay base URL."""
+    return f"{base_url.rstrip('/')}/{page_id}.html"
+
+
+def list_pages() -> list:
+    """Page IDs available in the corpus."""
+    return sorted(p.stem for p in corpus_dir().glob("*.html"))
+
+
+def sanitize_html(html: str) -> str:
+    """Make a captured page replayable: no scripts, no extraction marks."""
+    return _SCRAPED_MARK.sub("", _SCRIPT_TAG.sub("", html))
+
+
+def import_page(source: Path, page_id: str) -> Path:
+    """Copy a captured page (a debug snapshot, .html/.html.gz/.html.zst) into the corpus."""
+    html = open_snapshot(source)
+    target = corpus_dir() / f"{page_id}.html"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(sanitize_html(html), encoding='utf-8')
+    return target
+
+
+# ==============================================================================
+# LOCAL SERVER
+# ==============================================================================
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """Static HTTP server for the corpus, on a free localhost port."""
+    
+    def __init__(self, directory: Optional[Path] = None, host: str = "127.0.0.1",
+                 port: int = 0):
+        self.directory = Path(directory or corpus_dir())
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    def start(self) -> "ReplayServer":
+        handler = partial(_QuietHandler, directory=str(self.directory))
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the offline replay corpus")
+    parser.add_argument('--import', dest='source', help='Captured HTML file to add')
+    parser.add_argument('--as', dest='page_id', help='Page ID for --import')
+    parser.add_argument('--list', action='store_true', help='List corpus pages')
+    parser.add_argument('--serve', action='store_true', help='Serve the corpus until Ctrl+C')
+    parser.add_argument('--port', type=int, default=8765, help='Port for --serve')
+    args = parser.parse_args()
+    
+    if args.source:
+        if not args.page_id:
+            parser.error("--import needs --as PAGE_ID")
+        target = import_page(Path(args.source), args.page_id)
+        print(f"✅ Added {target} ({target.stat().st_size / 1024:.0f}KB)")
+    
+    if args.list:
+        pages = list_pages()
+        print(f"📁 {corpus_dir()}: {len(pages)} pages")
+        for page_id in pages:
+            print(f"   {page_id}")
+    
+    if args.serve:
+        server = ReplayServer(port=args.port).start()
+        print(f"🌐 Serving {server.directory} at {server.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
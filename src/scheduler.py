@@ -0,0 +1,179 @@
+"""
+Source Scheduler
+================
+Decides which sources are due, instead of scraping every source every run.
+
+Each source has a next-due time, kept in a heap. A cycle dispatches only
+the sources that are due, ordered by `priority` (1 = first). After a
+scrape, its interval adapts to how often the page actually posts:
+
+- new posts found  → back to the configured scrape_frequency_minutes
+                     (halved again while posts keep coming, down to
+                     min_interval_factor × base)
+- nothing new      → interval × backoff, up to max_interval_factor × base
+
+So a busy page like qcu1994 stays at 30 minutes or less, while quiet
+pages drift to a few hours and stop costing browser time.
+
+    scheduler = Scheduler(sources)
+    for source in scheduler.due():
+        ...scrape...
+        scheduler.record(source["id"], new_posts=len(posts))
+    scheduler.save()
+
+State (settings.json → scheduler.state_file) survives restarts:
+    {"qcu1994": {"interval_minutes": 30, "next_due": "...", "last_run": "...",
+                 "last_new_posts": 3, "empty_runs": 0}}
+"""
+
+import heapq
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+@dataclass
+class SourceSchedule:
+    """Adaptive interval and next-due time for one source."""
+    page_id: str
+    priority: int
+    base_minutes: float
+    interval_minutes: float
+    next_due: float = 0.0          # Unix time; 0 = due now
+    last_run: Optional[str] = None
+    last_new_posts: int = 0
+    empty_runs: int = 0
+    
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["next_due"] = datetime.fromtimestamp(self.next_due, timezone.utc).isoformat()
+        del data["page_id"], data["priority"], data["base_minutes"]
+        return data
+
+
+class Scheduler:
+    """Priority queue of next-due times for the enabled sources."""
+    
+    def __init__(self, sources: list, path: Optional[Path] = None):
+        self.path = Path(path or get_setting("scheduler.state_file", "data/schedule_state.json"))
+        self.min_factor = get_setting("scheduler.min_interval_factor", 0.5)
+        self.max_factor = get_setting("scheduler.max_interval_factor", 4)
+        self.backoff = get_setting("scheduler.backoff", 1.5)
+        
+        try:
+            state = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            state = {}
+        
+        self.sources = {}
+        self.schedules = {}
+        self._heap = []
+        for source in sources:
+            page_id = source["id"]
+            base = source.get("scrape_frequency_minutes", 60)
+            saved = state.get(page_id, {})
+            schedule = SourceSchedule(
+                page_id=page_id,
+                priority=source.get("priority", 99),
+                base_minutes=base,
+                interval_minutes=self._clamp(saved.get("interval_minutes", base), base),
+                next_due=self._timestamp(saved.get("next_due")),
+                last_run=saved.get("last_run"),
+                last_new_posts=saved.get("last_new_posts", 0),
+                empty_runs=saved.get("empty_runs", 0),
+            )
+            self.sources[page_id] = source
+            self.schedules[page_id] = schedule
+            heapq.heappush(self._heap, (schedule.next_due, schedule.priority, page_id))
+    
+    @staticmethod
+    def _timestamp(value: Optional[str]) -> float:
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def _clamp(self, minutes: float, base: float) -> float:
+        return min(max(minutes, base * self.min_factor), base * self.max_factor)
+    
+    # ─────────────────────────────────────────────────
+    # Dispatch
+    # ─────────────────────────────────────────────────
+    
+    def due(self, now: Optional[float] = None) -> list:
+        """Pop every due source, highest priority first."""
+        now = now or time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, page_id = heapq.heappop(self._heap)
+            due.append(self.schedules[page_id])
+        due.sort(key=lambda s: (s.priority, s.next_due))
+        return [self.sources[s.page_id] for s in due]
+    
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        """Time until the next source is due (0 if one is due already)."""
+        if not self._heap:
+            return float("inf")
+        return max(0.0, self._heap[0][0] - (now or time.time()))
+    
+    def record(self, page_id: str, new_posts: int, now: Optional[float] = None):
+        """Adapt the interval after a scrape and re-queue the source."""
+        now = now or time.time()
+        schedule = self.schedules[page_id]
+        if new_posts:
+            # Still active: speed up while posts keep coming
+            interval = schedule.base_minutes
+            if schedule.last_new_posts:
+                interval = min(interval, schedule.interval_minutes / 2)
+            schedule.empty_runs = 0
+        else:
+            interval = schedule.interval_minutes * self.backoff
+            schedule.empty_runs += 1
+        
+        schedule.interval_minutes = round(self._clamp(interval, schedule.base_minutes), 1)
+        schedule.last_new_posts = new_posts
+        schedule.last_run = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        schedule.next_due = now + schedule.interval_minutes * 60
+        heapq.heappush(self._heap, (schedule.next_due, schedule.priority, page_id))
+    
+    def retry_later(self, page_id: str, now: Optional[float] = None):
+        """Re-queue a failed source at its current interval without adapting it."""
+        schedule = self.schedules[page_id]
+        schedule.next_due = (now or time.time()) + schedule.interval_minutes * 60
+        heapq.heappush(self._heap, (schedule.next_due, schedule.priority, page_id))
+    
+    # ─────────────────────────────────────────────────
+    # State
+    # ─────────────────────────────────────────────────
+    
+    def browser_runs_per_day(self) -> float:
+        """Scrapes per day at the current intervals (vs. every source every cycle)."""
+        return sum(24 * 60 / s.interval_minutes for s in self.schedules.values())
+    
+    def save(self):
+        """Write the state file atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {page_id: s.to_dict() for page_id, s in self.schedules.items()}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        os.replace(tmp, self.path)
+    
+    def print_schedule(self):
+        now = time.time()
+        for s in sorted(self.schedules.values(), key=lambda s: s.next_due):
+            wait = max(0, s.next_due - now) / 60
+            print(f"   P{s.priority} {s.page_id:<20} every {s.interval_minutes:>5.0f}m "
+                  f"(base {s.base_minutes:.0f}m) | next in {wait:.0f}m")
+
+
+def poll_seconds() -> float:
+    return get_setting("scheduler.poll_seconds", 60)
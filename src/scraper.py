@@ -4,98 +4,57 @@ Facebook Scraper with Performance Statistics
 Tracks timing for optimization decisions.
 """
 
+import atexit
 import time
-import hashlib
 import json
-from datetime import datetime, timezone
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable
+
+try:
+    from src.stats import ScraperStats
+    from src.readiness import ReadinessConfig, selenium_probe, wait_for_content
+    from src.scrolling import adaptive_scroll
+    from src.extract import SELENIUM_DOM_EXTRACT_JS, PageExtractor, debug_text
+    from src.driver_cache import resolve_chromedriver
+    from src.blocking import (BlockingPolicy, BlockingTracker, collect_selenium_blocked,
+                              drain_selenium_log, install_selenium_blocking,
+                              record_navigation)
+    from src.browser_pool import (BrowserPool, PooledSession, PSUTIL_AVAILABLE,
+                                  process_tree_memory_mb)
+    from src.replay import replay_url
+    from src.cursors import SourceCursor
+    from src.checkpoint import Checkpoint
+    from src.session_cache import get_session_cache, session_cache_enabled, set_selenium_cookies
+    from src.tracing import record_run, span
+    from src.debug_capture import get_debug_capture, should_capture
+except ImportError:  # Run as a script: python src/scraper.py
+    from stats import ScraperStats
+    from readiness import ReadinessConfig, selenium_probe, wait_for_content
+    from scrolling import adaptive_scroll
+    from extract import SELENIUM_DOM_EXTRACT_JS, PageExtractor, debug_text
+    from driver_cache import resolve_chromedriver
+    from blocking import (BlockingPolicy, BlockingTracker, collect_selenium_blocked,
+                          drain_selenium_log, install_selenium_blocking,
+                          record_navigation)
+    from browser_pool import (BrowserPool, PooledSession, PSUTIL_AVAILABLE,
+                              process_tree_memory_mb)
+    from replay import replay_url
+    from cursors import SourceCursor
+    from checkpoint import Checkpoint
+    from session_cache import get_session_cache, session_cache_enabled, set_selenium_cookies
+    from tracing import record_run, span
+    from debug_capture import get_debug_capture, should_capture
 
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
-    from webdriver_manager.chrome import ChromeDriverManager
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
 
 
-# ==============================================================================
-# STATISTICS TRACKING
-# ==============================================================================
-
-@dataclass
-class ScraperStats:
-    """Tracks performance metrics for each scrape run."""
-    page_id: str
-    start_time: float = field(default_factory=time.time)
-    
-    # Timing breakdowns (in seconds)
-    time_browser_init: float = 0.0
-    time_facebook_load: float = 0.0
-    time_cookies: float = 0.0
-    time_page_navigate: float = 0.0
-    time_scrolling: float = 0.0
-    time_extraction: float = 0.0
-    time_total: float = 0.0
-    
-    # Results
-    posts_found: int = 0
-    text_lines: int = 0
-    text_blocks: int = 0
-    html_size_kb: float = 0.0
-    
-    # Status
-    success: bool = False
-    error: Optional[str] = None
-    
-    def to_dict(self):
-        return {
-            "page_id": self.page_id,
-            "timing": {
-                "browser_init": round(self.time_browser_init, 2),
-                "facebook_load": round(self.time_facebook_load, 2),
-                "cookies": round(self.time_cookies, 2),
-                "page_navigate": round(self.time_page_navigate, 2),
-                "scrolling": round(self.time_scrolling, 2),
-                "extraction": round(self.time_extraction, 2),
-                "total": round(self.time_total, 2),
-            },
-            "results": {
-                "posts_found": self.posts_found,
-                "text_lines": self.text_lines,
-                "text_blocks": self.text_blocks,
-                "html_size_kb": round(self.html_size_kb, 1),
-            },
-            "success": self.success,
-            "error": self.error,
-        }
-    
-    def print_summary(self):
-        """Print a formatted statistics summary."""
-        print(f"\n{'─'*50}")
-        print("📊 PERFORMANCE STATISTICS")
-        print(f"{'─'*50}")
-        print(f"  Browser init:    {self.time_browser_init:>6.2f}s")
-        print(f"  Facebook load:   {self.time_facebook_load:>6.2f}s")
-        print(f"  Add cookies:     {self.time_cookies:>6.2f}s")
-        print(f"  Navigate page:   {self.time_page_navigate:>6.2f}s")
-        print(f"  Scrolling:       {self.time_scrolling:>6.2f}s")
-        print(f"  Extraction:      {self.time_extraction:>6.2f}s")
-        print(f"  {'─'*28}")
-        print(f"  TOTAL:           {self.time_total:>6.2f}s")
-        print(f"\n📦 Results: {self.posts_found} posts | {self.text_lines} lines | {self.html_size_kb:.0f}KB HTML")
-        
-        # Estimate for scale
-        print(f"\n🔮 Scale Estimates (sequential):")
-        print(f"   10 pages:  {self.time_total * 10 / 60:>5.1f} minutes")
-        print(f"   50 pages:  {self.time_total * 50 / 60:>5.1f} minutes")
-        print(f"  100 pages:  {self.time_total * 100 / 60:>5.1f} minutes")
-
-
 # ==============================================================================
 # COOKIE LOADING
 # ==============================================================================
@@ -124,31 +83,19 @@ def load_cookies():
 
 
 # ==============================================================================
-# MAIN SCRAPER
+# BROWSER SESSIONS
 # ==============================================================================
 
-def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10, 
-                headless: bool = True, show_stats: bool = True) -> tuple[list, ScraperStats]:
+def start_session(headless: bool = True, warm: bool = True) -> PooledSession:
     """
-    Scrape a Facebook page for posts.
-    
-    Args:
-        page_id: Facebook page username (e.g., 'qcu1994')
-        page_name: Display name for logging
-        max_posts: Maximum posts to extract
-        headless: Run browser without visible window
-        show_stats: Print performance statistics
+    Start Chrome, load Facebook and add cookies (steps 1-3 of a scrape).
     
-    Returns:
-        Tuple of (posts list, statistics object)
+    The returned session is warm: any Facebook URL can be opened next.
+    With a valid session cache (src/session_cache.py) the cookies are set
+    through CDP and the homepage is never loaded. With warm=False only the
+    browser is started (offline replay).
     """
-    page_name = page_name or page_id
-    stats = ScraperStats(page_id=page_id)
-    posts = []
-    
-    print(f"\n{'═'*50}")
-    print(f"SCRAPING: {page_name}")
-    print(f"{'═'*50}")
+    warmup = {}
     
     # ─────────────────────────────────────────────────
     # Step 1: Initialize browser
@@ -166,21 +113,50 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
     options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
     options.add_experimental_option('excludeSwitches', ['enable-automation'])
     
-    service = Service(ChromeDriverManager().install())
+    policy = BlockingPolicy.from_settings()
+    if policy.active:
+        # Performance log lets us count what Chrome blocked
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
+    driver_path, warmup["driver_cache"] = resolve_chromedriver()
+    service = Service(driver_path) if driver_path else Service()
     driver = webdriver.Chrome(service=service, options=options)
-    stats.time_browser_init = time.time() - t0
-    print(f"      Done ({stats.time_browser_init:.2f}s)")
+    warmup["browser_init"] = time.time() - t0
+    print(f"      Done ({warmup['browser_init']:.2f}s, driver cache: {warmup['driver_cache']})")
     
     try:
+        if policy.active:
+            install_selenium_blocking(driver, policy)
+        if not warm:
+            return PooledSession(browser=driver, warmup=warmup)
+        
+        # ─────────────────────────────────────────────────
+        # Steps 2-3 (cached): cookies via CDP, no homepage
+        # ─────────────────────────────────────────────────
+        if session_cache_enabled():
+            cache = get_session_cache()
+            if cache.valid:
+                t0 = time.time()
+                try:
+                    count = set_selenium_cookies(driver, cache)
+                    warmup["cookies"] = time.time() - t0
+                    print(f"[2-3/5] Restored cached session: {count} cookies "
+                          f"({warmup['cookies']:.2f}s)")
+                    return PooledSession(browser=driver, warmup=warmup)
+                except Exception as e:
+                    print(f"      Cached session failed ({e}), loading Facebook instead")
+        
         # ─────────────────────────────────────────────────
         # Step 2: Load Facebook homepage
         # ─────────────────────────────────────────────────
         t0 = time.time()
         print("[2/5] Loading Facebook...")
         driver.get("https://www.facebook.com")
-        time.sleep(2)
-        stats.time_facebook_load = time.time() - t0
-        print(f"      Done ({stats.time_facebook_load:.2f}s)")
+        readiness = ReadinessConfig.from_settings()
+        probe = selenium_probe(driver, readiness.post_selector)
+        warmup["facebook_load_wait"] = wait_for_content(probe, min_posts=None, config=readiness)
+        warmup["facebook_load"] = time.time() - t0
+        print(f"      Done ({warmup['facebook_load']:.2f}s)")
         
         # ─────────────────────────────────────────────────
         # Step 3: Add authentication cookies
@@ -193,112 +169,196 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
                 driver.add_cookie(c)
             except:
                 pass
-        stats.time_cookies = time.time() - t0
-        print(f"      Added {len(cookies)} cookies ({stats.time_cookies:.2f}s)")
+        warmup["cookies"] = time.time() - t0
+        print(f"      Added {len(cookies)} cookies ({warmup['cookies']:.2f}s)")
+    except Exception:
+        driver.quit()
+        raise
+    
+    return PooledSession(browser=driver, warmup=warmup)
+
+
+def _driver_alive(driver) -> bool:
+    """Health check: the browser still answers a trivial script."""
+    return driver.execute_script("return 1;") == 1
+
+
+def _driver_memory_mb(driver) -> float:
+    """Chrome memory: whole process tree if psutil is installed, else JS heap."""
+    if PSUTIL_AVAILABLE:
+        return process_tree_memory_mb(driver.service.process.pid)
+    heap = driver.execute_script(
+        "return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+    return (heap or 0) / (1024 * 1024)
+
+
+def create_browser_pool(headless: bool = True, size: int = None,
+                        max_pages: int = None, warm: bool = True) -> BrowserPool:
+    """Create a pool of warm Selenium sessions (see src/browser_pool.py)."""
+    return BrowserPool(
+        factory=lambda: start_session(headless, warm),
+        close=lambda driver: driver.quit(),
+        health_check=_driver_alive,
+        memory_mb=_driver_memory_mb,
+        size=size,
+        max_pages=max_pages,
+    )
+
+
+_shared_pools = {}
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """
+    Long-lived pool shared by every caller in this process.
+    
+    main.py and scrape_all_sources() use it so the browser survives
+    across sources (and across runs in a long-running process).
+    """
+    if headless not in _shared_pools:
+        _shared_pools[headless] = create_browser_pool(headless)
+        atexit.register(_shared_pools[headless].close)
+    return _shared_pools[headless]
+
+
+# ==============================================================================
+# MAIN SCRAPER
+# ==============================================================================
+
+def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10, 
+                headless: bool = True, show_stats: bool = True,
+                pool: BrowserPool = None, replay: str = None,
+                cursor: SourceCursor = None,
+                on_posts: Callable = None) -> tuple[list, ScraperStats]:
+    """
+    Scrape a Facebook page for posts.
+    
+    Args:
+        page_id: Facebook page username (e.g., 'qcu1994')
+        page_name: Display name for logging
+        max_posts: Maximum posts to extract
+        headless: Run browser without visible window
+        show_stats: Print performance statistics
+        pool: Borrow a warm browser from this pool (default: start and quit a new one)
+        replay: Base URL of a captured-page corpus (see src/replay.py) instead
+                of live Facebook. Skips login and leaves debug files alone.
+        cursor: High-water mark for this source (see src/cursors.py). Known
+                posts are dropped and scrolling stops when they are reached.
+        on_posts: Called with new posts after each screen, so they can be
+                  saved while scrolling continues (see src/pipeline.py)
+    
+    Returns:
+        Tuple of (posts list, statistics object)
+    """
+    page_name = page_name or page_id
+    stats = ScraperStats(page_id=page_id)
+    posts = []
+    
+    print(f"\n{'═'*50}")
+    print(f"SCRAPING: {page_name}")
+    print(f"{'═'*50}")
+    
+    # ─────────────────────────────────────────────────
+    # Steps 1-3: Borrow a warm browser (started, Facebook loaded, cookies added)
+    # ─────────────────────────────────────────────────
+    own_pool = pool is None
+    if own_pool:
+        pool = create_browser_pool(headless, size=1, warm=replay is None)
+    session = pool.acquire()
+    driver = session.browser
+    
+    if session.warmup:
+        stats.driver_cache = session.warmup["driver_cache"]
+        for stage in ("browser_init", "facebook_load", "cookies"):
+            if stage in session.warmup:
+                stats.add_span(stage, session.warmup[stage])
+        if "facebook_load_wait" in session.warmup:
+            stats.record_wait("facebook_load", session.warmup["facebook_load_wait"])
+    else:
+        print(f"\n[1-3/5] Reusing warm browser (page {session.pages_served + 1})")
+    
+    readiness = ReadinessConfig.from_settings()
+    probe = selenium_probe(driver, readiness.post_selector)
+    policy = BlockingPolicy.from_settings()
+    tracker = BlockingTracker(policy)
+    healthy = True
+    
+    try:
+        if policy.active:
+            drain_selenium_log(driver)  # Count only this source's requests
         
         # ─────────────────────────────────────────────────
         # Step 4: Navigate to target page
         # ─────────────────────────────────────────────────
-        t0 = time.time()
-        url = f"https://www.facebook.com/{page_id}"
-        print(f"[4/5] Navigating to {page_id}...")
-        driver.get(url)
-        time.sleep(4)
-        stats.time_page_navigate = time.time() - t0
+        url = replay_url(replay, page_id) if replay else f"https://www.facebook.com/{page_id}"
+        print(f"[4/5] Navigating to {url if replay else page_id}...")
+        with span(stats, "page_navigate"):
+            driver.get(url)
+            stats.record_wait("page_navigate", wait_for_content(probe, config=readiness))
+        if not replay:
+            record_navigation(stats, policy)
         print(f"      Done ({stats.time_page_navigate:.2f}s)")
         
         # ─────────────────────────────────────────────────
-        # Step 5: Scroll to load dynamic content
+        # Step 5: Scroll + extract until we have enough posts
         # ─────────────────────────────────────────────────
-        t0 = time.time()
-        print("[5/5] Scrolling to load posts...")
-        scroll_count = 3
-        for i in range(scroll_count):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            print(f"      Scroll {i+1}/{scroll_count}...")
-            time.sleep(2)
-        driver.execute_script("window.scrollTo(0, 500);")
-        time.sleep(1)
-        stats.time_scrolling = time.time() - t0
-        print(f"      Done ({stats.time_scrolling:.2f}s)")
-        
-        # ─────────────────────────────────────────────────
-        # Step 6: Extract post content
-        # ─────────────────────────────────────────────────
-        t0 = time.time()
-        print("\n📝 Extracting posts...")
-        
-        body_text = driver.find_element(By.TAG_NAME, "body").text
-        lines = body_text.split('\n')
-        stats.text_lines = len(lines)
-        
-        # Collect text blocks
-        current_block = []
-        blocks = []
-        for line in lines:
-            line = line.strip()
-            if len(line) > 10:
-                current_block.append(line)
-            elif current_block:
-                block_text = '\n'.join(current_block)
-                if len(block_text) > 100:
-                    blocks.append(block_text)
-                current_block = []
-        stats.text_blocks = len(blocks)
+        print("[5/5] Scrolling and extracting posts...")
         
-        # Filter to real posts
-        seen = set()
-        skip_words = ['Like', 'Comment', 'Share', 'Follow', 'Message', 
-                     'See more', 'View more', 'Write a comment', 'Log In']
-        
-        for block in blocks:
-            if len(posts) >= max_posts:
-                break
-            if any(block.startswith(w) for w in skip_words):
-                continue
-            if len(block) < 50:
-                continue
-            
-            block_hash = hashlib.md5(block[:100].encode()).hexdigest()[:8]
-            if block_hash in seen:
-                continue
-            seen.add(block_hash)
-            
-            post = {
-                "post_id": f"{page_id}_{block_hash}",
-                "source_id": page_id,
-                "source_name": page_name,
-                "title": block.split('\n')[0][:80],
-                "text": block[:2000],
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "content_hash": hashlib.sha256(block.encode()).hexdigest(),
-            }
-            posts.append(post)
-            print(f"   ✅ {post['title'][:60]}...")
+        def scroll_and_wait():
+            height = driver.execute_script("return document.body.scrollHeight;")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            result = wait_for_content(probe, min_posts=None, grow_from=height,
+                                      timeout=readiness.scroll_timeout, config=readiness)
+            stats.record_wait(f"scroll_{len(stats.scroll_yields)}", result)
+            return result
         
-        stats.time_extraction = time.time() - t0
+        extractor = PageExtractor(
+            page_id, page_name, stats,
+            read_text=lambda: driver.find_element(By.TAG_NAME, "body").text,
+            read_dom=lambda: driver.execute_script(SELENIUM_DOM_EXTRACT_JS,
+                                                   readiness.post_selector),
+            verbose=True,
+        )
+        scrolled = adaptive_scroll(extractor.read, scroll_and_wait, extractor.extract,
+                                   max_posts, stats, cursor=cursor, on_posts=on_posts)
+        posts = scrolled.posts
         stats.posts_found = len(posts)
+        if policy.active:
+            collect_selenium_blocked(driver, tracker)
+            tracker.apply_to(stats)
+        print(f"      Done: {len(stats.scroll_yields) - 1} scrolls, "
+              f"stopped on {stats.scroll_stop_reason} ({stats.time_scrolling:.2f}s)")
         
-        # Save debug files
-        html_content = driver.page_source
-        stats.html_size_kb = len(html_content) / 1024
-        
-        Path("data").mkdir(exist_ok=True)
-        Path("data/debug_page.html").write_text(html_content, encoding='utf-8')
-        Path("data/debug_text.txt").write_text(body_text, encoding='utf-8')
+        # Debug snapshot only when configured (src/debug_capture.py); never
+        # when replaying - the corpus page is the snapshot
+        if not replay and should_capture(page_id):
+            html_content = driver.page_source
+            stats.html_size_kb = len(html_content) / 1024
+            get_debug_capture().submit(page_id, "selenium", html_content,
+                                       debug_text(scrolled.last_text))
         
         stats.success = True
-        
+    
     except Exception as e:
         stats.error = str(e)
+        healthy = False
         print(f"\n❌ Error: {e}")
+        if not replay and should_capture(page_id, failed=True):
+            try:
+                html_content = driver.page_source
+            except Exception:
+                html_content = None
+            get_debug_capture().submit(page_id, "selenium", html_content, error=str(e))
     finally:
-        driver.quit()
+        if own_pool:
+            pool.close()  # Closed first, so release() just shuts the browser down
+        pool.release(session, healthy)
     
     # Calculate total time
     stats.time_total = (stats.time_browser_init + stats.time_facebook_load + 
                         stats.time_cookies + stats.time_page_navigate + 
                         stats.time_scrolling + stats.time_extraction)
+    record_run(stats)
     
     # Show statistics
     if show_stats:
@@ -312,53 +372,76 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
 # ==============================================================================
 
 def scrape_all_sources(sources: list, max_posts_per_source: int = 10, 
-                       headless: bool = True) -> tuple[list, list]:
+                       headless: bool = True, save: Callable = None) -> tuple[list, list]:
     """
-    Scrape multiple Facebook pages sequentially.
+    Scrape multiple Facebook pages sequentially, reusing warm browsers
+    from the shared pool.
+    
+    Progress is checkpointed after each source (settings.json → recovery);
+    a restarted run skips sources that are already done and returns their
+    posts from the checkpoint. With `save`, each source's posts are saved
+    as it finishes and kept in the checkpoint until they are stored.
     
     Args:
         sources: List of dicts with 'id' and 'name' keys
         max_posts_per_source: Max posts to get from each source
         headless: Run in headless mode
+        save: Saves a list of posts, returns a save_posts_batch() result dict
+              (default: posts are only returned)
     
     Returns:
-        Tuple of (all_posts, all_stats)
+        Tuple of (all_posts, all_stats) - stats only for sources scraped now
     """
-    all_posts = []
+    checkpoint = Checkpoint.resume("selenium", [s['id'] for s in sources])
+    all_posts = checkpoint.unsaved_posts()
     all_stats = []
+    pending = checkpoint.pending(sources)
     
     print(f"\n{'═'*60}")
     print(f"BATCH SCRAPE: {len(sources)} sources")
     print(f"{'═'*60}")
+    checkpoint.print_resume()
+    
+    errors = 0
+    if save:  # Posts an interrupted run scraped but did not store
+        for page_id in list(checkpoint.unsaved):
+            errors += checkpoint.save_posts(page_id, save)
     
     batch_start = time.time()
+    pool = get_browser_pool(headless)
     
-    for i, source in enumerate(sources, 1):
-        print(f"\n[{i}/{len(sources)}] Starting {source.get('name', source['id'])}...")
+    for i, source in enumerate(pending, 1):
+        print(f"\n[{i}/{len(pending)}] Starting {source.get('name', source['id'])}...")
         
         posts, stats = scrape_page(
             page_id=source['id'],
             page_name=source.get('name', source['id']),
             max_posts=max_posts_per_source,
             headless=headless,
-            show_stats=False  # Summarize at end
+            show_stats=False,  # Summarize at end
+            pool=pool
         )
         
         all_posts.extend(posts)
         all_stats.append(stats)
+        checkpoint.complete(source['id'], posts if save else [], stats.success)
+        if save:
+            errors += checkpoint.save_posts(source['id'], save)
         
         print(f"   Got {len(posts)} posts in {stats.time_total:.1f}s")
     
     batch_time = time.time() - batch_start
+    checkpoint.finish(errors)
     
     # Final summary
     print(f"\n{'═'*60}")
     print("📊 BATCH SUMMARY")
     print(f"{'═'*60}")
-    print(f"  Sources scraped: {len(sources)}")
+    print(f"  Sources scraped: {len(all_stats)} (of {len(sources)})")
     print(f"  Total posts:     {len(all_posts)}")
     print(f"  Total time:      {batch_time:.1f}s ({batch_time/60:.1f} min)")
-    print(f"  Avg per source:  {batch_time/len(sources):.1f}s")
+    if all_stats:
+        print(f"  Avg per source:  {batch_time/len(all_stats):.1f}s")
     
     # Breakdown by source
     print(f"\n  Per-Source Breakdown:")
@@ -367,7 +450,7 @@ def scrape_all_sources(sources: list, max_posts_per_source: int = 10,
         print(f"    {status} {stat.page_id}: {stat.posts_found} posts, {stat.time_total:.1f}s")
     
     # Scale projections
-    avg_time = batch_time / len(sources) if sources else 0
+    avg_time = batch_time / len(all_stats) if all_stats else 0
     print(f"\n🔮 Scale Projections (at {avg_time:.1f}s/page avg):")
     print(f"   50 pages:  {avg_time * 50 / 60:>5.1f} minutes")
     print(f"  100 pages:  {avg_time * 100 / 60:>5.1f} minutes")
@@ -387,6 +470,7 @@ if __name__ == "__main__":
     parser.add_argument("--all", "-a", action="store_true", help="Scrape all sources from config")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode (no browser window)")
     parser.add_argument("--max", "-m", type=int, default=10, help="Max posts per source (default: 10)")
+    parser.add_argument("--replay", metavar="URL", help="With --page: scrape a captured page from this corpus URL (see src/replay.py)")
     
     args = parser.parse_args()
     
@@ -410,7 +494,8 @@ if __name__ == "__main__":
         posts, stats = scrape_page(
             page_id=args.page,
             max_posts=args.max,
-            headless=args.headless
+            headless=args.headless,
+            replay=args.replay
         )
         if posts:
             print(f"\n📄 First post:\n{json.dumps(posts[0], indent=2, ensure_ascii=False)}")
@@ -16,13 +16,45 @@ Install:
 """
 
 import time
-import hashlib
 import json
 import asyncio
-from datetime import datetime, timezone
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
+
+try:
+    from src.settings import get_setting
+    from src.stats import ScraperStats
+    from src.readiness import (ReadinessConfig, playwright_probe,
+                               wait_for_content, wait_for_content_async)
+    from src.scrolling import ScrollResult, adaptive_scroll, adaptive_scroll_async
+    from src.extract import DOM_EXTRACT_JS, PageExtractor, debug_text
+    from src.replay import replay_url
+    from src.cursors import CursorStore, SourceCursor, incremental_enabled
+    from src.dedupe_index import get_dedupe_index
+    from src.checkpoint import Checkpoint
+    from src.session_cache import get_session_cache, session_cache_enabled
+    from src.tracing import record_run, span
+    from src.debug_capture import get_debug_capture, should_capture
+    from src.browser_pool import BrowserPool, PooledSession
+    from src.blocking import (BlockingPolicy, BlockingTracker, install_playwright_blocking,
+                              install_playwright_blocking_async, record_navigation)
+except ImportError:  # Run as a script: python src/scraper_playwright.py
+    from settings import get_setting
+    from stats import ScraperStats
+    from readiness import (ReadinessConfig, playwright_probe,
+                           wait_for_content, wait_for_content_async)
+    from scrolling import ScrollResult, adaptive_scroll, adaptive_scroll_async
+    from extract import DOM_EXTRACT_JS, PageExtractor, debug_text
+    from replay import replay_url
+    from cursors import CursorStore, SourceCursor, incremental_enabled
+    from dedupe_index import get_dedupe_index
+    from checkpoint import Checkpoint
+    from session_cache import get_session_cache, session_cache_enabled
+    from tracing import record_run, span
+    from debug_capture import get_debug_capture, should_capture
+    from browser_pool import BrowserPool, PooledSession
+    from blocking import (BlockingPolicy, BlockingTracker, install_playwright_blocking,
+                          install_playwright_blocking_async, record_navigation)
 
 try:
     from playwright.sync_api import sync_playwright, Page, Browser
@@ -33,81 +65,6 @@ except ImportError:
     print("⚠️  Playwright not installed. Run: pip install playwright && playwright install chromium")
 
 
-# ==============================================================================
-# STATISTICS TRACKING (Same as Selenium version for fair comparison)
-# ==============================================================================
-
-@dataclass
-class ScraperStats:
-    """Tracks performance metrics for each scrape run."""
-    page_id: str
-    tool: str = "playwright"
-    start_time: float = field(default_factory=time.time)
-    
-    # Timing breakdowns (in seconds)
-    time_browser_init: float = 0.0
-    time_facebook_load: float = 0.0
-    time_cookies: float = 0.0
-    time_page_navigate: float = 0.0
-    time_scrolling: float = 0.0
-    time_extraction: float = 0.0
-    time_total: float = 0.0
-    
-    # Results
-    posts_found: int = 0
-    text_lines: int = 0
-    text_blocks: int = 0
-    html_size_kb: float = 0.0
-    
-    # Status
-    success: bool = False
-    error: Optional[str] = None
-    
-    def to_dict(self):
-        return {
-            "page_id": self.page_id,
-            "tool": self.tool,
-            "timing": {
-                "browser_init": round(self.time_browser_init, 2),
-                "facebook_load": round(self.time_facebook_load, 2),
-                "cookies": round(self.time_cookies, 2),
-                "page_navigate": round(self.time_page_navigate, 2),
-                "scrolling": round(self.time_scrolling, 2),
-                "extraction": round(self.time_extraction, 2),
-                "total": round(self.time_total, 2),
-            },
-            "results": {
-                "posts_found": self.posts_found,
-                "text_lines": self.text_lines,
-                "text_blocks": self.text_blocks,
-                "html_size_kb": round(self.html_size_kb, 1),
-            },
-            "success": self.success,
-            "error": self.error,
-        }
-    
-    def print_summary(self):
-        """Print a formatted statistics summary."""
-        print(f"\n{'─'*50}")
-        print(f"📊 PERFORMANCE STATISTICS ({self.tool.upper()})")
-        print(f"{'─'*50}")
-        print(f"  Browser init:    {self.time_browser_init:>6.2f}s")
-        print(f"  Facebook load:   {self.time_facebook_load:>6.2f}s")
-        print(f"  Add cookies:     {self.time_cookies:>6.2f}s")
-        print(f"  Navigate page:   {self.time_page_navigate:>6.2f}s")
-        print(f"  Scrolling:       {self.time_scrolling:>6.2f}s")
-        print(f"  Extraction:      {self.time_extraction:>6.2f}s")
-        print(f"  {'─'*28}")
-        print(f"  TOTAL:           {self.time_total:>6.2f}s")
-        print(f"\n📦 Results: {self.posts_found} posts | {self.text_lines} lines | {self.html_size_kb:.0f}KB HTML")
-        
-        # Scale estimates
-        print(f"\n🔮 Scale Estimates (sequential):")
-        print(f"   10 pages:  {self.time_total * 10 / 60:>5.1f} minutes")
-        print(f"   50 pages:  {self.time_total * 50 / 60:>5.1f} minutes")
-        print(f"  100 pages:  {self.time_total * 100 / 60:>5.1f} minutes")
-
-
 # ==============================================================================
 # COOKIE LOADING
 # ==============================================================================
@@ -145,12 +102,71 @@ def load_cookies_for_playwright():
     return cookies
 
 
+def _cached_storage_state() -> Optional[dict]:
+    """Authenticated storage_state from the session cache, or None (use the homepage path)."""
+    if not session_cache_enabled():
+        return None
+    cache = get_session_cache()
+    return cache.storage_state() if cache.valid else None
+
+
+# ==============================================================================
+# SCROLL + EXTRACT HELPERS
+# ==============================================================================
+
+def _scroll_and_extract(page, probe, readiness: ReadinessConfig, page_id: str,
+                        page_name: str, max_posts: int, stats: ScraperStats,
+                        verbose: bool = False, cursor: SourceCursor = None,
+                        on_posts: Callable = None) -> ScrollResult:
+    """Run the adaptive scroll loop on a sync Playwright page."""
+    def scroll_and_wait():
+        height = page.evaluate("document.body.scrollHeight")
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        result = wait_for_content(probe, min_posts=None, grow_from=height,
+                                  timeout=readiness.scroll_timeout, config=readiness)
+        stats.record_wait(f"scroll_{len(stats.scroll_yields)}", result)
+        return result
+    
+    extractor = PageExtractor(
+        page_id, page_name, stats,
+        read_text=lambda: page.inner_text("body"),
+        read_dom=lambda: page.evaluate(DOM_EXTRACT_JS, readiness.post_selector),
+        verbose=verbose,
+    )
+    return adaptive_scroll(extractor.read, scroll_and_wait, extractor.extract,
+                           max_posts, stats, cursor=cursor, on_posts=on_posts)
+
+
+async def _scroll_and_extract_async(page, probe, readiness: ReadinessConfig, page_id: str,
+                                    page_name: str, max_posts: int, stats: ScraperStats,
+                                    cursor: SourceCursor = None) -> ScrollResult:
+    """Run the adaptive scroll loop on an async Playwright page."""
+    async def scroll_and_wait():
+        height = await page.evaluate("document.body.scrollHeight")
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        result = await wait_for_content_async(probe, min_posts=None, grow_from=height,
+                                              timeout=readiness.scroll_timeout,
+                                              config=readiness)
+        stats.record_wait(f"scroll_{len(stats.scroll_yields)}", result)
+        return result
+    
+    extractor = PageExtractor(
+        page_id, page_name, stats,
+        read_text=lambda: page.inner_text("body"),
+        read_dom=lambda: page.evaluate(DOM_EXTRACT_JS, readiness.post_selector),
+    )
+    return await adaptive_scroll_async(extractor.read_async, scroll_and_wait,
+                                       extractor.extract, max_posts, stats, cursor=cursor)
+
+
 # ==============================================================================
 # MAIN SCRAPER (Synchronous version)
 # ==============================================================================
 
 def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
-                headless: bool = True, show_stats: bool = True) -> tuple[list, ScraperStats]:
+                headless: bool = True, show_stats: bool = True,
+                replay: str = None, cursor: SourceCursor = None,
+                on_posts: Callable = None) -> tuple[list, ScraperStats]:
     """
     Scrape a Facebook page using Playwright.
     
@@ -160,6 +176,12 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
         max_posts: Maximum posts to extract
         headless: Run browser without visible window
         show_stats: Print performance statistics
+        replay: Base URL of a captured-page corpus (see src/replay.py) instead
+                of live Facebook. Skips login and leaves debug files alone.
+        cursor: High-water mark for this source (see src/cursors.py). Known
+                posts are dropped and scrolling stops when they are reached.
+        on_posts: Called with new posts after each screen, so they can be
+                  saved while scrolling continues (see src/pipeline.py)
     
     Returns:
         Tuple of (posts list, statistics object)
@@ -192,12 +214,14 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
             ]
         )
         
-        # Create context with realistic settings
+        # Create context with realistic settings (cookies included when cached)
+        storage_state = None if replay else _cached_storage_state()
         context = browser.new_context(
             viewport={'width': 1920, 'height': 1080},
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             locale='en-US',
             timezone_id='Asia/Manila',
+            storage_state=storage_state,
         )
         
         # Remove automation indicators
@@ -208,131 +232,87 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
         """)
         
         page = context.new_page()
-        stats.time_browser_init = time.time() - t0
+        policy = BlockingPolicy.from_settings()
+        tracker = BlockingTracker(policy)
+        if policy.active:
+            install_playwright_blocking(page, policy, tracker)
+        stats.add_span("browser_init", time.time() - t0, start=t0)
         print(f"      Done ({stats.time_browser_init:.2f}s)")
         
+        readiness = ReadinessConfig.from_settings()
+        probe = playwright_probe(page, readiness.post_selector)
+        
         try:
-            # ─────────────────────────────────────────────────
-            # Step 2: Load Facebook homepage
-            # ─────────────────────────────────────────────────
-            t0 = time.time()
-            print("[2/5] Loading Facebook...")
-            page.goto("https://www.facebook.com", wait_until="domcontentloaded")
-            stats.time_facebook_load = time.time() - t0
-            print(f"      Done ({stats.time_facebook_load:.2f}s)")
-            
-            # ─────────────────────────────────────────────────
-            # Step 3: Add authentication cookies
-            # ─────────────────────────────────────────────────
-            t0 = time.time()
-            print("[3/5] Adding cookies...")
-            cookies = load_cookies_for_playwright()
-            if cookies:
-                context.add_cookies(cookies)
-            stats.time_cookies = time.time() - t0
-            print(f"      Added {len(cookies)} cookies ({stats.time_cookies:.2f}s)")
+            if replay:
+                print("[2-3/5] Replay mode: skipping Facebook login")
+            elif storage_state:
+                print(f"[2-3/5] Restored cached session ({len(storage_state['cookies'])} cookies)")
+            else:
+                # ─────────────────────────────────────────────────
+                # Step 2: Load Facebook homepage
+                # ─────────────────────────────────────────────────
+                print("[2/5] Loading Facebook...")
+                with span(stats, "facebook_load"):
+                    page.goto("https://www.facebook.com", wait_until="domcontentloaded")
+                print(f"      Done ({stats.time_facebook_load:.2f}s)")
+                
+                # ─────────────────────────────────────────────────
+                # Step 3: Add authentication cookies
+                # ─────────────────────────────────────────────────
+                print("[3/5] Adding cookies...")
+                with span(stats, "cookies"):
+                    cookies = load_cookies_for_playwright()
+                    if cookies:
+                        context.add_cookies(cookies)
+                print(f"      Added {len(cookies)} cookies ({stats.time_cookies:.2f}s)")
             
             # ─────────────────────────────────────────────────
             # Step 4: Navigate to target page
             # ─────────────────────────────────────────────────
-            t0 = time.time()
-            url = f"https://www.facebook.com/{page_id}"
-            print(f"[4/5] Navigating to {page_id}...")
+            url = replay_url(replay, page_id) if replay else f"https://www.facebook.com/{page_id}"
+            print(f"[4/5] Navigating to {url if replay else page_id}...")
             
             # NOTE: Don't use networkidle - Facebook NEVER becomes idle!
-            # Use domcontentloaded + explicit wait instead
-            page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            page.wait_for_timeout(4000)  # Wait for dynamic content like Selenium
-            stats.time_page_navigate = time.time() - t0
+            # Use domcontentloaded + wait for post containers instead
+            with span(stats, "page_navigate"):
+                page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                stats.record_wait("page_navigate", wait_for_content(probe, config=readiness))
+            if not replay:
+                record_navigation(stats, policy)
             print(f"      Done ({stats.time_page_navigate:.2f}s)")
             
             # ─────────────────────────────────────────────────
-            # Step 5: Scroll to load dynamic content
-            # ─────────────────────────────────────────────────
-            t0 = time.time()
-            print("[5/5] Scrolling to load posts...")
-            scroll_count = 3
-            for i in range(scroll_count):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                print(f"      Scroll {i+1}/{scroll_count}...")
-                page.wait_for_timeout(2000)  # Playwright's timeout (ms)
-            
-            page.evaluate("window.scrollTo(0, 500)")
-            page.wait_for_timeout(1000)
-            stats.time_scrolling = time.time() - t0
-            print(f"      Done ({stats.time_scrolling:.2f}s)")
-            
+            # Step 5: Scroll + extract until we have enough posts
             # ─────────────────────────────────────────────────
-            # Step 6: Extract post content
-            # ─────────────────────────────────────────────────
-            t0 = time.time()
-            print("\n📝 Extracting posts...")
-            
-            # Get visible text content
-            body_text = page.inner_text("body")
-            lines = body_text.split('\n')
-            stats.text_lines = len(lines)
-            
-            # Collect text blocks
-            current_block = []
-            blocks = []
-            for line in lines:
-                line = line.strip()
-                if len(line) > 10:
-                    current_block.append(line)
-                elif current_block:
-                    block_text = '\n'.join(current_block)
-                    if len(block_text) > 100:
-                        blocks.append(block_text)
-                    current_block = []
-            stats.text_blocks = len(blocks)
-            
-            # Filter to real posts
-            seen = set()
-            skip_words = ['Like', 'Comment', 'Share', 'Follow', 'Message',
-                         'See more', 'View more', 'Write a comment', 'Log In']
-            
-            for block in blocks:
-                if len(posts) >= max_posts:
-                    break
-                if any(block.startswith(w) for w in skip_words):
-                    continue
-                if len(block) < 50:
-                    continue
-                
-                block_hash = hashlib.md5(block[:100].encode()).hexdigest()[:8]
-                if block_hash in seen:
-                    continue
-                seen.add(block_hash)
-                
-                post = {
-                    "post_id": f"{page_id}_{block_hash}",
-                    "source_id": page_id,
-                    "source_name": page_name,
-                    "title": block.split('\n')[0][:80],
-                    "text": block[:2000],
-                    "scraped_at": datetime.now(timezone.utc).isoformat(),
-                    "content_hash": hashlib.sha256(block.encode()).hexdigest(),
-                }
-                posts.append(post)
-                print(f"   ✅ {post['title'][:60]}...")
-            
-            stats.time_extraction = time.time() - t0
+            print("[5/5] Scrolling and extracting posts...")
+            scrolled = _scroll_and_extract(page, probe, readiness, page_id, page_name,
+                                           max_posts, stats, verbose=True, cursor=cursor,
+                                           on_posts=on_posts)
+            posts = scrolled.posts
             stats.posts_found = len(posts)
+            tracker.apply_to(stats)
+            print(f"      Done: {len(stats.scroll_yields) - 1} scrolls, "
+                  f"stopped on {stats.scroll_stop_reason} ({stats.time_scrolling:.2f}s)")
             
-            # Save debug files
-            html_content = page.content()
-            stats.html_size_kb = len(html_content) / 1024
-            
-            Path("data").mkdir(exist_ok=True)
-            Path("data/debug_page_playwright.html").write_text(html_content, encoding='utf-8')
-            Path("data/debug_text_playwright.txt").write_text(body_text, encoding='utf-8')
+            # Debug snapshot only when configured (src/debug_capture.py); never
+            # when replaying - the corpus page is the snapshot
+            if not replay and should_capture(page_id):
+                html_content = page.content()
+                stats.html_size_kb = len(html_content) / 1024
+                get_debug_capture().submit(page_id, "playwright", html_content,
+                                           debug_text(scrolled.last_text))
             
             stats.success = True
-            
+        
         except Exception as e:
             stats.error = str(e)
             print(f"\n❌ Error: {e}")
+            if not replay and should_capture(page_id, failed=True):
+                try:
+                    html_content = page.content()
+                except Exception:
+                    html_content = None
+                get_debug_capture().submit(page_id, "playwright", html_content, error=str(e))
         finally:
             context.close()
             browser.close()
@@ -341,6 +321,7 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
     stats.time_total = (stats.time_browser_init + stats.time_facebook_load +
                         stats.time_cookies + stats.time_page_navigate +
                         stats.time_scrolling + stats.time_extraction)
+    record_run(stats)
     
     if show_stats:
         stats.print_summary()
@@ -352,25 +333,88 @@ def scrape_page(page_id: str, page_name: str = "", max_posts: int = 10,
 # BATCH SCRAPING WITH BROWSER REUSE (Playwright advantage!)
 # ==============================================================================
 
+def _start_page_session(browser, policy: BlockingPolicy,
+                        tracker: BlockingTracker) -> PooledSession:
+    """
+    New context with cookies, ready for any Facebook URL. Used by the page pool.
+    
+    With a cached session the cookies come in with the context and the
+    homepage is not loaded.
+    """
+    t0 = time.time()
+    storage_state = _cached_storage_state()
+    context = browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        locale='en-US',
+        timezone_id='Asia/Manila',
+        storage_state=storage_state,
+    )
+    
+    context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+    """)
+    
+    if storage_state:
+        print(f"   Restored cached session ({len(storage_state['cookies'])} cookies)")
+    else:
+        cookies = load_cookies_for_playwright()
+        if cookies:
+            context.add_cookies(cookies)
+            print(f"   Added {len(cookies)} cookies")
+    
+    page = context.new_page()
+    if policy.active:
+        install_playwright_blocking(page, policy, tracker)
+    if not storage_state:
+        page.goto("https://www.facebook.com", wait_until="domcontentloaded")
+    return PooledSession(browser=page, warmup={"browser_init": time.time() - t0})
+
+
+def _page_memory_mb(page) -> float:
+    """JS heap of the page in MB (Chromium only)."""
+    heap = page.evaluate("performance.memory ? performance.memory.usedJSHeapSize : 0")
+    return (heap or 0) / (1024 * 1024)
+
+
+
 def scrape_all_sources(sources: list, max_posts_per_source: int = 10,
-                       headless: bool = True) -> tuple[list, list]:
+                       headless: bool = True, save: Optional[Callable] = None) -> tuple[list, list]:
     """
     Scrape multiple Facebook pages with browser reuse.
     
     This is where Playwright shines - one browser, many pages!
+    
+    Progress is checkpointed after each source (settings.json → recovery);
+    a restarted run skips sources that are already done. With `save` (a
+    save_posts_batch()-like function) each source's posts are saved as it
+    finishes and kept in the checkpoint until they are stored; without it
+    they are only returned. With incremental scraping on, each source stops
+    at its high-water mark (src/cursors.py).
     """
     if not PLAYWRIGHT_AVAILABLE:
         print("❌ Playwright not available!")
         return [], []
     
-    all_posts = []
+    cursors = CursorStore(index=get_dedupe_index()) if incremental_enabled() else None
+    checkpoint = Checkpoint.resume("playwright", [s['id'] for s in sources])
+    all_posts = checkpoint.unsaved_posts()
     all_stats = []
+    pending = checkpoint.pending(sources)
     
     print(f"\n{'═'*60}")
     print(f"BATCH SCRAPE: {len(sources)} sources (Playwright)")
     print(f"{'═'*60}")
+    checkpoint.print_resume()
+    errors = _save_unsaved(checkpoint, save)
     
     batch_start = time.time()
+    if not pending:
+        checkpoint.finish(errors)
+        _print_batch_summary(all_posts, all_stats, 0.0)
+        return all_posts, all_stats
     
     with sync_playwright() as p:
         # Initialize browser ONCE
@@ -382,146 +426,306 @@ def scrape_all_sources(sources: list, max_posts_per_source: int = 10,
             args=['--disable-blink-features=AutomationControlled', '--no-sandbox']
         )
         
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            locale='en-US',
-            timezone_id='Asia/Manila',
+        # Warm pages (context + cookies + homepage) are borrowed from a pool
+        # and recycled after scaling.browser_pool.max_pages_per_session pages
+        policy = BlockingPolicy.from_settings()
+        tracker = BlockingTracker(policy)  # Sources run one at a time, reset per source
+        pool = BrowserPool(
+            factory=lambda: _start_page_session(browser, policy, tracker),
+            close=lambda page: page.context.close(),
+            health_check=lambda page: page.evaluate("1") == 1,
+            memory_mb=_page_memory_mb,
+            size=1,
         )
-        
-        context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-        
-        # Add cookies ONCE
-        cookies = load_cookies_for_playwright()
-        if cookies:
-            context.add_cookies(cookies)
-            print(f"   Added {len(cookies)} cookies")
+        readiness = ReadinessConfig.from_settings()
         
         browser_init_time = time.time() - t0
         print(f"   Browser ready ({browser_init_time:.2f}s)\n")
         
-        page = context.new_page()
-        
-        # Load Facebook homepage once
-        page.goto("https://www.facebook.com", wait_until="domcontentloaded")
-        
         # Now scrape each source
-        for i, source in enumerate(sources, 1):
+        for i, source in enumerate(pending, 1):
             source_id = source['id']
             source_name = source.get('name', source_id)
             
-            print(f"[{i}/{len(sources)}] {source_name}...")
+            print(f"[{i}/{len(pending)}] {source_name}...")
             stats = ScraperStats(page_id=source_id, tool="playwright")
             posts = []
             
+            session = pool.acquire()
+            page = session.browser
+            probe = playwright_probe(page, readiness.post_selector)
+            healthy = True
+            tracker.reset()
+            
             try:
-                t0 = time.time()
                 url = f"https://www.facebook.com/{source_id}"
-                page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                page.wait_for_timeout(4000)  # Wait for dynamic content
-                stats.time_page_navigate = time.time() - t0
+                with span(stats, "page_navigate"):
+                    page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                    stats.record_wait("page_navigate", wait_for_content(probe, config=readiness))
+                record_navigation(stats, policy)
                 
-                # Scroll
-                t0 = time.time()
-                for _ in range(3):
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(2000)
-                page.evaluate("window.scrollTo(0, 500)")
-                page.wait_for_timeout(1000)
-                stats.time_scrolling = time.time() - t0
-                
-                # Extract
-                t0 = time.time()
-                body_text = page.inner_text("body")
-                lines = body_text.split('\n')
-                stats.text_lines = len(lines)
-                
-                current_block = []
-                blocks = []
-                for line in lines:
-                    line = line.strip()
-                    if len(line) > 10:
-                        current_block.append(line)
-                    elif current_block:
-                        block_text = '\n'.join(current_block)
-                        if len(block_text) > 100:
-                            blocks.append(block_text)
-                        current_block = []
-                stats.text_blocks = len(blocks)
-                
-                seen = set()
-                skip_words = ['Like', 'Comment', 'Share', 'Follow', 'Message',
-                             'See more', 'View more', 'Write a comment', 'Log In']
-                
-                for block in blocks:
-                    if len(posts) >= max_posts_per_source:
-                        break
-                    if any(block.startswith(w) for w in skip_words):
-                        continue
-                    if len(block) < 50:
-                        continue
-                    
-                    block_hash = hashlib.md5(block[:100].encode()).hexdigest()[:8]
-                    if block_hash in seen:
-                        continue
-                    seen.add(block_hash)
-                    
-                    post = {
-                        "post_id": f"{source_id}_{block_hash}",
-                        "source_id": source_id,
-                        "source_name": source_name,
-                        "title": block.split('\n')[0][:80],
-                        "text": block[:2000],
-                        "scraped_at": datetime.now(timezone.utc).isoformat(),
-                        "content_hash": hashlib.sha256(block.encode()).hexdigest(),
-                    }
-                    posts.append(post)
-                
-                stats.time_extraction = time.time() - t0
+                # Scroll + extract
+                cursor = cursors.get(source_id) if cursors else None
+                posts = _scroll_and_extract(page, probe, readiness, source_id, source_name,
+                                            max_posts_per_source, stats, cursor=cursor).posts
                 stats.posts_found = len(posts)
+                tracker.apply_to(stats)
                 stats.time_total = stats.time_page_navigate + stats.time_scrolling + stats.time_extraction
                 stats.success = True
                 
                 print(f"   ✅ {len(posts)} posts in {stats.time_total:.1f}s")
-                
+                if stats.high_water_mark:
+                    print(f"   ⏹️  Up to date (stopped at high-water mark)")
+            
             except Exception as e:
                 stats.error = str(e)
+                healthy = False
                 print(f"   ❌ Error: {e}")
+            finally:
+                pool.release(session, healthy)
             
+            record_run(stats)
             all_posts.extend(posts)
             all_stats.append(stats)
+            checkpoint.complete(source_id, posts if save else [], stats.success)
+            if save:
+                errors += checkpoint.save_posts(source_id, save)
+                if cursors and stats.success and source_id not in checkpoint.unsaved:
+                    cursors.advance(source_id, posts)
+                    cursors.save()
         
-        context.close()
+        pool.close()
         browser.close()
     
     batch_time = time.time() - batch_start
+    checkpoint.finish(errors)
+    _print_batch_summary(all_posts, all_stats, batch_time)
     
-    # Summary
+    return all_posts, all_stats
+
+
+def _save_unsaved(checkpoint: Checkpoint, save: Optional[Callable]) -> int:
+    """Save posts an interrupted run scraped but did not store. Returns failed posts."""
+    if not save:
+        return 0
+    return sum(checkpoint.save_posts(page_id, save) for page_id in list(checkpoint.unsaved))
+
+
+def _print_batch_summary(all_posts: list, all_stats: list, batch_time: float,
+                         label: str = "Playwright"):
+    """Print totals, per-source breakdown and scale projections for a batch run."""
     print(f"\n{'═'*60}")
-    print("📊 BATCH SUMMARY (Playwright)")
+    print(f"📊 BATCH SUMMARY ({label})")
     print(f"{'═'*60}")
-    print(f"  Sources scraped: {len(sources)}")
+    print(f"  Sources scraped: {len(all_stats)}")
     print(f"  Total posts:     {len(all_posts)}")
     print(f"  Total time:      {batch_time:.1f}s ({batch_time/60:.1f} min)")
-    print(f"  Avg per source:  {batch_time/len(sources):.1f}s")
+    if all_stats:
+        print(f"  Avg per source:  {batch_time/len(all_stats):.1f}s")
     
     print(f"\n  Per-Source Breakdown:")
     for stat in all_stats:
         status = "✅" if stat.success else "❌"
         print(f"    {status} {stat.page_id}: {stat.posts_found} posts, {stat.time_total:.1f}s")
     
-    avg_time = batch_time / len(sources) if sources else 0
+    avg_time = batch_time / len(all_stats) if all_stats else 0
     print(f"\n🔮 Scale Projections (at {avg_time:.1f}s/page avg):")
     print(f"   50 pages:  {avg_time * 50 / 60:>5.1f} minutes")
     print(f"  100 pages:  {avg_time * 100 / 60:>5.1f} minutes")
+
+
+# ==============================================================================
+# CONCURRENT BATCH SCRAPING (asyncio, many pages in one browser)
+# ==============================================================================
+
+async def _scrape_source_async(context, source: dict, max_posts: int,
+                               semaphore: asyncio.Semaphore,
+                               readiness: ReadinessConfig,
+                               cursor: SourceCursor = None) -> tuple[list, ScraperStats]:
+    """Scrape one source on its own page. The semaphore caps how many run at once."""
+    source_id = source['id']
+    source_name = source.get('name', source_id)
+    stats = ScraperStats(page_id=source_id, tool="playwright-async")
+    posts = []
+    
+    async with semaphore:
+        print(f"   ▶ {source_name}...")
+        page = await context.new_page()
+        probe = playwright_probe(page, readiness.post_selector)
+        policy = BlockingPolicy.from_settings()
+        tracker = BlockingTracker(policy)
+        try:
+            if policy.active:
+                await install_playwright_blocking_async(page, policy, tracker)
+            
+            url = f"https://www.facebook.com/{source_id}"
+            with span(stats, "page_navigate"):
+                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                stats.record_wait("page_navigate",
+                                  await wait_for_content_async(probe, config=readiness))
+            record_navigation(stats, policy)
+            
+            # Scroll + extract
+            scrolled = await _scroll_and_extract_async(page, probe, readiness, source_id,
+                                                       source_name, max_posts, stats, cursor)
+            posts = scrolled.posts
+            stats.posts_found = len(posts)
+            tracker.apply_to(stats)
+            stats.success = True
+        
+        except Exception as e:
+            stats.error = str(e)
+        finally:
+            await page.close()
+    
+    stats.time_total = stats.time_page_navigate + stats.time_scrolling + stats.time_extraction
+    record_run(stats)
+    if stats.success:
+        print(f"   ✅ {source_name}: {len(posts)} posts in {stats.time_total:.1f}s")
+        if stats.high_water_mark:
+            print(f"   ⏹️  {source_name}: up to date (stopped at high-water mark)")
+    else:
+        print(f"   ❌ {source_name}: {stats.error}")
+    
+    return posts, stats
+
+
+async def scrape_all_sources_async(sources: list, max_posts_per_source: int = 10,
+                                   headless: bool = True,
+                                   max_workers: Optional[int] = None,
+                                   save: Optional[Callable] = None) -> tuple[list, list]:
+    """
+    Scrape multiple Facebook pages concurrently inside ONE browser.
+    
+    Each source gets its own page; at most `max_workers` pages are open at
+    the same time (default: settings.json → scaling.max_workers). Sources
+    are checkpointed as they finish, like scrape_all_sources(); with `save`
+    their posts are saved one source at a time after the browser closes.
+    
+    With incremental scraping on, each source stops at its high-water mark
+    (src/cursors.py); cursors only move for sources whose posts were saved.
+    
+    Returns:
+        Tuple of (all_posts, all_stats), same shape as scrape_all_sources()
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        print("❌ Playwright not available!")
+        return [], []
+    
+    if max_workers is None:
+        max_workers = get_setting("scaling.max_workers", 3)
+    max_workers = max(1, int(max_workers))
+    
+    cursors = CursorStore(index=get_dedupe_index()) if incremental_enabled() else None
+    checkpoint = Checkpoint.resume("playwright", [s['id'] for s in sources])
+    all_posts = checkpoint.unsaved_posts()
+    all_stats = []
+    pending = checkpoint.pending(sources)
+    
+    print(f"\n{'═'*60}")
+    print(f"CONCURRENT SCRAPE: {len(sources)} sources, {max_workers} workers (Playwright)")
+    print(f"{'═'*60}")
+    checkpoint.print_resume()
+    
+    batch_start = time.time()
+    if not pending:
+        checkpoint.finish(_save_unsaved(checkpoint, save))
+        _print_batch_summary(all_posts, all_stats, 0.0, label="Playwright async")
+        return all_posts, all_stats
+    
+    async with async_playwright() as p:
+        print("\n🚀 Starting browser (shared by all workers)...")
+        t0 = time.time()
+        
+        browser = await p.chromium.launch(
+            headless=headless,
+            args=['--disable-blink-features=AutomationControlled', '--no-sandbox']
+        )
+        
+        storage_state = _cached_storage_state()
+        context = await browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            locale='en-US',
+            timezone_id='Asia/Manila',
+            storage_state=storage_state,
+        )
+        
+        await context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+        """)
+        
+        if storage_state:
+            print(f"   Restored cached session ({len(storage_state['cookies'])} cookies)")
+        else:
+            cookies = load_cookies_for_playwright()
+            if cookies:
+                await context.add_cookies(cookies)
+                print(f"   Added {len(cookies)} cookies")
+            
+            # Load Facebook homepage once so the session is warm for every worker
+            page = await context.new_page()
+            await page.goto("https://www.facebook.com", wait_until="domcontentloaded")
+            await page.close()
+        
+        browser_init_time = time.time() - t0
+        print(f"   Browser ready ({browser_init_time:.2f}s)\n")
+        
+        semaphore = asyncio.Semaphore(max_workers)
+        readiness = ReadinessConfig.from_settings()
+        
+        async def scrape_and_checkpoint(source):
+            cursor = cursors.get(source['id']) if cursors else None
+            posts, stats = await _scrape_source_async(context, source, max_posts_per_source,
+                                                      semaphore, readiness, cursor)
+            checkpoint.complete(source['id'], posts if save else [], stats.success)
+            return posts, stats
+        
+        results = await asyncio.gather(*(scrape_and_checkpoint(source) for source in pending))
+        
+        await context.close()
+        await browser.close()
+    
+    # gather() keeps source order, so output matches the sequential version
+    for posts, stats in results:
+        all_posts.extend(posts)
+        all_stats.append(stats)
+    errors = _save_unsaved(checkpoint, save)  # Includes posts left by an interrupted run
+    
+    # Known posts are only skipped next time if they really are stored
+    if cursors and save:
+        for source, (posts, stats) in zip(pending, results):
+            if stats.success and source['id'] not in checkpoint.unsaved:
+                cursors.advance(source['id'], posts)
+        cursors.save()
+    
+    batch_time = time.time() - batch_start
+    checkpoint.finish(errors)
+    _print_batch_summary(all_posts, all_stats, batch_time, label="Playwright async")
+    
+    # Real speedup: how much source time fit into the wall clock
+    summed_time = sum(s.time_total for s in all_stats)
+    print(f"\n⚡ Concurrency ({max_workers} workers):")
+    print(f"   Wall-clock:        {batch_time:>6.1f}s")
+    print(f"   Sum of sources:    {summed_time:>6.1f}s")
+    if batch_time > 0:
+        print(f"   Effective speedup: {summed_time / batch_time:>6.2f}x")
     
     return all_posts, all_stats
 
 
+def scrape_all_sources_concurrent(sources: list, max_posts_per_source: int = 10,
+                                  headless: bool = True,
+                                  max_workers: Optional[int] = None,
+                                  save: Optional[Callable] = None) -> tuple[list, list]:
+    """Synchronous wrapper around scrape_all_sources_async()."""
+    return asyncio.run(scrape_all_sources_async(
+        sources, max_posts_per_source, headless, max_workers, save
+    ))
+
+
 # ==============================================================================
 # COMPARISON TOOL
 # ==============================================================================
@@ -598,6 +802,9 @@ if __name__ == "__main__":
     parser.add_argument("--compare", "-c", action="store_true", help="Compare Playwright vs Selenium")
     parser.add_argument("--headless", action="store_true", help="Run in headless mode")
     parser.add_argument("--max", "-m", type=int, default=10, help="Max posts per source")
+    parser.add_argument("--concurrent", action="store_true", help="With --all: scrape sources in parallel pages")
+    parser.add_argument("--workers", "-w", type=int, help="Concurrent pages (default: scaling.max_workers)")
+    parser.add_argument("--replay", metavar="URL", help="With --page: scrape a captured page from this corpus URL (see src/replay.py)")
     
     args = parser.parse_args()
     
@@ -611,11 +818,19 @@ if __name__ == "__main__":
                 data = json.load(f)
                 sources = data.get("sources", data) if isinstance(data, dict) else data
             
-            posts, stats = scrape_all_sources(
-                sources=sources,
-                max_posts_per_source=args.max,
-                headless=args.headless
-            )
+            if args.concurrent:
+                posts, stats = scrape_all_sources_concurrent(
+                    sources=sources,
+                    max_posts_per_source=args.max,
+                    headless=args.headless,
+                    max_workers=args.workers
+                )
+            else:
+                posts, stats = scrape_all_sources(
+                    sources=sources,
+                    max_posts_per_source=args.max,
+                    headless=args.headless
+                )
         else:
             print("❌ config/sources.json not found!")
     
@@ -623,7 +838,8 @@ if __name__ == "__main__":
         posts, stats = scrape_page(
             page_id=args.page,
             max_posts=args.max,
-            headless=args.headless
+            headless=args.headless,
+            replay=args.replay
         )
         if posts:
             print(f"\n📄 First post:\n{json.dumps(posts[0], indent=2, ensure_ascii=False)}")
@@ -0,0 +1,186 @@
+"""
+Adaptive Infinite Scroll
+========================
+Scroll-and-extract loop used by both scrapers.
+
+Instead of always scrolling 3 times, we extract after every scroll and
+stop as soon as ONE of these is true:
+- max_posts:   we already have `max_posts` unique posts
+- high_water_mark: we reached posts saved on an earlier run (src/cursors.py)
+- page_end:    the page stopped growing and the last scroll found nothing new
+- max_scrolls: safety cap on the number of scrolls
+- time_budget: the loop ran longer than its time budget
+
+Each backend passes three small callables, so the same loop works for
+Selenium, sync Playwright and async Playwright:
+    read_text()        -> visible page text (or DOM records, see src/extract.py)
+    scroll_and_wait()  -> ReadinessResult (ready = page grew and settled)
+    extract(text, seen, limit) -> list of NEW posts (dedupes via `seen`)
+
+Settings (settings.json → scraping.scroll):
+    max_scrolls, time_budget_seconds
+"""
+
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+@dataclass
+class ScrollConfig:
+    """Limits for one scroll loop. Loaded from settings.json."""
+    max_scrolls: int = 15
+    time_budget: float = 30.0
+    
+    @classmethod
+    def from_settings(cls) -> "ScrollConfig":
+        cfg = get_setting("scraping.scroll", {}) or {}
+        return cls(
+            max_scrolls=cfg.get("max_scrolls", cls.max_scrolls),
+            time_budget=cfg.get("time_budget_seconds", cls.time_budget),
+        )
+
+
+@dataclass
+class ScrollResult:
+    """Posts collected by the loop plus the last screen read (for debug files)."""
+    posts: list = field(default_factory=list)
+    last_text: str = ""
+
+
+class _ScrollState:
+    """Bookkeeping shared by the sync and async loops."""
+    
+    def __init__(self, max_posts: int, stats, config: ScrollConfig, cursor=None,
+                 on_posts: Callable = None):
+        self.max_posts = max_posts
+        self.stats = stats
+        self.config = config
+        self.cursor = cursor
+        self.on_posts = on_posts
+        self.result = ScrollResult()
+        self.seen = set()
+        self.scrolls = 0
+        self.started = time.time()
+        self.time_extracting = 0.0
+    
+    @property
+    def remaining(self) -> int:
+        return self.max_posts - len(self.result.posts)
+    
+    @property
+    def extract_limit(self) -> int:
+        """Posts to extract from a screen. With a cursor, known posts are
+        dropped afterwards, so the whole screen is extracted."""
+        return sys.maxsize if self.cursor else self.remaining
+    
+    def add(self, new_posts: list, text: str, extract_time: float) -> list:
+        if self.cursor:
+            new_posts = self.cursor.filter(new_posts)[:max(self.remaining, 0)]
+        self.result.posts.extend(new_posts)
+        self.result.last_text = text
+        self.time_extracting += extract_time
+        self.stats.scroll_yields.append(len(new_posts))
+        if self.on_posts and new_posts:
+            self.on_posts(new_posts)
+        return new_posts
+    
+    def stop_reason(self, scroll=None, new_posts=None):
+        """Return why the loop should stop now, or None to keep scrolling."""
+        if self.remaining <= 0:
+            return "max_posts"
+        if self.cursor and self.cursor.reached:
+            return "high_water_mark"
+        if scroll is not None and not scroll.ready and not new_posts:
+            return "page_end"
+        if self.scrolls >= self.config.max_scrolls:
+            return "max_scrolls"
+        if time.time() - self.started >= self.config.time_budget:
+            return "time_budget"
+        return None
+    
+    def finish(self, reason: str) -> ScrollResult:
+        self.stats.scroll_stop_reason = reason
+        if self.cursor:
+            self.stats.high_water_mark = reason == "high_water_mark"
+            self.stats.known_posts_skipped = self.cursor.known_skipped
+        self.stats.add_span("extraction", self.time_extracting, start=self.started)
+        self.stats.add_span("scrolling", (time.time() - self.started) - self.time_extracting,
+                            start=self.started)
+        return self.result
+
+
+def adaptive_scroll(read_text: Callable, scroll_and_wait: Callable, extract: Callable,
+                    max_posts: int, stats, config: ScrollConfig = None,
+                    cursor=None, on_posts: Callable = None) -> ScrollResult:
+    """
+    Extract posts screen by screen until we have enough or the page runs out.
+    
+    Args:
+        read_text: Returns the current visible page text (or DOM records)
+        scroll_and_wait: Scrolls once and returns a ReadinessResult
+        extract: (text or records, seen, limit) -> list of new posts
+        max_posts: Stop once this many unique posts are collected
+        stats: ScraperStats - gets scroll_yields, scroll_stop_reason and timings
+        config: Scroll limits (default: from settings.json)
+        cursor: SourceCursor - drop known posts and stop at the high-water mark
+        on_posts: Called with each screen's new posts as soon as they are
+                  extracted (e.g. PostPipeline.put, see src/pipeline.py)
+    
+    Returns:
+        ScrollResult with the posts in page order
+    """
+    state = _ScrollState(max_posts, stats, config or ScrollConfig.from_settings(), cursor,
+                         on_posts)
+    
+    # First screen (entry 0 in scroll_yields)
+    t0 = time.time()
+    text = read_text()
+    state.add(extract(text, state.seen, state.extract_limit), text, time.time() - t0)
+    
+    reason = state.stop_reason()
+    while reason is None:
+        scroll = scroll_and_wait()
+        state.scrolls += 1
+        
+        t0 = time.time()
+        text = read_text()
+        new_posts = state.add(extract(text, state.seen, state.extract_limit), text,
+                              time.time() - t0)
+        
+        reason = state.stop_reason(scroll, new_posts)
+    
+    return state.finish(reason)
+
+
+async def adaptive_scroll_async(read_text: Callable, scroll_and_wait: Callable,
+                                extract: Callable, max_posts: int, stats,
+                                config: ScrollConfig = None, cursor=None,
+                                on_posts: Callable = None) -> ScrollResult:
+    """Async version of adaptive_scroll(). read_text and scroll_and_wait are coroutines."""
+    state = _ScrollState(max_posts, stats, config or ScrollConfig.from_settings(), cursor,
+                         on_posts)
+    
+    t0 = time.time()
+    text = await read_text()
+    state.add(extract(text, state.seen, state.extract_limit), text, time.time() - t0)
+    
+    reason = state.stop_reason()
+    while reason is None:
+        scroll = await scroll_and_wait()
+        state.scrolls += 1
+        
+        t0 = time.time()
+        text = await read_text()
+        new_posts = state.add(extract(text, state.seen, state.extract_limit), text,
+                              time.time() - t0)
+        
+        reason = state.stop_reason(scroll, new_posts)
+    
+    return state.finish(reason)
@@ -0,0 +1,186 @@
+"""
+Session Cache
+=============
+A ready-to-use authenticated state, so a scrape never loads the Facebook
+homepage just to be allowed to set cookies (the ~4.4s facebook_load stage).
+
+config/facebook_cookies.txt is parsed once into data/session_state.json
+(Playwright storage_state format) and reused until the cookie file
+changes or its login cookies expire:
+
+- Playwright: browser.new_context(storage_state=cache.storage_state())
+- Selenium:   CDP Network.setCookies before the first navigation
+              (set_selenium_cookies) - no page needs to be open
+
+    cache = get_session_cache()
+    if cache.valid:
+        state = cache.storage_state()
+
+Expiry is the earliest expiry of the login cookies (c_user, xs), falling
+back to the earliest expiring cookie in the file. Session cookies (expiry 0)
+never expire the cache.
+
+Settings (settings.json → authentication):
+    session_cache (on/off), session_state_file, alert_on_cookie_expiry
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+COOKIE_FILE = Path("config/facebook_cookies.txt")
+LOGIN_COOKIES = {"c_user", "xs"}
+
+
+def parse_cookie_file(path: Path = COOKIE_FILE) -> list:
+    """Netscape cookie file -> Playwright cookies (expires = -1 for session cookies)."""
+    cookies = []
+    if not path.exists():
+        return cookies
+    
+    for line in open(path, 'r', encoding='utf-8'):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split('\t')
+        if len(parts) < 7:
+            continue
+        try:
+            expiry = int(parts[4])
+        except ValueError:
+            expiry = 0
+        cookies.append({
+            'name': parts[5],
+            'value': parts[6],
+            'domain': parts[0],
+            'path': parts[2],
+            'secure': parts[3].upper() == 'TRUE',
+            'httpOnly': False,
+            'expires': expiry if expiry > 0 else -1,
+        })
+    return cookies
+
+
+def cookies_expire_at(cookies: list) -> Optional[float]:
+    """Earliest expiry of the login cookies (or of any cookie), None if they never expire."""
+    login = [c['expires'] for c in cookies if c['name'] in LOGIN_COOKIES and c['expires'] > 0]
+    any_cookie = [c['expires'] for c in cookies if c['expires'] > 0]
+    expiries = login or any_cookie
+    return min(expiries) if expiries else None
+
+
+class SessionCache:
+    """Cached storage state built from the cookie file."""
+    
+    def __init__(self, cookie_file: Path = COOKIE_FILE, path: Optional[Path] = None):
+        self.cookie_file = Path(cookie_file)
+        self.path = Path(path or get_setting("authentication.session_state_file",
+                                             "data/session_state.json"))
+        self._state = None
+        self._warned = False
+    
+    def _source_mtime(self) -> float:
+        try:
+            return self.cookie_file.stat().st_mtime
+        except OSError:
+            return 0.0
+    
+    def _current(self, state: Optional[dict]) -> bool:
+        """Built from the cookie file as it is now."""
+        return bool(state) and state.get("source_mtime") == self._source_mtime()
+    
+    def _load(self) -> dict:
+        """In-memory state, else the state file, else rebuilt from the cookie file."""
+        if self._current(self._state):
+            return self._state
+        try:
+            state = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            state = None
+        if not self._current(state):
+            state = self._build()
+        self._state = state
+        return state
+    
+    def _build(self) -> dict:
+        cookies = parse_cookie_file(self.cookie_file)
+        state = {
+            "cookies": cookies,
+            "origins": [],
+            "source_mtime": self._source_mtime(),
+            "expires_at": cookies_expire_at(cookies),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if cookies:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state, indent=2), encoding='utf-8')
+            os.replace(tmp, self.path)
+        return state
+    
+    # ─────────────────────────────────────────────────
+    # Public
+    # ─────────────────────────────────────────────────
+    
+    @property
+    def valid(self) -> bool:
+        """Cookies are present and the login cookies have not expired."""
+        state = self._load()
+        if not state["cookies"]:
+            return False
+        if state["expires_at"] is None or state["expires_at"] > time.time():
+            return True
+        if not self._warned and get_setting("authentication.alert_on_cookie_expiry", True):
+            expired = datetime.fromtimestamp(state["expires_at"], timezone.utc)
+            print(f"⚠️  Facebook cookies expired {expired:%Y-%m-%d} - export new ones to {self.cookie_file}")
+            self._warned = True
+        return False
+    
+    def cookies(self) -> list:
+        """Playwright-format cookies."""
+        return self._load()["cookies"]
+    
+    def storage_state(self) -> dict:
+        """For browser.new_context(storage_state=...)."""
+        return {"cookies": self.cookies(), "origins": []}
+    
+    def cdp_cookies(self) -> list:
+        """For the Chrome DevTools Network.setCookies command."""
+        result = []
+        for c in self.cookies():
+            cookie = {k: c[k] for k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')}
+            if c['expires'] > 0:
+                cookie['expires'] = c['expires']
+            result.append(cookie)
+        return result
+
+
+def session_cache_enabled() -> bool:
+    return bool(get_setting("authentication.session_cache", True))
+
+
+def set_selenium_cookies(driver, cache: "SessionCache") -> int:
+    """Install the cached cookies through CDP, before any page is opened."""
+    cookies = cache.cdp_cookies()
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    return len(cookies)
+
+
+_cache = None
+
+
+def get_session_cache() -> SessionCache:
+    """Process-wide cache (built on first use)."""
+    global _cache
+    if _cache is None:
+        _cache = SessionCache()
+    return _cache
@@ -0,0 +1,53 @@
+"""
+Settings Loader
+===============
+Reads config/settings.json once and hands out values by dotted path.
+
+Usage:
+    from src.settings import get_setting
+    workers = get_setting("scaling.max_workers", 3)
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+SETTINGS_PATH = Path("config/settings.json")
+
+_settings_cache = None
+
+
+def load_settings(path: Path = SETTINGS_PATH, reload: bool = False) -> dict:
+    """
+    Load settings.json (cached after the first call).
+    
+    Returns an empty dict if the file is missing or invalid, so callers
+    always fall back to their own defaults instead of crashing.
+    """
+    global _settings_cache
+    
+    if _settings_cache is not None and not reload:
+        return _settings_cache
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            _settings_cache = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️  Could not read {path}: {e}")
+        _settings_cache = {}
+    
+    return _settings_cache
+
+
+def get_setting(key: str, default: Any = None) -> Any:
+    """
+    Get a setting by dotted path, e.g. "scaling.max_workers".
+    
+    Returns `default` if any part of the path is missing.
+    """
+    value = load_settings()
+    for part in key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
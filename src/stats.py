@@ -0,0 +1,185 @@
+"""
+Scraper Statistics
+==================
+One ScraperStats class shared by the Selenium and Playwright scrapers,
+so both backends report the same fields for a fair comparison.
+
+Stage timings are recorded as spans (src/tracing.py): add_span() keeps
+the span and adds its time to the matching time_<stage> field.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class ScraperStats:
+    """Tracks performance metrics for each scrape run."""
+    page_id: str
+    tool: str = "selenium"
+    start_time: float = field(default_factory=time.time)
+    
+    # Timing breakdowns (in seconds)
+    time_browser_init: float = 0.0
+    time_facebook_load: float = 0.0
+    time_cookies: float = 0.0
+    time_page_navigate: float = 0.0
+    time_scrolling: float = 0.0
+    time_extraction: float = 0.0
+    time_total: float = 0.0
+    
+    # Timed spans, in order: {"stage", "start", "seconds", "ok"}
+    spans: list = field(default_factory=list)
+    
+    # Chromedriver resolution: "hit", "miss", "offline", "memory" (None = not started here)
+    driver_cache: Optional[str] = None
+    
+    # Readiness waits (one entry per wait: stage, seconds, reason)
+    readiness_waits: list = field(default_factory=list)
+    
+    # Adaptive scrolling (entry 0 = first screen, then one entry per scroll)
+    scroll_yields: list = field(default_factory=list)
+    scroll_stop_reason: Optional[str] = None
+    
+    # Incremental scraping (see src/cursors.py)
+    high_water_mark: bool = False  # Stopped on posts saved by an earlier run
+    known_posts_skipped: int = 0
+    
+    # Resource blocking (see src/blocking.py)
+    blocked_requests: dict = field(default_factory=dict)
+    blocked_kb_est: float = 0.0
+    navigate_time_saved: Optional[float] = None
+    
+    # Extraction: "dom" (one JS pass per screen) or "text" (body text heuristics)
+    extraction_mode: str = "text"
+    transfer_kb: float = 0.0  # Data pulled from the page across the driver protocol
+    
+    # Results
+    posts_found: int = 0
+    text_lines: int = 0
+    text_blocks: int = 0
+    rejected_blocks: dict = field(default_factory=dict)  # Pre-filter: reason -> blocks
+    html_size_kb: float = 0.0
+    
+    # Status
+    success: bool = False
+    error: Optional[str] = None
+    
+    def record_wait(self, stage: str, result):
+        """Store the outcome of a readiness wait (see src/readiness.py)."""
+        self.readiness_waits.append({
+            "stage": stage,
+            "seconds": round(result.seconds, 2),
+            "reason": result.reason,
+        })
+    
+    def add_span(self, stage: str, seconds: float, start: Optional[float] = None,
+                 ok: bool = True):
+        """Record a timed stage (adds to time_<stage> when that field exists)."""
+        self.spans.append({
+            "stage": stage,
+            "start": round(start if start is not None else time.time() - seconds, 3),
+            "seconds": round(seconds, 3),
+            "ok": ok,
+        })
+        field_name = f"time_{stage}"
+        if hasattr(self, field_name):
+            setattr(self, field_name, getattr(self, field_name) + seconds)
+    
+    @property
+    def time_readiness(self) -> float:
+        """Total time spent waiting for content to become ready."""
+        return sum(w["seconds"] for w in self.readiness_waits)
+    
+    def to_dict(self):
+        return {
+            "page_id": self.page_id,
+            "tool": self.tool,
+            "timing": {
+                "browser_init": round(self.time_browser_init, 2),
+                "facebook_load": round(self.time_facebook_load, 2),
+                "cookies": round(self.time_cookies, 2),
+                "page_navigate": round(self.time_page_navigate, 2),
+                "scrolling": round(self.time_scrolling, 2),
+                "extraction": round(self.time_extraction, 2),
+                "total": round(self.time_total, 2),
+            },
+            "spans": self.spans,
+            "driver_cache": self.driver_cache,
+            "readiness": {
+                "total": round(self.time_readiness, 2),
+                "waits": self.readiness_waits,
+            },
+            "scrolling": {
+                "scrolls": max(len(self.scroll_yields) - 1, 0),
+                "yields": self.scroll_yields,
+                "stop_reason": self.scroll_stop_reason,
+                "high_water_mark": self.high_water_mark,
+                "known_posts_skipped": self.known_posts_skipped,
+            },
+            "blocking": {
+                "blocked_requests": self.blocked_requests,
+                "kb_saved_est": round(self.blocked_kb_est, 1),
+                "navigate_time_saved": (round(self.navigate_time_saved, 2)
+                                        if self.navigate_time_saved is not None else None),
+            },
+            "extraction": {
+                "mode": self.extraction_mode,
+                "transfer_kb": round(self.transfer_kb, 1),
+            },
+            "results": {
+                "posts_found": self.posts_found,
+                "text_lines": self.text_lines,
+                "text_blocks": self.text_blocks,
+                "rejected_blocks": self.rejected_blocks,
+                "html_size_kb": round(self.html_size_kb, 1),
+            },
+            "success": self.success,
+            "error": self.error,
+        }
+    
+    def print_summary(self):
+        """Print a formatted statistics summary."""
+        print(f"\n{'─'*50}")
+        print(f"📊 PERFORMANCE STATISTICS ({self.tool.upper()})")
+        print(f"{'─'*50}")
+        cache_note = f"  (driver cache: {self.driver_cache})" if self.driver_cache else ""
+        print(f"  Browser init:    {self.time_browser_init:>6.2f}s{cache_note}")
+        print(f"  Facebook load:   {self.time_facebook_load:>6.2f}s")
+        print(f"  Add cookies:     {self.time_cookies:>6.2f}s")
+        print(f"  Navigate page:   {self.time_page_navigate:>6.2f}s")
+        print(f"  Scrolling:       {self.time_scrolling:>6.2f}s")
+        print(f"  Extraction:      {self.time_extraction:>6.2f}s")
+        print(f"  {'─'*28}")
+        print(f"  TOTAL:           {self.time_total:>6.2f}s")
+        
+        if self.readiness_waits:
+            print(f"\n⏳ Readiness waits: {self.time_readiness:.2f}s total")
+            for w in self.readiness_waits:
+                print(f"   {w['stage']:<14} {w['seconds']:>5.2f}s ({w['reason']})")
+        
+        if self.scroll_yields:
+            print(f"\n📜 Scrolls: {len(self.scroll_yields) - 1} | new posts per screen: "
+                  f"{self.scroll_yields} | stopped: {self.scroll_stop_reason}")
+        if self.high_water_mark or self.known_posts_skipped:
+            note = "stopped at high-water mark, " if self.high_water_mark else ""
+            print(f"   ⏹️  Incremental: {note}{self.known_posts_skipped} known posts skipped")
+        
+        if self.blocked_requests:
+            blocked = sum(self.blocked_requests.values())
+            saved = (f", navigate {self.navigate_time_saved:+.2f}s vs unblocked"
+                     if self.navigate_time_saved is not None else "")
+            print(f"\n🚫 Blocked: {blocked} requests (~{self.blocked_kb_est / 1024:.1f}MB saved{saved})")
+        
+        print(f"\n📦 Results: {self.posts_found} posts | {self.text_lines} lines | {self.html_size_kb:.0f}KB HTML")
+        print(f"   Extraction: {self.extraction_mode} mode, {self.transfer_kb:.1f}KB read from page")
+        if self.rejected_blocks:
+            rejects = ", ".join(f"{n} {reason}" for reason, n in sorted(self.rejected_blocks.items()))
+            print(f"   Pre-filter rejected: {rejects}")
+        
+        # Estimate for scale
+        print(f"\n🔮 Scale Estimates (sequential):")
+        print(f"   10 pages:  {self.time_total * 10 / 60:>5.1f} minutes")
+        print(f"   50 pages:  {self.time_total * 50 / 60:>5.1f} minutes")
+        print(f"  100 pages:  {self.time_total * 100 / 60:>5.1f} minutes")
@@ -0,0 +1,171 @@
+"""
+Keyword Tagger
+==============
+Applies config/keywords.json to posts: urgency, programs, categories and a
+template title ("[URGENT] Classes Suspended").
+
+Every keyword of every set is compiled at startup into ONE regex, shaped
+as a trie (shared prefixes are matched once, e.g. "exam" / "examination"),
+so a post is tagged in a single scan of its text however many keywords
+there are. A match is looked up in a dict to find which labels it belongs to.
+
+    tagger = get_tagger()
+    tagger.tag("Walang pasok bukas para sa lahat ng estudyante")
+    # {"urgency": "SUSPENDED", "programs": ["ALL"], "categories": [],
+    #  "template_title": "[URGENT] Classes Suspended"}
+
+    tag_posts(posts)        # adds the four fields to each post dict
+
+Priority: when several urgency labels match, the one listed first in
+keywords.json wins; template_title is the first matching entry of
+title_templates (file order), else None. The post's own `title` (its first
+line, set at extraction) is never changed.
+
+Settings (settings.json → title_generation):
+    enabled, use_keywords, max_title_length
+
+Benchmark: python benchmarks/bench_tagger.py
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+
+
+KEYWORDS_PATH = Path("config/keywords.json")
+KEYWORD_SETS = {
+    "urgency": "urgency_keywords",
+    "programs": "program_keywords",
+    "categories": "category_keywords",
+}
+
+_keywords_cache = None
+
+
+def load_keywords(path: Path = KEYWORDS_PATH, reload: bool = False) -> dict:
+    """Load keywords.json (cached after the first call; empty dict if missing)."""
+    global _keywords_cache
+    
+    if _keywords_cache is not None and not reload:
+        return _keywords_cache
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            _keywords_cache = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️  Could not read {path}: {e}")
+        _keywords_cache = {}
+    
+    return _keywords_cache
+
+
+def trie_pattern(words) -> str:
+    """
+    Regex source matching any of `words`, factored into a trie.
+    
+    ["exam", "examination", "event"] -> "e(?:vent|xam(?:ination)?)"
+    Longer words win over their prefixes (quantifiers are greedy).
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End of a word
+    
+    def render(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return (body if len(branches) > 1 else "(?:" + body + ")") + "?"
+        return body
+    
+    return render(trie)
+
+
+class KeywordTagger:
+    """All keyword sets of keywords.json compiled into one matcher."""
+    
+    def __init__(self, keywords: Optional[dict] = None):
+        keywords = load_keywords() if keywords is None else keywords
+        
+        # keyword -> [(field, label)], in file order
+        self._labels = {}
+        self._order = {}
+        for field, section in KEYWORD_SETS.items():
+            for rank, (label, words) in enumerate(keywords.get(section, {}).items()):
+                self._order[(field, label)] = rank
+                for word in words:
+                    self._labels.setdefault(word.lower(), []).append((field, label))
+        
+        self.templates = keywords.get("title_templates", {})
+        self.max_title_length = get_setting("title_generation.max_title_length", 80)
+        self.pattern = (re.compile(r"\b" + trie_pattern(self._labels) + r"\b")
+                        if self._labels else None)
+    
+    def labels(self, text: str) -> dict:
+        """{field: set of labels} found in the text."""
+        found = {field: set() for field in KEYWORD_SETS}
+        if self.pattern is None:
+            return found
+        for match in self.pattern.finditer(text.lower()):
+            for field, label in self._labels[match.group()]:
+                found[field].add(label)
+        return found
+    
+    def _ranked(self, field: str, labels: set) -> list:
+        """Labels in keywords.json order."""
+        return sorted(labels, key=lambda label: self._order[(field, label)])
+    
+    def tag(self, text: str) -> dict:
+        """urgency, programs, categories and template_title (None if no template matches)."""
+        found = self.labels(text)
+        urgency = self._ranked("urgency", found["urgency"])
+        matched = found["urgency"] | found["categories"] | found["programs"]
+        title = next((t for label, t in self.templates.items() if label in matched), None)
+        return {
+            "urgency": urgency[0] if urgency else None,
+            "programs": self._ranked("programs", found["programs"]),
+            "categories": self._ranked("categories", found["categories"]),
+            "template_title": title[:self.max_title_length] if title else None,
+        }
+    
+    def tag_posts(self, posts: list) -> list:
+        """Add urgency/programs/categories/template_title to each post dict, in place."""
+        for post in posts:
+            post.update(self.tag(post.get("text", "")))
+        return posts
+
+
+_tagger = None
+
+
+def get_tagger() -> KeywordTagger:
+    """Process-wide tagger (compiled on first use)."""
+    global _tagger
+    if _tagger is None:
+        _tagger = KeywordTagger()
+    return _tagger
+
+
+def tag_posts(posts: list) -> list:
+    """Tag posts if title_generation is enabled with use_keywords."""
+    if get_setting("title_generation.enabled", True) and get_setting("title_generation.use_keywords", True):
+        get_tagger().tag_posts(posts)
+    return posts
+
+
+if __name__ == "__main__":
+    import sys
+    
+    text = " ".join(sys.argv[1:]) or "Walang pasok bukas para sa lahat ng estudyante"
+    print(json.dumps(get_tagger().tag(text), indent=2, ensure_ascii=False))
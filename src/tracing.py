@@ -0,0 +1,368 @@
+"""
+Tracing & Metrics
+=================
+Timed spans for every scrape stage, a metrics history that is appended to
+(never rewritten) and a Prometheus text export of it.
+
+    with span(stats, "page_navigate"):      # adds to stats.time_page_navigate
+        driver.get(url)
+    
+    @traced("save")                         # no stats: goes straight to the store
+    def save_posts_batch(...): ...
+    
+    record_run(stats)                       # one line per source scrape
+
+Stages: browser_init, facebook_load, cookies, page_navigate, scrolling,
+extraction, total (per source) and save (per save_posts_batch call).
+
+The history is data/metrics.jsonl, one JSON object per line:
+    {"type": "run", "at": "...", "source": "qcu1994", "tool": "selenium",
+     "success": true, "posts": 8, "stages": {"page_navigate": 2.1, ...}}
+    {"type": "span", "at": "...", "source": "_all", "stage": "save", "seconds": 0.4, "ok": true}
+
+When the file passes `max_file_mb` it is renamed to metrics.jsonl.1
+(replacing the previous one), so the history covers the last one to two
+files. Lines are in time order, so a window is read by seeking to its
+first line in each file instead of parsing the whole history.
+
+Reports over any window (within the kept history):
+    python src/tracing.py --report --days 30     # p50/p95 per source and stage
+    python src/tracing.py --export               # data/metrics.prom (textfile collector)
+    python src/tracing.py --serve 9108           # http://localhost:9108/metrics
+
+Settings (settings.json → monitoring.metrics):
+    enabled, file, prometheus_file, window_days, max_file_mb
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.settings import get_setting
+    from src.file_lock import FileLock
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+    from file_lock import FileLock
+
+
+STAGES = ["browser_init", "facebook_load", "cookies", "page_navigate",
+          "scrolling", "extraction", "total", "save"]
+QUANTILES = (0.5, 0.95)
+ALL_SOURCES = "_all"
+
+
+# ==============================================================================
+# SPANS
+# ==============================================================================
+
+@contextmanager
+def span(stats, stage: str, **labels):
+    """
+    Time a block as one stage.
+    
+    With stats (ScraperStats) the span is added to it (and stored with the
+    run by record_run); without, it is written to the metrics store now.
+    """
+    start = time.time()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        seconds = time.time() - start
+        if stats is not None:
+            stats.add_span(stage, seconds, start=start, ok=ok)
+        else:
+            get_metrics_store().record_span(stage, seconds, ok=ok, **labels)
+
+
+def traced(stage: str):
+    """Decorator form of span() for functions without a ScraperStats."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(None, stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==============================================================================
+# METRICS STORE
+# ==============================================================================
+
+class MetricsStore:
+    """Append-only JSON-lines history of runs and standalone spans."""
+    
+    def __init__(self, path: Optional[Path] = None, enabled: Optional[bool] = None):
+        self.path = Path(path or get_setting("monitoring.metrics.file", "data/metrics.jsonl"))
+        self.enabled = (get_setting("monitoring.metrics.enabled", True)
+                        if enabled is None else enabled)
+        self.max_bytes = get_setting("monitoring.metrics.max_file_mb", 10) * 1024 * 1024
+        self.rotated = self.path.with_name(self.path.name + ".1")
+        self._lock = threading.Lock()
+    
+    def _append(self, entry: dict):
+        if not self.enabled:
+            return
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                size = f.tell()
+            if size > self.max_bytes:
+                self._rotate()
+    
+    def _rotate(self):
+        """Rename the full file to <file>.1. Appends reopen the path, so none are lost."""
+        with FileLock(self.path.with_name(self.path.name + ".lock")):
+            try:
+                if self.path.stat().st_size > self.max_bytes:  # Not rotated by another process meanwhile
+                    os.replace(self.path, self.rotated)
+            except FileNotFoundError:
+                pass
+    
+    def record_run(self, stats):
+        """One scraped source: every stage and span of its ScraperStats."""
+        stages = {}  # Stages that did not run (e.g. facebook_load with a cached session) are left out
+        for s in stats.spans:
+            stages[s["stage"]] = round(stages.get(s["stage"], 0.0) + s["seconds"], 3)
+        stages["total"] = round(stats.time_total, 3)
+        self._append({
+            "type": "run",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "source": stats.page_id,
+            "tool": stats.tool,
+            "success": stats.success,
+            "posts": stats.posts_found,
+            "stages": stages,
+            "spans": stats.spans,
+        })
+    
+    def record_span(self, stage: str, seconds: float, ok: bool = True,
+                    source: str = ALL_SOURCES, **labels):
+        self._append({
+            "type": "span",
+            "at": datetime.now(timezone.utc).isoformat(),
+            "source": source,
+            "stage": stage,
+            "seconds": round(seconds, 3),
+            "ok": ok,
+            **labels,
+        })
+    
+    def load(self, days: Optional[float] = None) -> list:
+        """Entries of the last `days` days (all kept entries when None)."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat() if days else ""
+        entries = []
+        for path in (self.rotated, self.path):
+            try:
+                f = open(path, 'rb')
+            except FileNotFoundError:
+                continue
+            with f:
+                f.seek(_first_line_at(f, cutoff) if cutoff else 0)
+                for line in f:
+                    entry = _parse(line)
+                    if entry is not None and entry.get("at", "") >= cutoff:
+                        entries.append(entry)
+        return entries
+
+
+def _parse(line: bytes) -> Optional[dict]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None  # Half-written line from a crash
+
+
+def _first_line_at(f, cutoff: str) -> int:
+    """Offset of the first line with "at" >= cutoff (bisecting the time-ordered lines)."""
+    def line_from(offset: int) -> tuple:
+        """(start, line) of the first line starting at or after offset."""
+        f.seek(max(offset - 1, 0))
+        if offset:
+            f.readline()  # Rest of the line that offset - 1 is in
+        return f.tell(), f.readline()
+    
+    low, high = 0, f.seek(0, os.SEEK_END)
+    while low < high:
+        mid = (low + high) // 2
+        _, line = line_from(mid)
+        entry = _parse(line) if line else None
+        if not line or (entry or {}).get("at", "") >= cutoff:
+            high = mid
+        else:
+            low = mid + 1
+    return line_from(low)[0]
+
+
+def percentile(values: list, q: float) -> float:
+    """Linear-interpolated percentile of a non-empty list (q in 0..1)."""
+    values = sorted(values)
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def stage_summary(entries: list) -> dict:
+    """{(source, stage): {"count", "sum", "p50", "p95"}} over the entries."""
+    samples = {}
+    for entry in entries:
+        if entry.get("type") == "run":
+            for stage, seconds in entry.get("stages", {}).items():
+                samples.setdefault((entry["source"], stage), []).append(seconds)
+        elif entry.get("type") == "span":
+            samples.setdefault((entry["source"], entry["stage"]), []).append(entry["seconds"])
+    
+    return {
+        key: {
+            "count": len(values),
+            "sum": sum(values),
+            "p50": percentile(values, 0.5),
+            "p95": percentile(values, 0.95),
+        }
+        for key, values in samples.items()
+    }
+
+
+# ==============================================================================
+# PROMETHEUS EXPORT
+# ==============================================================================
+
+def prometheus_text(entries: list) -> str:
+    """Prometheus text exposition format for the given history entries."""
+    lines = [
+        "# HELP scraper_stage_seconds Stage latency per source",
+        "# TYPE scraper_stage_seconds summary",
+    ]
+    for (source, stage), s in sorted(stage_summary(entries).items()):
+        labels = f'source="{source}",stage="{stage}"'
+        for q in QUANTILES:
+            lines.append(f'scraper_stage_seconds{{{labels},quantile="{q}"}} {s[f"p{int(q * 100)}"]:.3f}')
+        lines.append(f"scraper_stage_seconds_sum{{{labels}}} {s['sum']:.3f}")
+        lines.append(f"scraper_stage_seconds_count{{{labels}}} {s['count']}")
+    
+    runs = {}
+    posts = {}
+    for entry in entries:
+        if entry.get("type") != "run":
+            continue
+        status = "success" if entry.get("success") else "failure"
+        runs[(entry["source"], status)] = runs.get((entry["source"], status), 0) + 1
+        posts[entry["source"]] = posts.get(entry["source"], 0) + entry.get("posts", 0)
+    
+    # Gauges, not counters: they cover the window and go down as entries age out
+    lines += ["# HELP scraper_runs_window Source scrapes by outcome in the metrics window",
+              "# TYPE scraper_runs_window gauge"]
+    for (source, status), count in sorted(runs.items()):
+        lines.append(f'scraper_runs_window{{source="{source}",status="{status}"}} {count}')
+    lines += ["# HELP scraper_posts_window Posts extracted per source in the metrics window",
+              "# TYPE scraper_posts_window gauge"]
+    for source, count in sorted(posts.items()):
+        lines.append(f'scraper_posts_window{{source="{source}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def export_prometheus(path: Optional[Path] = None, days: Optional[float] = None) -> Path:
+    """Write the textfile-collector file (atomically) for the last `days` days."""
+    path = Path(path or get_setting("monitoring.metrics.prometheus_file", "data/metrics.prom"))
+    days = days or get_setting("monitoring.metrics.window_days", 7)
+    text = prometheus_text(get_metrics_store().load(days))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+    return path
+
+
+def serve_metrics(port: int = 9108, days: Optional[float] = None):
+    """Serve /metrics over HTTP (computed from the history on every scrape)."""
+    days = days or get_setting("monitoring.metrics.window_days", 7)
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text(get_metrics_store().load(days)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("", port), Handler)
+    print(f"📈 Serving metrics on http://localhost:{port}/metrics (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ==============================================================================
+# SHARED STORE
+# ==============================================================================
+
+_store = None
+
+
+def get_metrics_store() -> MetricsStore:
+    """Process-wide store."""
+    global _store
+    if _store is None:
+        _store = MetricsStore()
+    return _store
+
+
+def record_run(stats):
+    get_metrics_store().record_run(stats)
+
+
+def print_report(days: float):
+    summary = stage_summary(get_metrics_store().load(days))
+    if not summary:
+        print("No metrics recorded yet")
+        return
+    print(f"\n📈 Stage latency, last {days:g} days")
+    print(f"   {'source':<24} {'stage':<14} {'n':>5} {'p50':>7} {'p95':>7}")
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    for (source, stage), s in sorted(summary.items(),
+                                     key=lambda kv: (kv[0][0], order.get(kv[0][1], 99))):
+        print(f"   {source:<24} {stage:<14} {s['count']:>5} {s['p50']:>6.2f}s {s['p95']:>6.2f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Scraper metrics (data/metrics.jsonl)")
+    parser.add_argument('--report', action='store_true', help='Print p50/p95 per source and stage')
+    parser.add_argument('--export', action='store_true', help='Write the Prometheus text file')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='Serve /metrics on this port')
+    parser.add_argument('--days', type=float, help='Window in days (default: monitoring.metrics.window_days)')
+    args = parser.parse_args()
+    
+    days = args.days or get_setting("monitoring.metrics.window_days", 7)
+    if args.export:
+        print(f"📁 Wrote {export_prometheus(days=days)}")
+    if args.serve:
+        serve_metrics(args.serve, days)
+    if args.report or not (args.export or args.serve):
+        print_report(days)
@@ -0,0 +1,257 @@
+"""
+Multi-Process Workers
+=====================
+Spreads sources over several worker processes, each with its own browser,
+so page rendering uses more than one core.
+
+Sources go into a shared SQLite queue (data/work_queue.sqlite). Workers
+take batches of `source_batch_size` sources at a time; every claim happens
+under the lock file, so a source is never handed to two workers - not
+even to workers of two cron-launched runs that overlap. A claim that is
+older than `lease_minutes` can be taken again; a claim whose worker process
+is gone (same machine, PID no longer running) is taken back right away.
+
+Queued rows belong to the run that queued them last, and workers only
+claim their own run's rows. When an overlapping run queues a source again,
+the source moves to that run, so workers still draining an older run
+never pick it up a second time.
+
+    def worker(queue):              # module-level, runs in each process
+        ...start browser...
+        for batch in queue.batches():
+            queue.finish(scrape(batch))     # {page_id: posts found, None = failed}
+    
+    run_workers(sources, worker)
+
+Single-process runs (main.py one-shot and daemon) claim their sources
+through the same queue, so they skip sources an overlapping run is
+scraping:
+
+    queue.enqueue(sources)
+    claimed = queue.claim([s["id"] for s in sources])   # the rest are printed as held
+
+Settings (settings.json → scaling):
+    mode ("single" | "multiprocess"), max_workers, lock_file,
+    source_batch_size, queue_file, lease_minutes
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from src.settings import get_setting
+    from src.file_lock import FileLock
+except ImportError:  # Run as a script from inside src/
+    from settings import get_setting
+    from file_lock import FileLock
+
+
+class WorkQueue:
+    """Shared queue of sources; claims are exclusive across processes."""
+    
+    def __init__(self, path: Optional[Path] = None, batch_size: Optional[int] = None,
+                 run: Optional[str] = None):
+        self.path = Path(path or get_setting("scaling.queue_file", "data/work_queue.sqlite"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size or get_setting("scaling.source_batch_size", 5))
+        self.lease = get_setting("scaling.lease_minutes", 30) * 60
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.run = run or uuid.uuid4().hex[:12]  # Worker processes get their parent's run
+        self.lock = FileLock()
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS queue (
+                page_id     TEXT PRIMARY KEY,
+                source      TEXT,
+                priority    INTEGER,
+                status      TEXT,       -- pending | claimed | done | failed
+                worker      TEXT,
+                claimed_at  REAL,
+                finished_at REAL,
+                posts       INTEGER,
+                run         TEXT        -- run that queued it last
+            );
+        """)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(queue)")}
+        if "run" not in columns:  # Queue files from before runs were tracked
+            self._db.execute("ALTER TABLE queue ADD COLUMN run TEXT")
+    
+    def enqueue(self, sources: list):
+        """
+        Queue sources for this run. Sources another run is still working on
+        keep their claim; everything else goes back to pending and moves to
+        this run, out of reach of other runs' workers.
+        """
+        stale = time.time() - self.lease
+        rows = [(s["id"], json.dumps(s), s.get("priority", 99), self.run) for s in sources]
+        with self.lock, self._db:
+            self._reclaim_dead()
+            self._db.executemany("""
+                INSERT INTO queue (page_id, source, priority, status, run)
+                VALUES (?, ?, ?, 'pending', ?)
+                ON CONFLICT(page_id) DO UPDATE SET
+                    source = excluded.source,
+                    priority = excluded.priority,
+                    status = CASE WHEN status = 'claimed' AND claimed_at > ?
+                                  THEN status ELSE 'pending' END,
+                    run = CASE WHEN status = 'claimed' AND claimed_at > ?
+                               THEN run ELSE excluded.run END
+            """, [row + (stale, stale) for row in rows])
+    
+    def _reclaim_dead(self):
+        """Put claims of worker processes that died back to pending. Caller holds the lock."""
+        claims = self._db.execute(
+            "SELECT page_id, worker FROM queue WHERE status = 'claimed'").fetchall()
+        dead = [(page_id, worker) for page_id, worker in claims if _worker_dead(worker)]
+        for page_id, worker in dead:
+            print(f"♻️  {page_id}: worker {worker} is gone - taking its claim back")
+        self._db.executemany("UPDATE queue SET status = 'pending' WHERE page_id = ?",
+                             [(page_id,) for page_id, _ in dead])
+    
+    def claim(self, page_ids: Optional[list] = None) -> list:
+        """
+        Take the next batch of this run (highest priority first). Empty when
+        nothing is left.
+        
+        With page_ids, take all of those that are free instead; the ones
+        another worker or run holds are printed and left out.
+        """
+        if page_ids is not None and not page_ids:
+            return []
+        now = time.time()
+        where, params = "", [now - self.lease, self.run]
+        if page_ids:
+            where = f"AND page_id IN ({','.join('?' * len(page_ids))})"
+            params += list(page_ids)
+        params.append(len(page_ids) if page_ids else self.batch_size)
+        
+        with self.lock, self._db:
+            self._reclaim_dead()
+            rows = self._db.execute(f"""
+                SELECT page_id, source FROM queue
+                WHERE (status = 'pending' OR (status = 'claimed' AND claimed_at <= ?))
+                  AND run = ? {where}
+                ORDER BY priority LIMIT ?
+            """, params).fetchall()
+            self._db.executemany(
+                "UPDATE queue SET status = 'claimed', worker = ?, claimed_at = ? WHERE page_id = ?",
+                [(self.worker, now, page_id) for page_id, _ in rows])
+        
+        if page_ids:
+            self._print_held(set(page_ids) - {page_id for page_id, _ in rows}, now)
+        return [json.loads(source) for _, source in rows]
+    
+    def _print_held(self, page_ids: set, now: float):
+        for page_id in sorted(page_ids):
+            row = self._db.execute("SELECT worker, claimed_at FROM queue WHERE page_id = ?",
+                                   (page_id,)).fetchone()
+            if row and row[1]:
+                left = (row[1] + self.lease - now) / 60
+                print(f"⏳ {page_id}: being scraped by {row[0]} - skipped "
+                      f"(its lease runs out in {left:.0f} min)")
+    
+    def batches(self):
+        """Yield batches until the queue is drained."""
+        while True:
+            batch = self.claim()
+            if not batch:
+                return
+            yield batch
+    
+    def finish(self, found: dict):
+        """Record results: {page_id: posts found, or None if the source failed}."""
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "UPDATE queue SET status = ?, finished_at = ?, posts = ? "
+                "WHERE page_id = ? AND worker = ?",
+                [("failed" if posts is None else "done", now, posts, page_id, self.worker)
+                 for page_id, posts in found.items()])
+    
+    def summary(self, page_ids: Optional[list] = None) -> dict:
+        """{status: count}, plus posts found by finished sources (optionally only page_ids)."""
+        where, params = "", []
+        if page_ids:
+            where = f"WHERE page_id IN ({','.join('?' * len(page_ids))})"
+            params = list(page_ids)
+        rows = self._db.execute(
+            f"SELECT status, COUNT(*), SUM(posts) FROM queue {where} GROUP BY status", params)
+        result = {"posts": 0}
+        for status, count, posts in rows:
+            result[status] = count
+            result["posts"] += posts or 0
+        return result
+    
+    def close(self):
+        self._db.close()
+
+
+def _worker_dead(worker: Optional[str]) -> bool:
+    """True if `worker` ("host:pid") ran on this machine and its process is gone."""
+    host, _, pid = (worker or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit() or os.name == "nt":
+        return False  # Another machine, or Windows (os.kill would terminate it)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False  # Running as another user
+    return False
+
+
+def multiprocess_enabled() -> bool:
+    return get_setting("scaling.mode", "single") == "multiprocess"
+
+
+def _worker_main(worker: Callable, worker_id: int, batch_size: Optional[int], run: str):
+    queue = WorkQueue(batch_size=batch_size, run=run)
+    print(f"👷 Worker {worker_id} started ({queue.worker})")
+    try:
+        worker(queue)
+    finally:
+        queue.close()
+
+
+def run_workers(sources: list, worker: Callable, max_workers: Optional[int] = None,
+                batch_size: Optional[int] = None) -> dict:
+    """
+    Queue the sources and run `max_workers` worker processes until the queue
+    is empty. `worker(queue)` must be a module-level function (it is started
+    with the spawn method, so nothing is inherited from this process).
+    
+    Returns:
+        WorkQueue.summary() after all workers exit
+    """
+    max_workers = max(1, int(max_workers or get_setting("scaling.max_workers", 3)))
+    queue = WorkQueue(batch_size=batch_size)
+    queue.enqueue(sources)
+    
+    # No point starting more browsers than there are batches
+    batches = -(-len(sources) // queue.batch_size)
+    max_workers = min(max_workers, max(1, batches))
+    print(f"👷 {max_workers} worker process(es), batches of {queue.batch_size}")
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_worker_main,
+                                 args=(worker, i, batch_size, queue.run),
+                                 name=f"scrape-worker-{i}")
+                 for i in range(1, max_workers + 1)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        if process.exitcode:
+            print(f"⚠️  {process.name} exited with code {process.exitcode}")
+    
+    summary = queue.summary([s["id"] for s in sources])
+    queue.close()
+    return summary
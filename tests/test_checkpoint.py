@@ -0,0 +1,74 @@
+"""
+Run Checkpoints
+===============
+An interrupted run resumes where it stopped; a run that reached its end
+keeps only its unsaved posts, so the next run scrapes everything again.
+
+Run: python -m pytest tests/
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src import settings
+from src.checkpoint import Checkpoint
+
+SOURCES = [{"id": "qcu1994"}, {"id": "qcu.registrar"}, {"id": "qcu.ssc"}]
+IDS = [s["id"] for s in SOURCES]
+
+
+@pytest.fixture(autouse=True)
+def recovery(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "_settings_cache", {
+        "recovery": {"checkpoint_file": str(tmp_path / "scraper_state.json")},
+    })
+
+
+def test_interrupted_run_skips_completed_sources():
+    checkpoint = Checkpoint.resume("main", IDS)
+    checkpoint.complete("qcu1994", [{"post_id": "qcu1994_a"}])
+    checkpoint.complete("qcu.registrar", [], success=False)  # Failed: retried
+    
+    resumed = Checkpoint.resume("main", IDS)
+    assert resumed.resumed
+    assert [s["id"] for s in resumed.pending(SOURCES)] == ["qcu.registrar", "qcu.ssc"]
+    assert resumed.unsaved_posts() == [{"post_id": "qcu1994_a"}]
+
+
+def test_finished_run_with_save_errors_scrapes_everything_again():
+    checkpoint = Checkpoint.resume("main", IDS)
+    for page_id in IDS:
+        checkpoint.complete(page_id, [{"post_id": f"{page_id}_a"}])
+    checkpoint.mark_saved("qcu1994")
+    checkpoint.finish(errors=2)
+    assert checkpoint.path.exists()
+    
+    resumed = Checkpoint.resume("main", IDS)
+    assert resumed.pending(SOURCES) == SOURCES
+    assert sorted(resumed.unsaved) == ["qcu.registrar", "qcu.ssc"]
+
+
+def test_finished_run_without_errors_deletes_the_file():
+    checkpoint = Checkpoint.resume("main", IDS)
+    checkpoint.complete("qcu1994", [{"post_id": "qcu1994_a"}])
+    checkpoint.mark_saved("qcu1994")
+    checkpoint.finish()
+    
+    assert not checkpoint.path.exists()
+    assert not Checkpoint.resume("main", IDS).resumed
+
+
+def test_runs_do_not_overwrite_each_other(tmp_path):
+    main = Checkpoint.resume("main", IDS)
+    main.complete("qcu1994", [{"post_id": "qcu1994_a"}])
+    selenium = Checkpoint.resume("selenium", IDS)
+    selenium.complete("qcu.ssc", [])
+    
+    assert main.path != selenium.path
+    assert main.path == tmp_path / "scraper_state_main.json"
+    assert Checkpoint.resume("main", IDS).unsaved_posts() == [{"post_id": "qcu1994_a"}]
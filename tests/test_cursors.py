@@ -0,0 +1,49 @@
+"""
+Incremental Scraping Cursors (IDs only)
+=======================================
+Without a dedupe index, known post IDs decide: the scrape stops after
+`stop_after_known` known posts in a row, and a pinned old post at the top
+does not stop it.
+
+Run: python -m pytest tests/
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.cursors import SourceCursor
+
+
+def post(n: int) -> dict:
+    return {"post_id": f"qcu1994_{n}"}
+
+
+def test_stops_after_known_posts_in_a_row():
+    cursor = SourceCursor("qcu1994", recent_ids=["qcu1994_3", "qcu1994_4"])
+    
+    fresh = cursor.filter([post(1), post(2), post(3), post(4), post(5)])
+    assert fresh == [post(1), post(2)]
+    assert cursor.reached
+    assert cursor.known_skipped == 2
+
+
+def test_pinned_known_post_does_not_stop_the_scrape():
+    cursor = SourceCursor("qcu1994", recent_ids=["qcu1994_9"])
+    
+    fresh = cursor.filter([post(9), post(1), post(2)])
+    assert fresh == [post(1), post(2)]
+    assert not cursor.reached
+    assert cursor.known_streak == 0
+
+
+def test_streak_carries_over_screens_and_drops_the_rest():
+    cursor = SourceCursor("qcu1994", recent_ids=["qcu1994_2", "qcu1994_3"])
+    
+    assert cursor.filter([post(1), post(2)]) == [post(1)]
+    assert not cursor.reached
+    assert cursor.filter([post(3), post(4)]) == []
+    assert cursor.reached
+    assert cursor.filter([post(5)]) == []
@@ -0,0 +1,150 @@
+"""
+Edit Tracking Through the Scrape Path
+=====================================
+An edited post keeps its post_id, so the incremental cursor must pass it
+on (instead of dropping it as already saved) for save_posts_batch() to
+record the edit.
+
+Runs against a fake Firestore client; nothing leaves the machine.
+
+Run: python -m pytest tests/
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src import database, dedupe_index, settings
+from src.cursors import CursorStore
+from src.extract import build_post, block_hash
+
+
+class FakeDoc:
+    def __init__(self, doc_id):
+        self.id = doc_id
+
+
+class FakeCollection:
+    """Just enough of a collection for DedupeIndex.sync() (nothing to pull)."""
+    
+    def select(self, fields):
+        return self
+    
+    def where(self, *args):
+        return self
+    
+    def order_by(self, *args):
+        return self
+    
+    def stream(self):
+        return iter([])
+    
+    def document(self, doc_id):
+        return FakeDoc(doc_id)
+
+
+class FakeBatch:
+    def __init__(self, store):
+        self.store = store
+        self.writes = []
+    
+    def set(self, doc, data):
+        self.writes.append((doc.id, dict(data)))
+    
+    def commit(self):
+        self.store.update(self.writes)
+
+
+class FakeClient:
+    def __init__(self):
+        self.docs = {}
+    
+    def collection(self, name):
+        return FakeCollection()
+    
+    def batch(self):
+        return FakeBatch(self.docs)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Fake Firestore, with the index, cursors and Bloom filter in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "_settings_cache", {
+        "dedupe_index": {"path": str(tmp_path / "index.sqlite"),
+                         "bloom_path": str(tmp_path / "bloom.bin")},
+        "edit_tracking": {"enabled": True},
+        "title_generation": {"enabled": False},
+        "monitoring": {"metrics": {"enabled": False}},
+        "scaling": {"lock_file": str(tmp_path / ".lock")},
+    })
+    monkeypatch.setattr(dedupe_index, "_index", None)
+    fake = FakeClient()
+    monkeypatch.setattr(database, "_firestore_client", fake)
+    yield fake
+    if dedupe_index._index is not None:
+        dedupe_index._index.close()
+
+
+def make_post(text: str, short_hash: str = None) -> dict:
+    return build_post(text, short_hash or block_hash(text), "qcu1994", "QCU Main")
+
+
+def test_edited_post_goes_through_cursor_and_gets_version_2(client, tmp_path):
+    original = make_post("Enrollment for the second semester starts on Monday, "
+                         "bring your registration form to the registrar.")
+    assert database.save_posts_batch([original])["saved"] == 1
+    
+    cursors = CursorStore(path=tmp_path / "cursors.json", index=dedupe_index.get_dedupe_index())
+    cursors.advance("qcu1994", [original])
+    
+    # Same post_id (the permalink ID does not change), new text
+    edited = make_post("Enrollment for the second semester starts on Tuesday, "
+                       "bring your registration form to the registrar.",
+                       short_hash=original["post_id"].split("_", 1)[1])
+    assert edited["post_id"] == original["post_id"]
+    
+    cursor = cursors.get("qcu1994")
+    fresh = cursor.filter([edited])
+    assert fresh == [edited]
+    assert cursor.edited == 1
+    assert cursor.known_streak == 0
+    
+    result = database.save_posts_batch(fresh)
+    assert result["edits"] == 1
+    saved = client.docs[edited["post_id"]]
+    assert saved["version"] == 2
+    assert saved["edit_history"][0]["version"] == 1
+
+
+def test_unchanged_post_still_counts_as_known(client, tmp_path):
+    posts = [make_post(f"Announcement number {i}: classes resume on schedule "
+                       f"for every program this week.") for i in range(3)]
+    database.save_posts_batch(posts)
+    cursors = CursorStore(path=tmp_path / "cursors.json", index=dedupe_index.get_dedupe_index())
+    cursors.advance("qcu1994", posts)
+    
+    cursor = cursors.get("qcu1994")
+    assert cursor.filter(posts) == []
+    assert cursor.reached  # stop_after_known (2) known posts in a row
+
+
+def test_edited_posts_do_not_break_or_extend_the_known_streak(client, tmp_path):
+    known = [make_post(f"Old announcement {i}: the library is open until nine "
+                       f"in the evening on weekdays.") for i in range(2)]
+    original = make_post("Scholarship applications are due on Friday at the "
+                         "office of student affairs.")
+    database.save_posts_batch(known + [original])
+    
+    edited = make_post("Scholarship applications are due on Monday at the "
+                       "office of student affairs.",
+                       short_hash=original["post_id"].split("_", 1)[1])
+    cursor = CursorStore(path=tmp_path / "cursors.json",
+                         index=dedupe_index.get_dedupe_index()).get("qcu1994")
+    
+    assert cursor.filter([known[0], edited, known[1]]) == [edited]
+    assert cursor.reached
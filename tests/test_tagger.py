@@ -0,0 +1,37 @@
+"""
+Keyword Trie Regex
+==================
+trie_pattern() factors every keyword into one regex; it must match exactly
+the keywords it was built from, longest first.
+
+Run: python -m pytest tests/
+"""
+
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tagger import trie_pattern
+
+
+def test_shared_prefixes_are_factored():
+    assert trie_pattern(["exam", "examination", "event"]) == "e(?:vent|xam(?:ination)?)"
+
+
+def test_matches_exactly_the_words():
+    words = ["exam", "examination", "event", "enrollment", "c++", "a.m."]
+    pattern = re.compile(trie_pattern(words))
+    
+    for word in words:
+        assert pattern.fullmatch(word), word
+    for other in ["ex", "exams", "evening", "c+", "a-m-"]:
+        assert not pattern.fullmatch(other), other
+
+
+def test_longer_word_wins_over_its_prefix():
+    pattern = re.compile(r"\b(?:" + trie_pattern(["exam", "examination"]) + r")\b")
+    assert pattern.findall("Final examination schedule; no exam on Friday") == \
+        ["examination", "exam"]
@@ -0,0 +1,84 @@
+"""
+Work Queue Claims
+=================
+A source is handed to one worker at a time, claims of dead worker
+processes are taken back, and an overlapping run's re-queued sources stay
+out of reach of older runs' workers.
+
+Run: python -m pytest tests/
+"""
+
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src import settings
+from src.workers import WorkQueue
+
+SOURCES = [{"id": "qcu1994", "priority": 1}, {"id": "qcu.registrar", "priority": 2},
+           {"id": "qcu.ssc", "priority": 3}]
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "_settings_cache", {
+        "scaling": {"queue_file": str(tmp_path / "work_queue.sqlite"),
+                    "lock_file": str(tmp_path / ".lock"),
+                    "source_batch_size": 2},
+    })
+    queue = WorkQueue()
+    queue.enqueue(SOURCES)
+    yield queue
+    queue.close()
+
+
+def dead_worker() -> str:
+    """A "host:pid" of a process that has exited."""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return f"{socket.gethostname()}:{process.pid}"
+
+
+def test_claims_by_priority_and_never_twice(queue):
+    other = WorkQueue(run=queue.run)
+    
+    assert [s["id"] for s in queue.claim()] == ["qcu1994", "qcu.registrar"]
+    assert [s["id"] for s in other.claim()] == ["qcu.ssc"]
+    assert queue.claim() == []
+    assert other.claim(["qcu1994"]) == []
+    other.close()
+
+
+def test_claim_of_a_dead_worker_is_taken_back(queue):
+    queue.claim(["qcu1994"])
+    queue._db.execute("UPDATE queue SET worker = ? WHERE page_id = 'qcu1994'",
+                      (dead_worker(),))
+    queue._db.commit()
+    
+    assert [s["id"] for s in queue.claim(["qcu1994"])] == ["qcu1994"]
+
+
+def test_live_claim_is_kept(queue):
+    queue.claim(["qcu1994"])
+    with queue.lock, queue._db:
+        queue._reclaim_dead()
+    
+    assert queue.summary(["qcu1994"])["claimed"] == 1
+
+
+def test_older_run_does_not_take_requeued_sources(queue):
+    assert len(queue.claim()) == 2
+    queue.finish({"qcu1994": 3, "qcu.registrar": None})
+    
+    overlapping = WorkQueue()
+    overlapping.enqueue(SOURCES[:1])
+    assert [s["id"] for s in queue.claim()] == ["qcu.ssc"]
+    assert queue.claim() == []
+    assert [s["id"] for s in overlapping.claim()] == ["qcu1994"]
+    overlapping.close()